@@ -0,0 +1,3 @@
+"""
+Benchmarks de desempenho e memória
+"""
\ No newline at end of file
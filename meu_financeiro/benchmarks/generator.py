@@ -0,0 +1,99 @@
+"""
+Gerador determinístico de ledgers sintéticos
+
+Gera arquivos no mesmo formato do financas.json, com número de linhas,
+concentração de categorias e intervalo de datas configuráveis.
+
+Uso (dentro de meu_financeiro/):
+    python -m benchmarks.generator saida.json --rows 100000 --skew 1.2 --years 5
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional
+
+from config import DEFAULT_CATEGORIES
+
+DESCRIPTIONS = {
+    'receita': ['Salário mensal', 'Projeto freelance', 'Dividendos', 'Reembolso'],
+    'despesa': ['Supermercado', 'Padaria São João', 'Uber', 'Aluguel', 'Farmácia',
+                'Conta de luz', 'Cinema', 'Curso online', 'Restaurante', 'Alimentação']
+}
+
+
+def _weights(count: int, skew: float) -> list:
+    """Pesos tipo Zipf: skew 0 = uniforme, valores maiores concentram"""
+    return [1 / (rank ** skew) for rank in range(1, count + 1)]
+
+
+def iter_transactions(rows: int, seed: int = 42, skew: float = 1.0,
+                      start: datetime = datetime(2020, 1, 1),
+                      days: int = 5 * 365,
+                      receita_ratio: float = 0.2) -> Iterator[Dict]:
+    """Gera dicionários de transações com ids 1..rows"""
+    rng = random.Random(seed)
+    weights = {
+        tipo: _weights(len(cats), skew)
+        for tipo, cats in DEFAULT_CATEGORIES.items()
+    }
+    
+    for i in range(1, rows + 1):
+        tipo = 'receita' if rng.random() < receita_ratio else 'despesa'
+        categoria = rng.choices(DEFAULT_CATEGORIES[tipo], weights[tipo])[0]
+        when = start + timedelta(days=rng.randrange(days),
+                                 seconds=rng.randrange(86400))
+        valor = round(rng.lognormvariate(4, 1.2) + 0.01, 2)
+        if tipo == 'receita':
+            valor = round(valor * 10, 2)
+        
+        yield {
+            'id': i,
+            'tipo': tipo,
+            'categoria': categoria,
+            'descricao': f"{rng.choice(DESCRIPTIONS[tipo])} {rng.randrange(1000)}",
+            'valor': valor,
+            'data': when.replace(microsecond=0).isoformat(),
+            'criado_em': when.isoformat()
+        }
+
+
+def generate_ledger(rows: int, seed: int = 42, skew: float = 1.0,
+                    years: float = 5, start: Optional[datetime] = None) -> Dict:
+    """Gera o conteúdo completo de um financas.json"""
+    return {
+        'transactions': list(iter_transactions(
+            rows, seed=seed, skew=skew,
+            start=start or datetime(2020, 1, 1),
+            days=max(1, int(years * 365))
+        )),
+        'categories': {tipo: cats.copy() for tipo, cats in DEFAULT_CATEGORIES.items()},
+        'last_updated': datetime(2020, 1, 1).isoformat()
+    }
+
+
+def write_ledger(filename: str, rows: int, **options) -> str:
+    """Grava um ledger sintético compatível com StorageService"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(generate_ledger(rows, **options), f, ensure_ascii=False)
+    return filename
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera ledger sintético")
+    parser.add_argument('output', help="arquivo .json de saída")
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--skew', type=float, default=1.0,
+                        help="concentração das categorias (0 = uniforme)")
+    parser.add_argument('--years', type=float, default=5,
+                        help="intervalo de datas em anos")
+    args = parser.parse_args()
+    
+    write_ledger(args.output, args.rows, seed=args.seed,
+                 skew=args.skew, years=args.years)
+    print(f"✓ {args.rows} transações gravadas em {args.output}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Benchmark de FinanceService e StorageService
+
+Gera ledgers sintéticos de vários tamanhos, mede o tempo das operações
+principais e grava os resultados em JSON para comparação entre execuções.
+
+Uso (dentro de meu_financeiro/):
+    python -m benchmarks.harness --sizes 10000 100000 1000000 --output atual.json
+    python -m benchmarks.harness --output novo.json --compare atual.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from services import FinanceService, StorageService
+from .generator import write_ledger
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def timeit(func: Callable, repeat: int) -> Dict:
+    """Executa func repeat vezes e retorna estatísticas em segundos"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started)
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'max': max(times),
+        'runs': repeat
+    }
+
+
+def build_finance(transactions, categories) -> FinanceService:
+    """FinanceService com todos os índices construídos e sem cache de resultados
+    
+    Com o cache, da segunda repetição em diante as consultas devolveriam
+    o resultado memorizado e a medição deixaria de incluir o cálculo.
+    Os índices, criados no primeiro uso, são construídos aqui para que
+    build_indexes continue medindo a construção completa.
+    """
+    finance = FinanceService(list(transactions), categories)
+    finance.cache.maxsize = 0
+    for name in FinanceService.INDEXES:
+        getattr(finance, name)
+    return finance
+
+
+def run_size(rows: int, workdir: str, repeat: int, seed: int) -> Dict[str, Dict]:
+    """Mede todas as operações para um ledger de rows linhas"""
+    ledger = write_ledger(os.path.join(workdir, f"ledger_{rows}.json"), rows, seed=seed)
+    storage = StorageService(ledger, journal=False, cache=False)
+    results = {}
+    
+    results['load'] = timeit(storage.load, repeat)
+    transactions, categories = storage.load()
+    
+    cached = StorageService(ledger, journal=False, cache=True)
+    cached.load()
+    results['load_cached'] = timeit(cached.load, repeat)
+    
+    holder = {}
+    results['build_indexes'] = timeit(
+        lambda: holder.update(finance=build_finance(transactions, categories)),
+        repeat
+    )
+    finance = holder['finance']
+    
+    start, end = datetime(2022, 1, 1), datetime(2022, 3, 31, 23, 59, 59)
+    period = finance.filter_by_period(start, end)
+    
+    operations = {
+        'save': lambda: StorageService(
+            os.path.join(workdir, 'save.json'), journal=False, cache=False
+        ).save(finance.transactions, finance.categories),
+        'export_to_csv': lambda: storage.export_to_csv(
+            finance.transactions, os.path.join(workdir, 'export.csv')
+        ),
+        'filter_by_period': lambda: finance.filter_by_period(start, end),
+        'filter_by_description': lambda: finance.filter_by_description('mercado'),
+        'filter_by_category': lambda: finance.filter_by_category('Alimentação'),
+        'filter_by_value_range': lambda: finance.filter_by_value_range(50, 150),
+        'calculate_summary': finance.calculate_summary,
+        'calculate_summary_period': lambda: finance.calculate_summary(period),
+        'calculate_by_category': finance.calculate_by_category,
+        'calculate_by_category_period': lambda: finance.calculate_by_category(period),
+        'get_statistics': finance.get_statistics,
+        'get_statistics_period': lambda: finance.get_statistics(period),
+        'report': finance.report,
+        'report_period': lambda: finance.report(period),
+        'get_monthly_data': finance.get_monthly_data,
+    }
+    
+    for name, func in operations.items():
+        results[name] = timeit(func, repeat)
+    
+    return results
+
+
+def compare(current: Dict, previous: Dict, threshold: float) -> List[str]:
+    """Lista operações cuja mediana piorou mais que threshold"""
+    regressions = []
+    for size, ops in current['results'].items():
+        for name, stats in ops.items():
+            old = previous.get('results', {}).get(size, {}).get(name)
+            if not old or old['median'] <= 0:
+                continue
+            ratio = stats['median'] / old['median']
+            marker = '  <-- regressão' if ratio > 1 + threshold else ''
+            print(f"{size:>9} {name:<30} {old['median']:>10.4f}s {stats['median']:>10.4f}s {ratio:>6.2f}x{marker}")
+            if marker:
+                regressions.append(f"{size}:{name}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos serviços")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help="JSON de uma execução anterior")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="piora relativa considerada regressão (0.2 = 20%%)")
+    args = parser.parse_args()
+    
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed
+        },
+        'results': {}
+    }
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        for rows in args.sizes:
+            print(f"Medindo {rows} transações...")
+            report['results'][str(rows)] = run_size(rows, workdir, args.repeat, args.seed)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"✓ Resultados gravados em {args.output}")
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        regressions = compare(report, previous, args.threshold)
+        if regressions:
+            raise SystemExit(f"✗ {len(regressions)} regressões: {', '.join(regressions)}")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Benchmark de memória do modelo Transaction
+
+Mede os bytes por transação da representação compacta atual e da
+representação original (objeto com __dict__, valor float e datas em
+texto), mantida aqui apenas como referência.
+
+Uso (dentro de meu_financeiro/):
+    python -m benchmarks.memory [linhas ...]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from models import Transaction
+from .generator import iter_transactions
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+
+
+class LegacyTransaction:
+    """Transação no formato original (antes da representação compacta)"""
+    
+    def __init__(self, id: int, tipo: str, categoria: str,
+                 descricao: str, valor: float, data: str,
+                 criado_em: Optional[str] = None):
+        self.id = id
+        self.tipo = tipo
+        self.categoria = categoria
+        self.descricao = descricao
+        self.valor = valor
+        self.data = data
+        self.criado_em = criado_em or datetime.now().isoformat()
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LegacyTransaction':
+        return cls(**data)
+
+
+def generate_lines(count: int, seed: int = 42) -> List[str]:
+    """Gera transações serializadas, uma por linha JSON"""
+    return [json.dumps(row) for row in iter_transactions(count, seed=seed)]
+
+
+def measure(cls, lines: List[str]) -> float:
+    """Bytes retidos por transação após carregar as linhas
+    
+    Cada linha é decodificada com json.loads, como no carregamento real,
+    de modo que as strings retidas pelos objetos entram na conta.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [cls.from_dict(json.loads(line)) for line in lines]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / len(lines)
+
+
+def main(sizes: List[int]):
+    print(f"{'Linhas':>10} {'Original (B/tx)':>16} {'Compacta (B/tx)':>16} {'Redução':>8}")
+    for size in sizes:
+        lines = generate_lines(size)
+        legacy = measure(LegacyTransaction, lines)
+        compact = measure(Transaction, lines)
+        print(f"{size:>10,} {legacy:>16.1f} {compact:>16.1f} {1 - compact / legacy:>8.1%}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
\ No newline at end of file
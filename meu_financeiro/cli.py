@@ -0,0 +1,234 @@
+"""
+Comandos não interativos (uso em scripts, cron e pipelines)
+
+Uso (dentro de meu_financeiro/):
+    python main.py add despesa Alimentação "Supermercado" 123,45 --data 05/03/2024
+    python main.py list --inicio 01/03/2024 --fim 31/03/2024 --limite 20
+    python main.py summary --inicio 01/01/2024
+    python main.py chart --meses 6
+    python main.py balance --meses 12
+    python main.py export marco.csv --inicio 01/03/2024 --fim 31/03/2024
+    python main.py import extrato.ofx
+
+A saída é JSON em stdout; erros vão para stderr com código de saída 1.
+Cada comando importa apenas os módulos de que precisa.
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+
+def _date(text: str) -> datetime:
+    """Tipo argparse para datas DD/MM/AAAA"""
+    from utils.validators import validate_date
+    
+    if not validate_date(text):
+        raise argparse.ArgumentTypeError(f"data inválida: {text}")
+    return datetime.strptime(text, '%d/%m/%Y')
+
+
+def _non_negative(text: str) -> int:
+    """Tipo argparse para inteiros >= 0"""
+    try:
+        value = int(text)
+    except ValueError:
+        value = -1
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"inteiro não negativo esperado: {text}")
+    return value
+
+
+def _period(args):
+    """Converte --inicio/--fim em (start, end), com fim no último instante do dia"""
+    end = args.fim
+    if end is not None:
+        end = end.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return args.inicio, end
+
+
+def _open():
+    """Abre o armazenamento configurado e carrega o FinanceService"""
+    from services import create_finance_service, create_storage_service
+    
+    storage = create_storage_service()
+    return storage, create_finance_service(storage)
+
+
+def _emit(data) -> int:
+    json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write('\n')
+    return 0
+
+
+def _fail(message: str) -> int:
+    print(json.dumps({'erro': message}, ensure_ascii=False), file=sys.stderr)
+    return 1
+
+
+def cmd_add(args) -> int:
+    from utils.validators import validate_non_empty, validate_value
+    
+    ok, valor = validate_value(args.valor)
+    if not ok:
+        return _fail(f"valor inválido: {args.valor}")
+    if not validate_non_empty(args.descricao):
+        return _fail("descrição obrigatória")
+    
+    storage, finance = _open()
+    if args.categoria not in finance.categories.get_categories(args.tipo):
+        return _fail(f"categoria inexistente para {args.tipo}: {args.categoria}")
+    
+    data = (args.data or datetime.now()).isoformat()
+    transaction = finance.add_transaction(args.tipo, args.categoria,
+                                          args.descricao.strip(), valor, data)
+    # Índices salvos não são regravados: comandos de uma alteração não os
+    # constroem, e os arquivos obsoletos são reconstruídos quando usados
+    if not (storage.save_change('put', transaction.to_dict(),
+                                finance.repository, finance.categories)
+            and storage.flush()):
+        return _fail("erro ao salvar dados")
+    
+    return _emit(transaction.to_dict())
+
+
+def cmd_list(args) -> int:
+    from itertools import islice
+    
+    start, end = _period(args)
+    _, finance = _open()
+    rows = finance.iter_filtered(start, end, args.categoria, args.tipo)
+    
+    return _emit([t.to_dict() for t in islice(rows, args.limite)])
+
+
+def cmd_summary(args) -> int:
+    start, end = _period(args)
+    _, finance = _open()
+    
+    filtered = None
+    if start is not None or end is not None:
+        filtered = finance.filter_by_period(start or datetime.min, end or datetime.max)
+    
+    report = finance.report(filtered)
+    statistics = report.statistics()
+    if 'maior_despesa_obj' in statistics:
+        statistics['maior_despesa_obj'] = statistics['maior_despesa_obj'].to_dict()
+    
+    return _emit({
+        'resumo': report.summary(),
+        'por_categoria': {
+            tipo: report.by_category(tipo)
+            for tipo in ('receita', 'despesa')
+        },
+        'estatisticas': statistics,
+        'distribuicao': finance.distribution(filtered).describe()
+    })
+
+
+def cmd_chart(args) -> int:
+    _, finance = _open()
+    return _emit(finance.get_monthly_data(args.meses))
+
+
+def cmd_balance(args) -> int:
+    _, finance = _open()
+    return _emit(finance.balance_over_time(args.meses))
+
+
+def cmd_export(args) -> int:
+    start, end = _period(args)
+    storage, finance = _open()
+    
+    exported = 0
+    
+    def count(n: int):
+        nonlocal exported
+        exported = n
+    
+    rows = finance.iter_filtered(start, end, args.categoria, args.tipo)
+    if not storage.export_to_csv(rows, args.arquivo, presorted=True, progress=count):
+        return _fail(f"erro ao exportar para {args.arquivo}")
+    
+    return _emit({'arquivo': args.arquivo, 'exportadas': exported})
+
+
+def cmd_import(args) -> int:
+    import os
+    from services.statement_importer import StatementImporter
+    
+    if not os.path.isfile(args.arquivo):
+        return _fail(f"arquivo não encontrado: {args.arquivo}")
+    
+    storage, finance = _open()
+    try:
+        stats = StatementImporter(finance, storage).import_file(args.arquivo)
+    except ValueError as e:
+        return _fail(str(e))
+    
+    if not storage.flush():
+        return _fail("erro ao salvar dados")
+    return _emit(stats)
+
+
+def _add_filters(parser: argparse.ArgumentParser):
+    parser.add_argument('--inicio', type=_date, help="data inicial DD/MM/AAAA")
+    parser.add_argument('--fim', type=_date, help="data final DD/MM/AAAA")
+    parser.add_argument('--tipo', choices=('receita', 'despesa'))
+    parser.add_argument('--categoria')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='main.py', description="Controle financeiro (modo não interativo)"
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    add = commands.add_parser('add', help="adiciona uma transação")
+    add.add_argument('tipo', choices=('receita', 'despesa'))
+    add.add_argument('categoria')
+    add.add_argument('descricao')
+    add.add_argument('valor', help="ex.: 123,45")
+    add.add_argument('--data', type=_date, help="DD/MM/AAAA (padrão: agora)")
+    add.set_defaults(func=cmd_add)
+    
+    list_cmd = commands.add_parser('list', help="lista transações em ordem de data")
+    _add_filters(list_cmd)
+    list_cmd.add_argument('--limite', type=_non_negative)
+    list_cmd.set_defaults(func=cmd_list)
+    
+    summary = commands.add_parser('summary', help="resumo, categorias e estatísticas")
+    summary.add_argument('--inicio', type=_date)
+    summary.add_argument('--fim', type=_date)
+    summary.set_defaults(func=cmd_summary)
+    
+    chart = commands.add_parser('chart', help="dados mensais do gráfico")
+    chart.add_argument('--meses', type=_non_negative, default=12)
+    chart.set_defaults(func=cmd_chart)
+    
+    balance = commands.add_parser('balance', help="saldo acumulado ao fim de cada mês")
+    balance.add_argument('--meses', type=_non_negative, default=12)
+    balance.set_defaults(func=cmd_balance)
+    
+    export = commands.add_parser('export', help="exporta para CSV")
+    export.add_argument('arquivo')
+    _add_filters(export)
+    export.set_defaults(func=cmd_export)
+    
+    import_cmd = commands.add_parser('import', help="importa extrato CSV ou OFX")
+    import_cmd.add_argument('arquivo')
+    import_cmd.set_defaults(func=cmd_import)
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Leitor do pipe encerrou antes (ex.: | head): descarta o resto da saída
+        import os
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
\ No newline at end of file
@@ -7,9 +7,12 @@ import os
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 DATA_FILE = os.path.join(DATA_DIR, 'financas.json')
+SQLITE_FILE = os.path.join(DATA_DIR, 'financas.db')
+JSONL_FILE = os.path.join(DATA_DIR, 'financas.jsonl')
+PARTITIONS_DIR = os.path.join(DATA_DIR, 'financas')
 
-# Criar diretório de dados se não existir
-os.makedirs(DATA_DIR, exist_ok=True)
+# O diretório de dados é criado na primeira gravação (StorageService),
+# não na importação deste módulo
 
 # Categorias padrão
 DEFAULT_CATEGORIES = {
@@ -25,4 +28,41 @@ DATETIME_FORMAT = '%d/%m/%Y %H:%M:%S'
 
 # Limites
 MAX_TRANSACTIONS_DISPLAY = 50
-CHART_BAR_LENGTH = 50
\ No newline at end of file
+CHART_BAR_LENGTH = 50
+
+# Persistência
+# Backend de armazenamento: 'json' (arquivo financas.json), 'jsonl'
+# (JSON Lines lido sob demanda), 'sqlite' ou 'partitioned' (um arquivo
+# por mês em PARTITIONS_DIR)
+STORAGE_BACKEND = 'json'
+
+# Backend 'partitioned': meses lidos no início (os demais sob demanda)
+PARTITION_PRELOAD_MONTHS = 3
+
+# No modo journal cada alteração é anexada a um arquivo de log em vez de
+# reescrever o arquivo inteiro; o snapshot é compactado periodicamente.
+JOURNAL_MODE = False
+JOURNAL_COMPACT_EVERY = 200
+
+# Cache binário do ledger já convertido, reaproveitado enquanto o JSON não mudar
+SNAPSHOT_CACHE = True
+
+# Gravação em segundo plano: alterações em sequência são agrupadas e
+# gravadas após ASYNC_SAVE_DELAY segundos sem novas alterações (não se
+# aplica ao SQLite)
+ASYNC_SAVE = False
+ASYNC_SAVE_DELAY = 0.5
+
+# Agregação paralela: a partir de PARALLEL_MIN_ROWS transações as colunas
+# são divididas entre PARALLEL_WORKERS processos (None = número de CPUs)
+PARALLEL_MIN_ROWS = 500_000
+PARALLEL_WORKERS = None
+
+# Resultados de consultas guardados em memória (LRU); 0 desativa o cache
+RESULT_CACHE_SIZE = 64
+
+# Instrumentação
+# Registra chamadas, tempo acumulado e linhas processadas dos serviços e
+# das telas; também ativável com a variável de ambiente FINANCAS_INSTRUMENTACAO=1
+INSTRUMENTATION_ENABLED = False
+INSTRUMENTATION_FILE = os.path.join(DATA_DIR, 'instrumentacao.json')
\ No newline at end of file
@@ -1,19 +1,25 @@
 """
 Sistema de Controle Financeiro Pessoal
 Ponto de entrada da aplicação
-"""
 
-from services import FinanceService, StorageService
-from views import TerminalView
+Sem argumentos abre o menu interativo; com argumentos executa um
+comando da CLI (ver cli.py), ex.: python main.py summary
+"""
+import sys
 
 
 def main():
     """Função principal"""
-    # Inicializar serviços
-    storage = StorageService()
-    transactions, categories = storage.load()
+    if len(sys.argv) > 1:
+        from cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
     
-    finance = FinanceService(transactions, categories)
+    from services import create_finance_service, create_storage_service
+    from views import TerminalView
+    
+    # Inicializar serviços
+    storage = create_storage_service()
+    finance = create_finance_service(storage)
     
     # Inicializar view
     view = TerminalView(finance, storage)
@@ -1,24 +1,104 @@
 """
 Modelo de Transação
 """
-from datetime import datetime
-from typing import Dict, Optional
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Union
+from utils.instrumentation import instrument
 
+_MICROSECOND = timedelta(microseconds=1)
+_MICROSECONDS_PER_DAY = 86_400_000_000
 
+
+def _encode_datetime(value: str) -> Union[int, str]:
+    """Converte data ISO em microssegundos desde datetime.min
+    
+    Só converte textos no formato gerado por isoformat() (com ou sem
+    microssegundos), garantindo que a reconversão devolva o mesmo texto;
+    outros formatos são mantidos como string.
+    """
+    if len(value) not in (19, 26) or value[10] != 'T':
+        return value
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    if len(value) == 26 and dt.microsecond == 0:
+        return value
+    return (dt - datetime.min) // _MICROSECOND
+
+
+def _decode_datetime(value: Union[int, str]) -> datetime:
+    if isinstance(value, int):
+        return datetime.min + timedelta(microseconds=value)
+    return datetime.fromisoformat(value)
+
+
+def _to_iso(value: Union[int, str]) -> str:
+    if isinstance(value, int):
+        return _decode_datetime(value).isoformat()
+    return value
+
+
+@instrument('Transaction', include=('get_date_obj', 'get_ordinal', 'from_dict', 'to_dict',
+                                    'from_state'),
+            rows=lambda transaction: 1)
 class Transaction:
-    """Representa uma transação financeira"""
+    """Representa uma transação financeira
+    
+    Representação compacta: sem __dict__, valor em centavos inteiros,
+    datas como inteiros e tipo/categoria internados. As propriedades
+    valor, data e criado_em mantêm a interface original.
+    """
+    
+    __slots__ = ('id', 'tipo', 'categoria', 'descricao', 'cents',
+                 '_data', '_criado_em')
     
     def __init__(self, id: int, tipo: str, categoria: str, 
                  descricao: str, valor: float, data: str, 
                  criado_em: Optional[str] = None):
         self.id = id
-        self.tipo = tipo  # 'receita' ou 'despesa'
-        self.categoria = categoria
+        self.tipo = sys.intern(tipo)  # 'receita' ou 'despesa'
+        self.categoria = sys.intern(categoria)
         self.descricao = descricao
         self.valor = valor
         self.data = data  # ISO format
         self.criado_em = criado_em or datetime.now().isoformat()
     
+    @property
+    def valor(self) -> float:
+        return self.cents / 100
+    
+    @valor.setter
+    def valor(self, value: float):
+        """Converte para centavos
+        
+        Valores com mais de duas casas decimais são arredondados
+        explicitamente meio centavo para cima (ROUND_HALF_UP) sobre o
+        texto decimal do número: 1.005 vira 1.01, não 1.00.
+        """
+        if round(value, 2) == value:
+            self.cents = round(value * 100)
+        else:
+            from decimal import Decimal, ROUND_HALF_UP
+            self.cents = int(Decimal(str(value)).quantize(Decimal('0.01'), ROUND_HALF_UP) * 100)
+    
+    @property
+    def data(self) -> str:
+        return _to_iso(self._data)
+    
+    @data.setter
+    def data(self, value: str):
+        self._data = _encode_datetime(value)
+    
+    @property
+    def criado_em(self) -> str:
+        return _to_iso(self._criado_em)
+    
+    @criado_em.setter
+    def criado_em(self, value: str):
+        self._criado_em = _encode_datetime(value)
+    
     def to_dict(self) -> Dict:
         """Converte para dicionário"""
         return {
@@ -44,9 +124,30 @@ class Transaction:
             criado_em=data.get('criado_em')
         )
     
+    def to_state(self) -> tuple:
+        """Campos internos já convertidos (para o cache binário)"""
+        return (self.id, self.tipo, self.categoria, self.descricao,
+                self.cents, self._data, self._criado_em)
+    
+    @classmethod
+    def from_state(cls, state: tuple) -> 'Transaction':
+        """Recria a partir de to_state() sem converter valores nem datas"""
+        t = cls.__new__(cls)
+        (t.id, tipo, categoria, t.descricao,
+         t.cents, t._data, t._criado_em) = state
+        t.tipo = sys.intern(tipo)
+        t.categoria = sys.intern(categoria)
+        return t
+    
     def get_date_obj(self) -> datetime:
         """Retorna data como objeto datetime"""
-        return datetime.fromisoformat(self.data)
+        return _decode_datetime(self._data)
+    
+    def get_ordinal(self) -> int:
+        """Retorna a data como ordinal (dias desde 01/01/0001)"""
+        if isinstance(self._data, int):
+            return self._data // _MICROSECONDS_PER_DAY + 1
+        return self.get_date_obj().toordinal()
     
     def __repr__(self):
         return f"Transaction(id={self.id}, tipo={self.tipo}, valor={self.valor})"
\ No newline at end of file
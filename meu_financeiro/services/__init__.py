@@ -1,7 +1,75 @@
 """
 Serviços de negócio
+
+Os módulos são importados sob demanda (PEP 562), para que comandos da
+CLI carreguem só o que usam.
 """
-from .storage_service import StorageService
-from .finance_service import FinanceService
+from importlib import import_module
+
+_EXPORTS = {
+    'StorageService': '.storage_service',
+    'SQLiteStorageService': '.sqlite_storage',
+    'JsonLinesStorageService': '.jsonl_storage',
+    'PartitionedStorageService': '.partitioned_storage',
+    'FinanceService': '.finance_service',
+    'StatementImporter': '.statement_importer',
+    'Pager': '.pager',
+    'Query': '.query',
+    'BackgroundWriter': '.background_writer',
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def create_storage_service():
+    """Cria o serviço de armazenamento definido em STORAGE_BACKEND
+    
+    Com ASYNC_SAVE, os backends de arquivo são envolvidos por um
+    BackgroundWriter.
+    """
+    from config import ASYNC_SAVE, STORAGE_BACKEND
+    
+    if STORAGE_BACKEND == 'sqlite':
+        from .sqlite_storage import SQLiteStorageService
+        return SQLiteStorageService()
+    if STORAGE_BACKEND == 'jsonl':
+        from .jsonl_storage import JsonLinesStorageService
+        storage = JsonLinesStorageService()
+    elif STORAGE_BACKEND == 'partitioned':
+        from .partitioned_storage import PartitionedStorageService
+        storage = PartitionedStorageService()
+    else:
+        from .storage_service import StorageService
+        storage = StorageService()
+    
+    if ASYNC_SAVE:
+        from .background_writer import BackgroundWriter
+        return BackgroundWriter(storage)
+    return storage
+
+
+def create_finance_service(storage):
+    """Carrega o ledger de storage e monta o FinanceService"""
+    from .finance_service import FinanceService
+    
+    transactions, categories = storage.load()
+    return FinanceService(
+        transactions, categories,
+        query_backend=storage if storage.supports_queries else None,
+        partition_source=storage if storage.supports_partitions else None,
+        # Índices salvos são lidos só quando usados pela primeira vez
+        load_index=storage.load_sidecar
+    )
+
 
-__all__ = ['StorageService', 'FinanceService']
\ No newline at end of file
+__all__ = ['StorageService', 'SQLiteStorageService', 'JsonLinesStorageService',
+           'PartitionedStorageService',
+           'FinanceService', 'StatementImporter', 'Pager', 'Query', 'BackgroundWriter',
+           'create_storage_service', 'create_finance_service']
\ No newline at end of file
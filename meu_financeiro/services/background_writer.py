@@ -0,0 +1,215 @@
+"""
+Gravação assíncrona com agrupamento de alterações
+"""
+import atexit
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from config import ASYNC_SAVE_DELAY
+from models import Transaction, CategoryManager
+
+# Estado completo copiado como dicionários: (transações, categorias)
+Snapshot = Tuple[List[Dict], Dict]
+
+
+def _copy_change(op: str, payload: Dict) -> Tuple[str, Dict]:
+    """Cópia de um registro de alteração (O(tamanho do registro))"""
+    if op == 'categories':
+        return op, {tipo: list(names) for tipo, names in payload.items()}
+    return op, dict(payload)
+
+
+class BackgroundWriter:
+    """Grava as alterações de um StorageService em uma thread própria
+    
+    save_change() e save() apenas registram o que gravar e retornam. A
+    thread espera delay segundos sem novas alterações (no máximo
+    max_delay desde a primeira pendente) e grava tudo de uma vez: no modo
+    journal, os registros acumulados são anexados com um único fsync; nos
+    demais, o arquivo é regravado uma só vez pela troca atômica do
+    StorageService. flush() força a gravação e aguarda o término.
+    
+    Quando o backend grava só os registros (storage.needs_state() falso),
+    save_change() copia apenas o registro, em O(1). O estado completo é
+    copiado como dicionários, na thread de quem chama, só em save() e
+    nos backends que regravam tudo a cada alteração; a thread de gravação
+    nunca lê os objetos Transaction em uso pela interface.
+    
+    Um lote que falha volta para a fila: suas alterações seguem junto
+    com as próximas, e flush() tenta de novo. ok só volta a ser True
+    quando uma gravação que as inclui termina com sucesso.
+    
+    Os demais atributos e métodos são os do StorageService encapsulado.
+    """
+    
+    def __init__(self, storage, delay: float = ASYNC_SAVE_DELAY,
+                 max_delay: Optional[float] = None):
+        self.storage = storage
+        self.delay = delay
+        self.max_delay = max_delay if max_delay is not None else delay * 10
+        self.ok = True
+        
+        self._cond = threading.Condition()
+        # Alterações posteriores ao último estado completo (se houver)
+        self._changes: List[Tuple[str, Dict]] = []
+        self._state: Optional[Snapshot] = None
+        self._full = False
+        self._dirty = False
+        # Lote que falhou, reenfileirado na próxima alteração ou flush()
+        self._retry: Optional[Tuple[List[Tuple[str, Dict]], Optional[Snapshot], bool]] = None
+        self._first = self._last = 0.0
+        self._urgent = False
+        self._busy = False
+        self._closed = False
+        
+        self._thread = threading.Thread(target=self._run, name='storage-writer',
+                                        daemon=True)
+        self._thread.start()
+        # Garante a gravação mesmo se o programa terminar sem passar pelo menu
+        atexit.register(self.close)
+    
+    def __getattr__(self, name: str):
+        return getattr(self.storage, name)
+    
+    @staticmethod
+    def _snapshot(transactions: List[Transaction],
+                  categories: CategoryManager) -> Snapshot:
+        """Cópia do estado como dicionários (a interface segue alterando os originais)"""
+        return ([t.to_dict() for t in transactions],
+                {tipo: list(names) for tipo, names in categories.to_dict().items()})
+    
+    def _requeue_retry(self):
+        """Põe o lote que falhou à frente do que estiver pendente"""
+        if self._retry is None:
+            return
+        changes, state, full = self._retry
+        self._retry = None
+        # Um estado completo pendente é mais novo e já contém o lote
+        if not self._full:
+            self._changes = changes + self._changes
+            if self._state is None:
+                self._state = state
+            self._full = full
+        if not self._dirty:
+            self._first = time.monotonic()
+        self._dirty = True
+    
+    def _enqueue(self, changes: List[Tuple[str, Dict]],
+                 transactions: List[Transaction],
+                 categories: CategoryManager, full: bool) -> bool:
+        """Registra as alterações (e o estado, se necessário) para a próxima gravação"""
+        changes = [_copy_change(op, payload) for op, payload in changes]
+        snapshot = None
+        if full or self.storage.needs_state():
+            snapshot = self._snapshot(transactions, categories)
+        
+        with self._cond:
+            if self._closed:
+                return self._write(changes, snapshot, full)
+            
+            self._requeue_retry()
+            now = time.monotonic()
+            if not self._dirty:
+                self._first = now
+            self._last = now
+            if full:
+                # O estado completo já contém as alterações anteriores
+                self._changes = []
+            else:
+                self._changes.extend(changes)
+            if snapshot is not None:
+                self._state = snapshot
+            self._full = self._full or full
+            self._dirty = True
+            self._cond.notify_all()
+        return True
+    
+    def save_change(self, op: str, payload: Dict,
+                    transactions: List[Transaction],
+                    categories: CategoryManager) -> bool:
+        """Agenda a gravação de uma alteração"""
+        return self._enqueue([(op, payload)], transactions, categories, False)
+    
+    def save_changes(self, changes: List[Tuple[str, Dict]],
+                     transactions: List[Transaction],
+                     categories: CategoryManager) -> bool:
+        """Agenda a gravação de várias alterações (na ordem das anteriores)"""
+        return self._enqueue(changes, transactions, categories, False)
+    
+    def save(self, transactions: List[Transaction],
+             categories: CategoryManager) -> bool:
+        """Agenda a regravação completa do arquivo"""
+        return self._enqueue([], transactions, categories, True)
+    
+    def _write(self, changes: List[Tuple[str, Dict]], state: Optional[Snapshot],
+               full: bool) -> bool:
+        transactions = categories = None
+        if state is not None:
+            records, names = state
+            transactions = [Transaction.from_dict(record) for record in records]
+            categories = CategoryManager.from_dict(names)
+        
+        if full:
+            if not self.storage.save(transactions, categories):
+                return False
+            # Com needs_state() o estado mais recente já inclui as alterações
+            if not changes or self.storage.needs_state():
+                return True
+            return self.storage.save_changes(changes, None, None)
+        return self.storage.save_changes(changes, transactions, categories)
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._dirty and not self._closed:
+                    self._cond.wait()
+                if not self._dirty:
+                    return
+                
+                # Espera a rajada de alterações terminar
+                while not (self._closed or self._urgent):
+                    deadline = min(self._last + self.delay,
+                                   self._first + self.max_delay)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                
+                changes, state, full = self._changes, self._state, self._full
+                self._changes, self._state, self._full = [], None, False
+                self._dirty = False
+                self._busy = True
+            
+            ok = False
+            try:
+                ok = self._write(changes, state, full)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    if not ok:
+                        self._retry = (changes, state, full)
+                        # Com alterações novas pendentes, o lote segue junto com elas
+                        if self._dirty:
+                            self._requeue_retry()
+                    self.ok = ok
+                    self._cond.notify_all()
+    
+    def flush(self) -> bool:
+        """Grava imediatamente o que estiver pendente e aguarda"""
+        with self._cond:
+            self._requeue_retry()
+            self._urgent = True
+            self._cond.notify_all()
+            while self._dirty or self._busy:
+                self._cond.wait()
+            self._urgent = False
+            return self.ok
+    
+    def close(self) -> bool:
+        """Grava o que estiver pendente e encerra a thread"""
+        ok = self.flush()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        return ok
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Armazenamento colunar das transações para agregações
+"""
+from array import array
+from typing import Dict, Iterable, List
+from models import Transaction
+from .parallel import map_shards, merge_report_totals, report_totals
+from .report import Report
+
+
+class ColumnStore:
+    """Mantém as transações em colunas compactas (arrays tipados)
+    
+    Só as colunas lidas pelo relatório: valores em centavos inteiros, o
+    tipo como flag (1 = receita) e a categoria como código internado.
+    O relatório percorre as colunas uma única vez, sem criar listas
+    intermediárias.
+    """
+    
+    def __init__(self, transactions: Iterable[Transaction] = ()):
+        self.cents = array('q')
+        self.receita = array('b')
+        self.cat_codes = array('l')
+        self.objects: List[Transaction] = []
+        
+        self._rows: Dict[int, int] = {}
+        self._cat_names: List[str] = []
+        self._cat_index: Dict[str, int] = {}
+        
+        for t in transactions:
+            self.add(t)
+    
+    def __len__(self) -> int:
+        return len(self.objects)
+    
+    def _category_code(self, categoria: str) -> int:
+        """Retorna o código internado da categoria"""
+        code = self._cat_index.get(categoria)
+        if code is None:
+            code = len(self._cat_names)
+            self._cat_names.append(categoria)
+            self._cat_index[categoria] = code
+        return code
+    
+    def _encode(self, t: Transaction) -> tuple:
+        """Converte a transação nos valores de cada coluna"""
+        return (t.cents, 1 if t.tipo == 'receita' else 0,
+                self._category_code(t.categoria))
+    
+    def add(self, t: Transaction):
+        """Adiciona transação ao final das colunas"""
+        values = self._encode(t)
+        self._rows[t.id] = len(self.objects)
+        for column, value in zip(self._columns(), values):
+            column.append(value)
+        self.objects.append(t)
+    
+    def remove(self, t: Transaction):
+        """Remove a transação trocando-a pela última linha (O(1))"""
+        row = self._rows.pop(t.id, None)
+        if row is None:
+            return
+        
+        last = len(self.objects) - 1
+        if row != last:
+            for column in self._columns():
+                column[row] = column[last]
+            moved = self.objects[row] = self.objects[last]
+            self._rows[moved.id] = row
+        
+        for column in self._columns():
+            column.pop()
+        self.objects.pop()
+    
+    def _columns(self) -> tuple:
+        return (self.cents, self.receita, self.cat_codes)
+    
+    # Agregações
+    
+    def report(self) -> Report:
+        """Totais, categorias e maiores valores em uma passada pelas colunas"""
+        totals, counts, maximum, rows = merge_report_totals(map_shards(
+            report_totals, (self.cat_codes, self.cents, self.receita)
+        ))
+        
+        names = self._cat_names
+        return Report(
+            {tipo: {names[code]: cents for code, cents in totals[flag].items()}
+             for tipo, flag in (('receita', 1), ('despesa', 0))},
+            {'receita': counts[1], 'despesa': counts[0]},
+            {'receita': self.cents[rows[1]] if counts[1] else None,
+             'despesa': self.cents[rows[0]] if counts[0] else None},
+            self.objects[rows[0]] if counts[0] else None
+        )
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Exportação de transações para CSV em streaming
+"""
+import csv
+from datetime import date
+from typing import Callable, Dict, Iterable, Optional
+from config import DATE_FORMAT
+from models import Transaction
+
+CSV_HEADER = ['ID', 'Data', 'Tipo', 'Categoria', 'Descrição', 'Valor']
+WRITE_BUFFER = 1 << 20
+
+
+def format_cents(cents: int) -> str:
+    """Formata centavos no padrão brasileiro sem símbolo (1.234,56)"""
+    sign = '-' if cents < 0 else ''
+    reais, resto = divmod(abs(cents), 100)
+    return f"{sign}{reais:,}".replace(',', '.') + f",{resto:02d}"
+
+
+def export_transactions(transactions: Iterable[Transaction], filename: str,
+                        progress: Optional[Callable[[int], None]] = None,
+                        chunk_size: int = 10_000) -> int:
+    """Escreve as transações no CSV linha a linha e retorna o total
+    
+    O arquivo é gravado com buffer grande e o módulo csv cuida das aspas
+    (';' ou quebras de linha na descrição não corrompem o arquivo). A
+    data formatada é calculada uma única vez por dia distinto.
+    progress(n) é chamado a cada chunk_size linhas e ao final.
+    """
+    dates: Dict[int, str] = {}
+    count = 0
+    
+    with open(filename, 'w', encoding='utf-8-sig', newline='',
+              buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f, delimiter=';', lineterminator='\n')
+        writer.writerow(CSV_HEADER)
+        
+        for t in transactions:
+            ordinal = t.get_ordinal()
+            data_fmt = dates.get(ordinal)
+            if data_fmt is None:
+                data_fmt = dates[ordinal] = date.fromordinal(ordinal).strftime(DATE_FORMAT)
+            
+            writer.writerow((t.id, data_fmt, t.tipo, t.categoria,
+                             t.descricao, format_cents(t.cents)))
+            
+            count += 1
+            if progress is not None and count % chunk_size == 0:
+                progress(count)
+    
+    if progress is not None:
+        progress(count)
+    
+    return count
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""
+Índice ordenado por data
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from math import inf
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from models import Transaction
+
+
+class DateIndex:
+    """Mantém as transações ordenadas por data (parseada uma única vez)
+    
+    Consultas por período usam busca binária: O(log n + k).
+    """
+    
+    def __init__(self):
+        self._entries: List[Tuple[datetime, int]] = []
+        self._items: List[Transaction] = []
+        self._dates: Dict[int, datetime] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def add(self, t: Transaction):
+        """Insere transação na posição ordenada"""
+        key = (t.get_date_obj(), t.id)
+        pos = bisect_right(self._entries, key)
+        self._entries.insert(pos, key)
+        self._items.insert(pos, t)
+        self._dates[t.id] = key[0]
+    
+    def add_all(self, transactions: Iterable[Transaction]):
+        """Insere várias transações de uma vez (ordena uma única vez)"""
+        pairs = [((t.get_date_obj(), t.id), t) for t in transactions]
+        pairs.extend(zip(self._entries, self._items))
+        pairs.sort(key=lambda p: p[0])
+        
+        self._entries = [key for key, _ in pairs]
+        self._items = [t for _, t in pairs]
+        self._dates = {trans_id: date for date, trans_id in self._entries}
+    
+    def remove(self, t: Transaction):
+        """Remove transação do índice"""
+        date = self._dates.pop(t.id, None)
+        if date is None:
+            return
+        
+        pos = bisect_left(self._entries, (date, t.id))
+        del self._entries[pos]
+        del self._items[pos]
+    
+    def bounds(self, start: datetime, end: datetime) -> Tuple[int, int]:
+        """Posições [lo, hi) do período na ordem por data"""
+        return (bisect_left(self._entries, (start,)),
+                bisect_right(self._entries, (end, inf)))
+    
+    def range(self, start: datetime, end: datetime) -> List[Transaction]:
+        """Transações com start <= data <= end, em ordem cronológica"""
+        lo, hi = self.bounds(start, end)
+        return self._items[lo:hi]
+    
+    def count(self, start: datetime, end: datetime) -> int:
+        """Quantidade de transações no período, em O(log n)"""
+        lo, hi = self.bounds(start, end)
+        return max(0, hi - lo)
+    
+    def iter_range(self, start: datetime, end: datetime,
+                   reverse: bool = False) -> Iterator[Transaction]:
+        """Percorre o período sem copiar a fatia (pode ser interrompido)"""
+        lo, hi = self.bounds(start, end)
+        items = self._items
+        for pos in (range(hi - 1, lo - 1, -1) if reverse else range(lo, hi)):
+            yield items[pos]
+    
+    def view(self) -> List[Transaction]:
+        """Lista interna em ordem crescente de data (sem cópia, só leitura)"""
+        return self._items
+    
+    def sorted(self, reverse: bool = False,
+               limit: Optional[int] = None) -> List[Transaction]:
+        """Transações em ordem de data, opcionalmente só as primeiras"""
+        if not reverse:
+            return self._items[:limit]
+        
+        if limit is None:
+            return self._items[::-1]
+        
+        return self._items[:-limit - 1:-1] if limit else []
\ No newline at end of file
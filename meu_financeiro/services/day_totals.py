@@ -0,0 +1,189 @@
+"""
+Totais por dia em árvores de Fenwick (somas de períodos em O(log n))
+"""
+import heapq
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from models import Transaction
+
+# Ordinais de datetime: 1 (0001-01-01) até date.max (9999-12-31)
+MAX_DAY = date.max.toordinal()
+
+
+class FenwickTree:
+    """Árvore de Fenwick esparsa de inteiros sobre as posições [0, size)
+    
+    Só os nós tocados existem (dicionário): atualizar uma posição cria no
+    máximo O(log size) nós, e soma de prefixo e atualização custam
+    O(log size) qualquer que seja a posição.
+    """
+    
+    def __init__(self, size: int):
+        self._size = size
+        self._tree: Dict[int, int] = {}
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    @classmethod
+    def from_items(cls, size: int, values: Dict[int, int]) -> 'FenwickTree':
+        """Constrói a árvore a partir de {posição: valor}, em O(nós log nós)"""
+        fenwick = cls(size)
+        tree = fenwick._tree = {pos + 1: value for pos, value in values.items() if value}
+        # Os filhos de um nó têm índices menores: em ordem crescente, cada
+        # nó já está completo quando é somado ao pai
+        heap = list(tree)
+        heapq.heapify(heap)
+        while heap:
+            i = heapq.heappop(heap)
+            parent = i + (i & -i)
+            if parent <= size:
+                if parent not in tree:
+                    tree[parent] = 0
+                    heapq.heappush(heap, parent)
+                tree[parent] += tree[i]
+        return fenwick
+    
+    def merge(self, other: 'FenwickTree'):
+        """Soma as posições de other (do mesmo tamanho) às desta árvore"""
+        tree = self._tree
+        for i, value in other._tree.items():
+            tree[i] = tree.get(i, 0) + value
+    
+    def add(self, pos: int, delta: int):
+        """Soma delta à posição pos (base 0)"""
+        tree = self._tree
+        size = self._size
+        i = pos + 1
+        while i <= size:
+            tree[i] = tree.get(i, 0) + delta
+            i += i & -i
+    
+    def prefix(self, end: int) -> int:
+        """Soma das posições [0, end)"""
+        tree = self._tree
+        i = min(max(end, 0), self._size)
+        total = 0
+        while i > 0:
+            total += tree.get(i, 0)
+            i -= i & -i
+        return total
+    
+    def range_sum(self, start: int, end: int) -> int:
+        """Soma das posições [start, end)"""
+        return self.prefix(end) - self.prefix(start)
+
+
+class DayTotals:
+    """Centavos e contagens por dia, por tipo e por categoria
+    
+    Cada série é uma FenwickTree esparsa indexada pelo próprio ordinal do
+    dia, de 0001-01-01 a 9999-12-31: inserir ou remover é uma atualização
+    pontual em O(log MAX_DAY) em qualquer dia, sem reconstruir nada, e
+    só os nós tocados ocupam memória (uma data distante, ex.: ano
+    digitado errado, cria algumas dezenas de nós).
+    """
+    
+    def __init__(self):
+        # (tipo, None) = total do tipo; (tipo, categoria) = total da categoria
+        self._cents: Dict[Tuple[str, Optional[str]], FenwickTree] = {}
+        self._counts: Dict[str, FenwickTree] = {}
+    
+    def __len__(self) -> int:
+        return sum(tree.prefix(MAX_DAY + 1) for tree in self._counts.values())
+    
+    @staticmethod
+    def _tipo(t: Transaction) -> str:
+        return 'receita' if t.tipo == 'receita' else 'despesa'
+    
+    def _series(self, t: Transaction) -> Tuple[FenwickTree, FenwickTree, FenwickTree]:
+        tipo = self._tipo(t)
+        trees = []
+        for key in ((tipo, None), (tipo, t.categoria)):
+            tree = self._cents.get(key)
+            if tree is None:
+                tree = self._cents[key] = FenwickTree(MAX_DAY + 1)
+            trees.append(tree)
+        counts = self._counts.get(tipo)
+        if counts is None:
+            counts = self._counts[tipo] = FenwickTree(MAX_DAY + 1)
+        return trees[0], trees[1], counts
+    
+    def _apply(self, t: Transaction, sign: int):
+        day = t.get_ordinal()
+        total, category, counts = self._series(t)
+        total.add(day, sign * t.cents)
+        category.add(day, sign * t.cents)
+        counts.add(day, sign)
+    
+    def add(self, t: Transaction):
+        self._apply(t, 1)
+    
+    def remove(self, t: Transaction):
+        self._apply(t, -1)
+    
+    def add_all(self, transactions: Iterable[Transaction]):
+        """Insere um lote somando por dia e construindo cada série de uma vez"""
+        cents: Dict[Tuple[str, Optional[str]], Dict[int, int]] = {}
+        counts: Dict[str, Dict[int, int]] = {}
+        for t in transactions:
+            day = t.get_ordinal()
+            tipo = 'receita' if t.tipo == 'receita' else 'despesa'
+            for key in ((tipo, None), (tipo, t.categoria)):
+                values = cents.setdefault(key, {})
+                values[day] = values.get(day, 0) + t.cents
+            values = counts.setdefault(tipo, {})
+            values[day] = values.get(day, 0) + 1
+        
+        # Árvores são lineares nos valores: o lote vira uma árvore somada nó a nó
+        for series, deltas in ((self._cents, cents), (self._counts, counts)):
+            for key, values in deltas.items():
+                delta = FenwickTree.from_items(MAX_DAY + 1, values)
+                tree = series.get(key)
+                if tree is None:
+                    series[key] = delta
+                else:
+                    tree.merge(delta)
+    
+    # Consultas (dias como ordinais, intervalos inclusivos)
+    
+    @staticmethod
+    def _bounds(first: int, last: int) -> Tuple[int, int]:
+        """Posições [início, fim) dos dias [first, last]"""
+        return first, last + 1
+    
+    def _sum(self, tree: Optional[FenwickTree], bounds: Tuple[int, int]) -> int:
+        if tree is None:
+            return 0
+        return tree.range_sum(*bounds)
+    
+    def totals(self, first: int, last: int) -> Dict[str, int]:
+        """Centavos e contagens por tipo nos dias [first, last]"""
+        bounds = self._bounds(first, last)
+        result = {}
+        for tipo in ('receita', 'despesa'):
+            result[tipo] = self._sum(self._cents.get((tipo, None)), bounds)
+            result[f"num_{tipo}s"] = self._sum(self._counts.get(tipo), bounds)
+        return result
+    
+    def by_category(self, first: int, last: int, tipo: str = 'despesa') -> Dict[str, int]:
+        """Centavos por categoria do tipo nos dias [first, last] (sem zeros)"""
+        bounds = self._bounds(first, last)
+        result = {}
+        for (key_tipo, categoria), tree in self._cents.items():
+            if key_tipo == tipo and categoria is not None:
+                cents = self._sum(tree, bounds)
+                if cents:
+                    result[categoria] = cents
+        return result
+    
+    def balance(self, last: int) -> int:
+        """Saldo acumulado (receitas - despesas) até o fim do dia last"""
+        receitas = self._cents.get(('receita', None))
+        despesas = self._cents.get(('despesa', None))
+        return ((receitas.prefix(last + 1) if receitas else 0)
+                - (despesas.prefix(last + 1) if despesas else 0))
+    
+    def balance_series(self, days: Iterable[int]) -> List[int]:
+        """Saldo acumulado ao fim de cada dia, em O(log MAX_DAY) por ponto"""
+        return [self.balance(day) for day in days]
\ No newline at end of file
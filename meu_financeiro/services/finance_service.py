@@ -1,27 +1,203 @@
 """
 Serviço de lógica financeira
 """
-from typing import List, Dict, Optional
-from datetime import datetime
-import statistics
+from typing import (TYPE_CHECKING, Callable, Iterable, Iterator, List, Dict, Optional,
+                    Sequence)
+from calendar import monthrange
+from datetime import datetime, time
 from models import Transaction, CategoryManager
+from utils.instrumentation import instrument
+from .report import Report
+from .result_cache import ResultCache
+from .transaction_repository import TransactionRepository
 
+# Índices, consultas e estatísticas são importados no primeiro uso, para
+# que comandos que não os consultam não paguem a importação no início
+if TYPE_CHECKING:
+    from .query import Plan, Query
+    from .streaming_stats import GroupStats
 
+
+# Sem uma lista de entrada, a chamada processa o histórico carregado
+@instrument('FinanceService',
+            rows=lambda service: len(service.repository) if service.is_loaded else 0)
 class FinanceService:
     """Gerencia operações financeiras"""
     
-    def __init__(self, transactions: List[Transaction], 
-                 categories: CategoryManager):
-        self.transactions = transactions
+    # Índices que podem ser gravados em disco e restaurados no início
+    PERSISTED_INDEXES = ('search', 'monthly')
+    # Chaves de ordenação aceitas por sorted_view
+    SORT_KEYS = {
+        'data': lambda t: (t.get_date_obj(), t.id),
+        'valor': lambda t: (t.cents, t.id),
+        'categoria': lambda t: (t.categoria, t.id),
+        'id': lambda t: t.id
+    }
+    # Índices secundários, construídos no primeiro uso (ver __getattr__)
+    INDEXES = ('columns', 'dates', 'search', 'monthly', 'month_stats', 'day_totals')
+    
+    def __init__(self, transactions: Iterable[Transaction], 
+                 categories: CategoryManager, query_backend=None,
+                 load_index: Optional[Callable[[str], Optional[Dict]]] = None,
+                 partition_source=None):
         self.categories = categories
+        # Backend (ex.: SQLite) que executa filtros e agregações em SQL
+        self.query_backend = query_backend
+        # load_index(nome) lê um índice salvo (None se ausente ou obsoleto)
+        self._load_index = load_index
+        # Índices restaurados do disco (não precisam ser gravados de novo)
+        self._restored = set()
+        # Backend particionado: transactions traz só os meses recentes e
+        # os demais são lidos na primeira consulta que precisar deles
+        self.partition_source = partition_source
+        self._unloaded_months = set()
+        # Resultados memorizados até a próxima alteração das transações
+        self.cache = ResultCache()
+        if partition_source is not None:
+            loaded = {self._month_of(t) for t in transactions}
+            self._unloaded_months = set(partition_source.months()) - loaded
+        
+        # Listas são indexadas já; geradores (ledger JSON Lines) só são
+        # consumidos no primeiro acesso aos dados
+        self._source = transactions
+        if isinstance(transactions, list):
+            self._build()
+    
+    def __getattr__(self, name):
+        # Só é chamado para atributos ainda inexistentes
+        if name == 'repository' and self.__dict__.get('_source') is not None:
+            self._build()
+            return self.repository
+        if name in self.INDEXES and '_source' in self.__dict__:
+            index = self._create_index(name)
+            setattr(self, name, index)
+            return index
+        raise AttributeError(name)
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Indica se o histórico já foi lido e indexado"""
+        return self._source is None
+    
+    def _build(self):
+        """Lê as transações e constrói o repositório
+        
+        Os índices secundários só são construídos quando usados, para
+        não atrasar o início com índices que a sessão não consulta.
+        """
+        transactions, self._source = self._source, None
+        
+        self.repository = TransactionRepository(transactions)
+        if self.partition_source is not None:
+            self.repository.reserve_ids(self.partition_source.max_id())
+        # Alterações do repositório invalidam os resultados memorizados
+        self.repository.register(self.cache, populate=False)
+        # Versão do histórico que corresponde aos índices salvos em disco
+        self._saved_version = self.cache.version
+    
+    def _create_index(self, name: str):
+        """Constrói e registra o índice secundário name"""
+        repository = self.repository
+        if name == 'columns':
+            # Colunas compactas usadas nas agregações sobre todo o histórico
+            from .column_store import ColumnStore
+            index = ColumnStore()
+        elif name == 'dates':
+            # Índice ordenado por data para consultas por período
+            from .date_index import DateIndex
+            index = DateIndex()
+        elif name == 'search':
+            # Índice invertido das descrições
+            from .text_index import TextIndex
+            return self._register_saved(name, TextIndex)
+        elif name == 'monthly':
+            # Agregados mensais usados pelo gráfico
+            from .monthly_rollup import MonthlyRollup
+            return self._register_saved(name, MonthlyRollup)
+        elif name == 'month_stats':
+            # Estatísticas detalhadas por mês (calculadas na primeira consulta)
+            from .streaming_stats import MonthlyStats
+            index = MonthlyStats(self.dates)
+        else:
+            # Totais por dia para somas de períodos e saldo acumulado
+            from .day_totals import DayTotals
+            index = DayTotals()
+        repository.register(index)
+        return index
+    
+    def _register_saved(self, name: str, index_cls):
+        """Registra índice restaurado do disco ou, se inválido, reconstruído
+        
+        O índice salvo só é usado se o histórico não mudou desde a leitura.
+        """
+        index = None
+        if self._load_index is not None and self.cache.version == self._saved_version:
+            saved = self._load_index(name)
+            if saved:
+                index = index_cls.from_dict(saved, self.repository)
+        if index is not None:
+            self.repository.register(index, populate=False)
+            self._restored.add(name)
+        else:
+            index = index_cls()
+            self.repository.register(index)
+        return index
+    
+    @staticmethod
+    def _month_of(t: Transaction) -> str:
+        date = t.get_date_obj()
+        return f"{date.year:04d}-{date.month:02d}"
+    
+    def _load_months(self, keys: Iterable[str]):
+        """Lê as partições ainda não carregadas dentre keys"""
+        keys = sorted(self._unloaded_months.intersection(keys))
+        if not keys:
+            return
+        self._unloaded_months.difference_update(keys)
+        self.repository.add_many(self.partition_source.load_months(keys))
+    
+    def _load_period(self, start: datetime, end: datetime):
+        """Lê as partições que se sobrepõem ao período"""
+        first = f"{start.year:04d}-{start.month:02d}"
+        last = f"{end.year:04d}-{end.month:02d}"
+        self._load_months([k for k in self._unloaded_months if first <= k <= last])
+    
+    def _load_all(self):
+        """Lê todas as partições restantes (consultas sobre todo o histórico)"""
+        self._load_months(list(self._unloaded_months))
+    
+    def export_indexes(self) -> Dict[str, Dict]:
+        """Índices persistíveis construídos nesta sessão, por nome
+        
+        Índices nunca usados não são construídos só para a gravação:
+        se o histórico mudou, seus arquivos ficam obsoletos (a impressão
+        digital do ledger não confere) e são reconstruídos quando usados.
+        Restaurados sem alterações no histórico continuam válidos.
+        """
+        unchanged = self.is_loaded and self.cache.version == self._saved_version
+        return {
+            name: self.__dict__[name].to_dict()
+            for name in self.PERSISTED_INDEXES
+            if name in self.__dict__ and not (unchanged and name in self._restored)
+        }
+    
+    def is_empty(self) -> bool:
+        """Indica se não há transações (sem ler partições pendentes)"""
+        return not self._unloaded_months and not self.repository
+    
+    @property
+    def transactions(self) -> TransactionRepository:
+        """Todas as transações (iterável, em ordem de inserção)"""
+        self._load_all()
+        return self.repository
     
     def add_transaction(self, tipo: str, categoria: str, descricao: str,
                        valor: float, data: str) -> Transaction:
         """Adiciona nova transação"""
-        new_id = max([t.id for t in self.transactions], default=0) + 1
-        
+        # O mês de destino precisa estar carregado antes de receber a transação
+        self._load_months([data[:7]])
         transaction = Transaction(
-            id=new_id,
+            id=self.repository.next_id(),
             tipo=tipo,
             categoria=categoria,
             descricao=descricao,
@@ -29,149 +205,304 @@ class FinanceService:
             data=data
         )
         
-        self.transactions.append(transaction)
+        self.repository.add(transaction)
         return transaction
     
+    def add_transactions(self, rows: Iterable[Dict]) -> List[Transaction]:
+        """Adiciona um lote de transações (índices atualizados uma vez)"""
+        rows = list(rows)
+        self._load_months({row['data'][:7] for row in rows})
+        batch = [
+            Transaction(
+                id=self.repository.next_id(),
+                tipo=row['tipo'],
+                categoria=row['categoria'],
+                descricao=row['descricao'],
+                valor=row['valor'],
+                data=row['data']
+            )
+            for row in rows
+        ]
+        
+        self.repository.add_many(batch)
+        return batch
+    
     def update_transaction(self, trans_id: int, **kwargs) -> bool:
         """Atualiza transação existente"""
-        transaction = self.get_transaction_by_id(trans_id)
-        
-        if not transaction:
+        if self.get_transaction_by_id(trans_id) is None:
             return False
-        
-        for key, value in kwargs.items():
-            if hasattr(transaction, key) and value is not None:
-                setattr(transaction, key, value)
-        
-        return True
+        if 'data' in kwargs:
+            self._load_months([kwargs['data'][:7]])
+        return self.repository.update(trans_id, kwargs) is not None
     
     def delete_transaction(self, trans_id: int) -> bool:
         """Remove transação"""
-        transaction = self.get_transaction_by_id(trans_id)
-        
-        if transaction:
-            self.transactions.remove(transaction)
-            return True
-        
-        return False
+        if self.get_transaction_by_id(trans_id) is None:
+            return False
+        return self.repository.delete(trans_id)
     
     def get_transaction_by_id(self, trans_id: int) -> Optional[Transaction]:
         """Busca transação por ID"""
-        return next((t for t in self.transactions if t.id == trans_id), None)
+        transaction = self.repository.get(trans_id)
+        if transaction is None and self._unloaded_months:
+            self._load_all()
+            transaction = self.repository.get(trans_id)
+        return transaction
     
     def filter_by_period(self, start: datetime, end: datetime) -> List[Transaction]:
-        """Filtra transações por período"""
-        return [
-            t for t in self.transactions
-            if start <= t.get_date_obj() <= end
-        ]
+        """Filtra transações por período
+        
+        A lista pode vir do cache e ser devolvida de novo: não a altere.
+        """
+        if self.query_backend is not None:
+            # Sem cache: o banco reflete o que foi gravado, não a versão em memória
+            return self.query_backend.filter_by_period(start, end)
+        
+        self._load_period(start, end)
+        # Chave pelas posições no índice: "até agora" continua acertando
+        # enquanto nenhuma transação entrar no período
+        return self.cache.get_or_compute(('period',) + self.dates.bounds(start, end),
+                                         lambda: self.dates.range(start, end))
     
     def filter_by_description(self, term: str) -> List[Transaction]:
         """Filtra por descrição"""
-        term_lower = term.lower()
-        return [
-            t for t in self.transactions
-            if term_lower in t.descricao.lower()
-        ]
+        self._load_all()
+        return self.search.search(term)
     
     def filter_by_category(self, category: str) -> List[Transaction]:
         """Filtra por categoria"""
-        return [t for t in self.transactions if t.categoria == category]
+        self._load_all()
+        return self.repository.by_category(category)
     
     def filter_by_value_range(self, min_val: float, 
                              max_val: float) -> List[Transaction]:
         """Filtra por faixa de valor"""
-        return [
-            t for t in self.transactions
-            if min_val <= t.valor <= max_val
-        ]
+        from .query import Query
+        
+        return list(self.query(Query(min_val=min_val, max_val=max_val)))
     
-    def calculate_summary(self, transactions: Optional[List[Transaction]] = None) -> Dict:
-        """Calcula resumo financeiro"""
-        # CORREÇÃO: Se None, usa todas as transações
-        trans = transactions if transactions is not None else self.transactions
+    def _plan(self, query: 'Query') -> 'Plan':
+        from .query import plan_query
         
-        receitas = [t for t in trans if t.tipo == 'receita']
-        despesas = [t for t in trans if t.tipo == 'despesa']
+        if query.sort_key is not None and query.sort_key not in self.SORT_KEYS:
+            raise ValueError(f"Chave de ordenação inválida: {query.sort_key}")
         
-        total_receitas = sum(t.valor for t in receitas)
-        total_despesas = sum(t.valor for t in despesas)
-        saldo = total_receitas - total_despesas
+        conditions = query.conditions
+        if 'start' in conditions or 'end' in conditions:
+            self._load_period(conditions.get('start', datetime.min),
+                              conditions.get('end', datetime.max))
+        else:
+            self._load_all()
+        return plan_query(query, self.repository, self.dates, self.search, self.SORT_KEYS)
+    
+    def query(self, query: 'Query') -> Iterator[Transaction]:
+        """Executa uma consulta combinada (ver services.query.Query)
         
-        return {
-            'total_receitas': total_receitas,
-            'total_despesas': total_despesas,
-            'saldo': saldo,
-            'num_receitas': len(receitas),
-            'num_despesas': len(despesas),
-            'total_transactions': len(trans)
-        }
+        A origem é o índice mais seletivo para as condições; as demais
+        são aplicadas sob demanda enquanto o resultado é percorrido.
+        """
+        return self._plan(query).execute()
+    
+    def explain(self, query: 'Query') -> str:
+        """Descreve o plano que query() usaria"""
+        return self._plan(query).describe()
+    
+    def _is_full_ledger(self, transactions: Optional[List[Transaction]]) -> bool:
+        """Indica se a consulta abrange todas as transações
+        
+        Sendo o caso, garante que todas as partições estejam carregadas.
+        """
+        if transactions is None or transactions is self.repository:
+            self._load_all()
+            return True
+        return False
+    
+    def _cached_for(self, key: tuple, transactions: Iterable[Transaction],
+                    compute: Callable):
+        """Memoriza compute(transactions) para listas (identificadas por id)
+        
+        Listas são tratadas como fotografias imutáveis, como as devolvidas
+        por filter_by_period; outros iteráveis são sempre recalculados.
+        """
+        if not isinstance(transactions, list):
+            return compute(transactions)
+        return self.cache.get_or_compute(key + (id(transactions),),
+                                         lambda: compute(transactions), ref=transactions)
+    
+    def report(self, transactions: Optional[Iterable[Transaction]] = None) -> Report:
+        """Totais, categorias e estatísticas em uma única passada
+        
+        Sobre todo o histórico a passada é feita nas colunas compactas
+        (em paralelo se o histórico for grande).
+        """
+        if self._is_full_ledger(transactions):
+            return self.cache.get_or_compute(('report',), self.columns.report)
+        return self._cached_for(('report',), transactions, Report.from_transactions)
+    
+    def calculate_summary(self, transactions: Optional[List[Transaction]] = None) -> Dict:
+        """Calcula resumo financeiro"""
+        return self.report(transactions).summary()
     
     def calculate_by_category(self, transactions: Optional[List[Transaction]] = None,
                              tipo: str = 'despesa') -> Dict[str, float]:
         """Calcula total por categoria"""
-        # CORREÇÃO: Se None, usa todas as transações
-        trans = transactions if transactions is not None else self.transactions
-        filtered = [t for t in trans if t.tipo == tipo]
-        
-        category_totals = {}
-        for t in filtered:
-            category_totals[t.categoria] = category_totals.get(t.categoria, 0) + t.valor
-        
-        return dict(sorted(category_totals.items(), 
-                          key=lambda x: x[1], reverse=True))
+        if transactions is None and self.query_backend is not None:
+            return self.query_backend.calculate_by_category(tipo)
+        return self.report(transactions).by_category(tipo)
     
     def get_statistics(self, transactions: Optional[List[Transaction]] = None) -> Dict:
         """Calcula estatísticas"""
-        # CORREÇÃO: Se None, usa todas as transações
-        trans = transactions if transactions is not None else self.transactions
+        return self.report(transactions).statistics()
+    
+    def distribution(self, transactions: Optional[Iterable[Transaction]] = None) -> 'GroupStats':
+        """Desvio, extremos, mediana, p90 e p99 por tipo e por categoria
         
-        if not trans:
-            return {}
+        Usa memória constante por grupo. Sobre todo o histórico combina
+        os parciais mensais, recalculando só os meses alterados.
+        """
+        if self._is_full_ledger(transactions):
+            return self.cache.get_or_compute(('distribution',), self.month_stats.merged)
         
-        receitas = [t.valor for t in trans if t.tipo == 'receita']
-        despesas = [t.valor for t in trans if t.tipo == 'despesa']
+        from .streaming_stats import GroupStats
         
-        stats = {}
+        def compute(rows: Iterable[Transaction]) -> GroupStats:
+            stats = GroupStats()
+            stats.add_all(rows)
+            return stats
         
-        if receitas:
-            stats['media_receitas'] = statistics.mean(receitas)
-            stats['maior_receita'] = max(receitas)
+        return self._cached_for(('distribution',), transactions, compute)
+    
+    def _period_parts(self, start: datetime, end: datetime):
+        """Dias inteiros do período (ordinais) e transações dos dias parciais"""
+        first = start.toordinal() + (0 if start.time() == time.min else 1)
+        last = end.toordinal() - (0 if end.time() == time.max else 1)
+        if first > last:
+            return None, self.dates.range(start, end)
+        
+        edges = []
+        if start.time() != time.min:
+            edges += self.dates.range(start, datetime.combine(start.date(), time.max))
+        if end.time() != time.max:
+            edges += self.dates.range(datetime.combine(end.date(), time.min), end)
+        return (first, last), edges
+    
+    def period_summary(self, start: datetime, end: datetime) -> Dict:
+        """Resumo do período (mesmo formato de calculate_summary) em O(log n)
+        
+        Os dias inteiros vêm do DayTotals; só as transações dos dias de
+        início e fim cortados no meio são percorridas.
+        """
+        self._load_period(start, end)
+        days, edges = self._period_parts(start, end)
+        totals = {'receita': 0, 'despesa': 0, 'num_receitas': 0, 'num_despesas': 0}
+        if days is not None:
+            totals = self.day_totals.totals(*days)
+        
+        edge = Report.from_transactions(edges)
+        receitas = totals['receita'] + edge.totals['receita']
+        despesas = totals['despesa'] + edge.totals['despesa']
+        num_receitas = totals['num_receitas'] + edge.counts['receita']
+        num_despesas = totals['num_despesas'] + edge.counts['despesa']
+        
+        return {
+            'total_receitas': receitas / 100,
+            'total_despesas': despesas / 100,
+            'saldo': (receitas - despesas) / 100,
+            'num_receitas': num_receitas,
+            'num_despesas': num_despesas,
+            'total_transactions': num_receitas + num_despesas
+        }
+    
+    def period_by_category(self, start: datetime, end: datetime,
+                           tipo: str = 'despesa') -> Dict[str, float]:
+        """Total por categoria no período, do maior para o menor, em O(categorias log n)"""
+        self._load_period(start, end)
+        days, edges = self._period_parts(start, end)
+        totals = self.day_totals.by_category(*days, tipo) if days is not None else {}
+        
+        for categoria, cents in Report.from_transactions(edges).categories[tipo].items():
+            totals[categoria] = totals.get(categoria, 0) + cents
         
-        if despesas:
-            stats['media_despesas'] = statistics.mean(despesas)
-            stats['maior_despesa'] = max(despesas)
-            despesas_trans = [t for t in trans if t.tipo == 'despesa']
-            stats['maior_despesa_obj'] = max(despesas_trans, 
-                                            key=lambda x: x.valor)
+        ordered = sorted(((cat, cents) for cat, cents in totals.items() if cents),
+                         key=lambda x: x[1], reverse=True)
+        return {cat: cents / 100 for cat, cents in ordered}
+    
+    def balance_over_time(self, num_months: int = 12) -> List[Dict]:
+        """Saldo acumulado ao fim de cada um dos últimos meses
+        
+        Os meses terminam no da transação mais recente; cada ponto é uma
+        soma de prefixo no DayTotals (O(log n)).
+        """
+        self._load_all()
+        rows = self.dates.view()
+        if not rows:
+            return []
         
-        return stats
+        last = rows[-1].get_date_obj()
+        index = last.year * 12 + last.month - 1
+        # Meses antes de janeiro do ano 1 não existem em datetime (12 = 0001-01)
+        first = max(index - num_months + 1, 12)
+        starts = [datetime(month // 12, month % 12 + 1, 1)
+                  for month in range(first, index + 1)]
+        ends = [start.replace(day=monthrange(start.year, start.month)[1])
+                for start in starts]
+        balances = self.day_totals.balance_series(end.toordinal() for end in ends)
+        return [
+            {
+                # strftime('%Y') não completa anos < 1000 com zeros em todas as plataformas
+                'key': f"{start.year:04d}-{start.month:02d}",
+                'name': f"{start.strftime('%b')}/{start.year:04d}",
+                'saldo': cents / 100
+            }
+            for start, cents in zip(starts, balances)
+        ]
     
     def get_monthly_data(self, num_months: int = 12) -> List[Dict]:
         """Agrupa dados por mês"""
-        monthly_data = {}
-        
-        for t in self.transactions:
-            date = t.get_date_obj()
-            month_key = date.strftime('%Y-%m')
-            month_name = date.strftime('%b/%Y')
-            
-            if month_key not in monthly_data:
-                monthly_data[month_key] = {
-                    'name': month_name,
-                    'receitas': 0.0,
-                    'despesas': 0.0
-                }
-            
-            if t.tipo == 'receita':
-                monthly_data[month_key]['receitas'] += t.valor
-            else:
-                monthly_data[month_key]['despesas'] += t.valor
-        
-        sorted_months = sorted(monthly_data.items())[-num_months:]
-        return [{'key': k, **v} for k, v in sorted_months]
-    
-    def get_all_transactions_sorted(self, reverse: bool = True) -> List[Transaction]:
+        if self.query_backend is not None:
+            return self.query_backend.get_monthly_data(num_months)
+        if self.partition_source is not None:
+            self._load_months(self.partition_source.months()[-num_months:])
+        return self.cache.get_or_compute(('monthly', num_months),
+                                         lambda: self.monthly.monthly(num_months))
+    
+    def iter_filtered(self, start: Optional[datetime] = None,
+                      end: Optional[datetime] = None,
+                      categoria: Optional[str] = None,
+                      tipo: Optional[str] = None) -> Iterator[Transaction]:
+        """Percorre transações em ordem de data com filtros opcionais"""
+        from .query import Query
+        
+        return self.query(Query(start=start, end=end, categoria=categoria,
+                                tipo=tipo).order_by('data'))
+    
+    def sorted_view(self, key: str = 'data',
+                    transactions: Optional[List[Transaction]] = None) -> Sequence[Transaction]:
+        """Transações em ordem crescente de key, para paginação
+        
+        A ordem por data do histórico completo vem direto do DateIndex,
+        sem cópia; as demais ordens são calculadas uma vez por chamada.
+        """
+        if key not in self.SORT_KEYS:
+            raise ValueError(f"Chave de ordenação inválida: {key}")
+        if key == 'data' and self._is_full_ledger(transactions):
+            return self.dates.view()
+        
+        rows = self.transactions if transactions is None else transactions
+        return sorted(rows, key=self.SORT_KEYS[key])
+    
+    def get_all_transactions_sorted(self, reverse: bool = True,
+                                    limit: Optional[int] = None) -> List[Transaction]:
         """Retorna transações ordenadas por data"""
-        return sorted(self.transactions, 
-                     key=lambda x: x.data, reverse=reverse)
\ No newline at end of file
+        if limit is not None and reverse and self.partition_source is not None:
+            # Só os meses mais recentes necessários para completar o limite
+            keys, needed = [], limit
+            for key in reversed(self.partition_source.months()):
+                if needed <= 0:
+                    break
+                keys.append(key)
+                needed -= self.partition_source.month_size(key)
+            self._load_months(keys)
+        else:
+            self._load_all()
+        return self.dates.sorted(reverse=reverse, limit=limit)
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Armazenamento em JSON Lines (uma transação por linha)
+"""
+import json
+import os
+from typing import Dict, Iterator, List
+from datetime import datetime
+from config import DATA_FILE, JSONL_FILE
+from models import Transaction, CategoryManager
+from utils.instrumentation import instrument
+from .storage_service import StorageService
+
+
+@instrument('JsonLinesStorageService')
+class JsonLinesStorageService(StorageService):
+    """Ledger em JSON Lines lido de forma incremental
+    
+    A primeira linha guarda as categorias; cada linha seguinte é uma
+    transação. load() lê só o cabeçalho e devolve um gerador que cria
+    os objetos Transaction à medida que as linhas são consumidas.
+    """
+    
+    def __init__(self, jsonl_file: str = JSONL_FILE, json_file: str = DATA_FILE):
+        super().__init__(json_file, journal=False)
+        self.jsonl_file = jsonl_file
+    
+    def _data_files(self) -> List[str]:
+        return [self.jsonl_file]
+    
+    def load(self) -> tuple[Iterator[Transaction], CategoryManager]:
+        """Lê o cabeçalho e devolve as transações como gerador"""
+        try:
+            if not os.path.exists(self.jsonl_file):
+                if not os.path.exists(self.filename):
+                    return iter(()), CategoryManager()
+                self.convert_from_json(self.filename)
+            
+            with open(self.jsonl_file, 'r', encoding='utf-8') as f:
+                header = json.loads(f.readline() or '{}')
+            
+            categories = CategoryManager.from_dict(header.get('categories', {}))
+            return self.iter_transactions(), categories
+        
+        except Exception as e:
+            print(f"Erro ao carregar dados: {e}")
+            return iter(()), CategoryManager()
+    
+    def iter_records(self) -> Iterator[Dict]:
+        """Percorre as transações como dicionários, linha a linha"""
+        with open(self.jsonl_file, 'r', encoding='utf-8') as f:
+            f.readline()
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    
+    def iter_transactions(self) -> Iterator[Transaction]:
+        """Percorre as transações criando cada objeto sob demanda"""
+        try:
+            for record in self.iter_records():
+                yield Transaction.from_dict(record)
+        except Exception as e:
+            print(f"Erro ao carregar dados: {e}")
+    
+    def save(self, transactions: List[Transaction],
+             categories: CategoryManager) -> bool:
+        """Grava o ledger completo em JSON Lines"""
+        try:
+            self._write(
+                (t.to_dict() for t in transactions), categories.to_dict()
+            )
+            return True
+        
+        except Exception as e:
+            print(f"Erro ao salvar dados: {e}")
+            return False
+    
+    def _write(self, records, categories: Dict):
+        """Escreve cabeçalho e registros com troca atômica do arquivo"""
+        header = {
+            'categories': categories,
+            'last_updated': datetime.now().isoformat()
+        }
+        
+        tmp_file = f"{self.jsonl_file}.tmp"
+        self._ensure_dir(tmp_file)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.jsonl_file)
+    
+    def convert_from_json(self, json_file: str):
+        """Converte um financas.json para o formato JSON Lines"""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        self._write(data.get('transactions', []), data.get('categories', {}))
+    
+    def convert_to_json(self, json_file: str):
+        """Gera um financas.json a partir do ledger JSON Lines"""
+        with open(self.jsonl_file, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline() or '{}')
+        
+        data = {
+            'transactions': list(self.iter_records()),
+            'categories': header.get('categories', {}),
+            'last_updated': datetime.now().isoformat()
+        }
+        
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+Agregados mensais mantidos incrementalmente
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+from models import Transaction
+
+
+class MonthlyRollup:
+    """Totais por mês atualizados por delta a cada alteração
+    
+    Valores são acumulados em centavos inteiros para que somar e
+    subtrair a mesma transação não deixe resíduo de ponto flutuante.
+    """
+    
+    def __init__(self):
+        self._months: Dict[str, Dict] = {}
+    
+    def __len__(self) -> int:
+        return sum(m['count'] for m in self._months.values())
+    
+    def _apply(self, t: Transaction, sign: int):
+        date = t.get_date_obj()
+        key = f"{date.year:04d}-{date.month:02d}"
+        month = self._months.get(key)
+        if month is None:
+            month = self._months[key] = {
+                'receitas': 0, 'despesas': 0, 'count': 0,
+                'categorias': {'receita': {}, 'despesa': {}}
+            }
+        
+        cents = t.cents * sign
+        tipo = 'receita' if t.tipo == 'receita' else 'despesa'
+        month['receitas' if tipo == 'receita' else 'despesas'] += cents
+        month['count'] += sign
+        
+        by_cat = month['categorias'][tipo]
+        total = by_cat.get(t.categoria, 0) + cents
+        if total or sign > 0:
+            by_cat[t.categoria] = total
+        else:
+            by_cat.pop(t.categoria, None)
+        
+        if month['count'] == 0:
+            del self._months[key]
+    
+    def add(self, t: Transaction):
+        """Soma a transação ao mês correspondente"""
+        self._apply(t, 1)
+    
+    def remove(self, t: Transaction):
+        """Subtrai a transação do mês correspondente"""
+        self._apply(t, -1)
+    
+    def monthly(self, num_months: int = 12) -> List[Dict]:
+        """Receitas e despesas dos últimos meses, em O(meses)"""
+        result = []
+        for key in sorted(self._months)[-num_months:]:
+            month = self._months[key]
+            result.append({
+                'key': key,
+                'name': datetime.strptime(key, '%Y-%m').strftime('%b/%Y'),
+                'receitas': month['receitas'] / 100,
+                'despesas': month['despesas'] / 100
+            })
+        return result
+    
+    def month(self, key: str) -> Optional[Dict]:
+        """Agregado completo de um mês ('AAAA-MM'), com totais em reais"""
+        month = self._months.get(key)
+        if month is None:
+            return None
+        
+        return {
+            'receitas': month['receitas'] / 100,
+            'despesas': month['despesas'] / 100,
+            'count': month['count'],
+            'categorias': {
+                tipo: {cat: cents / 100 for cat, cents in cats.items()}
+                for tipo, cats in month['categorias'].items()
+            }
+        }
+    
+    def to_dict(self) -> Dict:
+        """Converte para dicionário (persistência)"""
+        return self._months
+    
+    @classmethod
+    def from_dict(cls, data: Dict, transactions) -> Optional['MonthlyRollup']:
+        """Restaura os agregados; None se não corresponderem às transações"""
+        rollup = cls()
+        rollup._months = data
+        try:
+            if len(rollup) != len(transactions):
+                return None
+        except (AttributeError, KeyError, TypeError):
+            return None
+        return rollup
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Paginação por cursor sobre uma sequência ordenada
+"""
+from datetime import datetime, timedelta
+from typing import List, Sequence
+from config import MAX_TRANSACTIONS_DISPLAY
+from models import Transaction
+
+
+class Pager:
+    """Cursor que expõe uma página por vez de uma sequência ordenada
+    
+    A sequência fica sempre em ordem crescente; a ordem decrescente é
+    feita pelo cálculo das posições, sem copiar nem inverter a lista.
+    Virar a página custa só o fatiamento da página visível.
+    """
+    
+    def __init__(self, rows: Sequence[Transaction],
+                 page_size: int = MAX_TRANSACTIONS_DISPLAY,
+                 reverse: bool = False):
+        self.rows = rows
+        self.page_size = max(1, page_size)
+        self.reverse = reverse
+        self.offset = 0
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    @property
+    def page_number(self) -> int:
+        return self.offset // self.page_size + 1
+    
+    @property
+    def page_count(self) -> int:
+        return max(1, -(-len(self.rows) // self.page_size))
+    
+    def page(self) -> List[Transaction]:
+        """Transações da página atual"""
+        total = len(self.rows)
+        if not self.reverse:
+            return list(self.rows[self.offset:self.offset + self.page_size])
+        
+        hi = total - self.offset
+        lo = max(0, hi - self.page_size)
+        return list(self.rows[lo:hi])[::-1]
+    
+    def seek(self, position: int):
+        """Posiciona o cursor (limitado ao intervalo válido)"""
+        last = max(0, len(self.rows) - 1)
+        self.offset = min(max(0, position), last)
+    
+    def next(self) -> bool:
+        """Avança uma página; False se já está na última"""
+        if self.offset + self.page_size >= len(self.rows):
+            return False
+        self.offset += self.page_size
+        return True
+    
+    def prev(self) -> bool:
+        """Volta uma página; False se já está na primeira"""
+        if self.offset == 0:
+            return False
+        self.offset = max(0, self.offset - self.page_size)
+        return True
+    
+    def set_page_size(self, page_size: int):
+        """Altera o tamanho da página, indo para a que contém a primeira linha visível
+        
+        O cursor é realinhado ao início dessa página (offset múltiplo do
+        tamanho), para que page_number, page_count e next()/prev()
+        continuem consistentes.
+        """
+        self.page_size = max(1, page_size)
+        self.offset -= self.offset % self.page_size
+    
+    def _first_on_or_after(self, when: datetime) -> int:
+        """Busca binária pela primeira posição com data >= when"""
+        lo, hi = 0, len(self.rows)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.rows[mid].get_date_obj() < when:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def seek_date(self, day: datetime):
+        """Posiciona no primeiro lançamento do dia (sequência ordenada por data)
+        
+        Na ordem decrescente, posiciona no último lançamento do dia ou,
+        se não houver, no primeiro anterior a ele.
+        """
+        day = day.replace(hour=0, minute=0, second=0, microsecond=0)
+        if not self.reverse:
+            position = self._first_on_or_after(day)
+        else:
+            after = self._first_on_or_after(day + timedelta(days=1))
+            position = len(self.rows) - after
+        self.seek(position)
\ No newline at end of file
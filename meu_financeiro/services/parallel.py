@@ -0,0 +1,100 @@
+"""
+Execução das agregações em fatias, em paralelo para históricos grandes
+"""
+import os
+from math import inf
+from typing import Callable, List, Optional, Sequence
+from config import PARALLEL_MIN_ROWS, PARALLEL_WORKERS
+
+# concurrent.futures só é importado quando o histórico justifica processos,
+# para não pesar no início dos comandos sobre históricos pequenos
+_executor = None
+_executor_workers = 0
+
+
+def _get_executor(workers: int):
+    """Pool reaproveitado entre chamadas (criar processos é caro)"""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    global _executor, _executor_workers
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        _executor_workers = workers
+    return _executor
+
+
+def map_shards(func: Callable, columns: Sequence, *args,
+               workers: Optional[int] = None,
+               min_rows: Optional[int] = None) -> List:
+    """Aplica func(offset, *fatias_das_colunas, *args) a fatias contíguas
+    
+    Abaixo de min_rows linhas (ou com um só processo) roda func uma vez
+    sobre as colunas inteiras, no próprio processo. Os resultados vêm na
+    ordem das fatias, para que a combinação seja determinística.
+    """
+    total = len(columns[0])
+    workers = workers or PARALLEL_WORKERS or os.cpu_count() or 1
+    min_rows = PARALLEL_MIN_ROWS if min_rows is None else min_rows
+    
+    if total < min_rows or workers < 2:
+        return [func(0, *columns, *args)]
+    
+    size = -(-total // workers)
+    offsets = range(0, total, size)
+    shards = [[column[start:start + size] for start in offsets] for column in columns]
+    extra = [[arg] * len(offsets) for arg in args]
+    
+    from concurrent.futures.process import BrokenProcessPool
+    try:
+        return list(_get_executor(workers).map(func, offsets, *shards, *extra))
+    except (BrokenProcessPool, OSError, NotImplementedError):
+        # Ambientes sem suporte a processos: resultado idêntico em série
+        return [func(0, *columns, *args)]
+
+
+# Funções de fatia (nível de módulo para poderem ser enviadas aos processos)
+
+def report_totals(offset: int, cat_codes, cents, receita) -> tuple:
+    """Uma passada: centavos por categoria, contagem e maior valor por tipo
+    
+    Cada estrutura é indexada pela flag (0 = despesa, 1 = receita); o
+    maior valor vem com a linha global (a primeira, em caso de empate).
+    """
+    totals: tuple = ({}, {})
+    counts = [0, 0]
+    maximum = [-inf, -inf]
+    rows = [None, None]
+    
+    row = offset
+    for code, value, flag in zip(cat_codes, cents, receita):
+        by_cat = totals[flag]
+        by_cat[code] = by_cat.get(code, 0) + value
+        counts[flag] += 1
+        if value > maximum[flag]:
+            maximum[flag] = value
+            rows[flag] = row
+        row += 1
+    
+    return totals, counts, maximum, rows
+
+
+def merge_report_totals(partials: List[tuple]) -> tuple:
+    totals: tuple = ({}, {})
+    counts = [0, 0]
+    maximum = [-inf, -inf]
+    rows = [None, None]
+    
+    for part_totals, part_counts, part_maximum, part_rows in partials:
+        for flag in (0, 1):
+            by_cat = totals[flag]
+            for code, value in part_totals[flag].items():
+                by_cat[code] = by_cat.get(code, 0) + value
+            counts[flag] += part_counts[flag]
+            # Estritamente maior: em empate vale a fatia anterior (primeira linha)
+            if part_maximum[flag] > maximum[flag]:
+                maximum[flag] = part_maximum[flag]
+                rows[flag] = part_rows[flag]
+    
+    return totals, counts, maximum, rows
\ No newline at end of file
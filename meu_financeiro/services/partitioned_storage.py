@@ -0,0 +1,237 @@
+"""
+Armazenamento particionado por mês (um arquivo por AAAA-MM)
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import DATA_FILE, PARTITIONS_DIR, PARTITION_PRELOAD_MONTHS
+from models import Transaction, CategoryManager
+from utils.instrumentation import instrument
+from .storage_service import StorageService
+
+META_FILE = '_meta.json'
+
+
+def month_key(iso_date: str) -> str:
+    """Partição ('AAAA-MM') de uma data ISO"""
+    return iso_date[:7]
+
+
+@instrument('PartitionedStorageService')
+class PartitionedStorageService(StorageService):
+    """Ledger dividido em arquivos mensais dentro de PARTITIONS_DIR
+    
+    _meta.json guarda categorias, maior id e a contagem de cada mês.
+    load() lê apenas os meses recentes; os demais são lidos sob demanda
+    com load_months(). Ao salvar, só os meses alterados são regravados.
+    
+    Com gravação assíncrona (BackgroundWriter) os saves rodam em outra
+    thread enquanto a interface lê partições: _lock protege _meta,
+    _id_months e _hashes em todos os métodos que os usam.
+    """
+    
+    supports_partitions = True
+    
+    def __init__(self, directory: str = PARTITIONS_DIR, json_file: str = DATA_FILE,
+                 preload_months: int = PARTITION_PRELOAD_MONTHS):
+        super().__init__(json_file, journal=False, cache=False)
+        self.directory = directory
+        self.preload_months = preload_months
+        self.meta_file = os.path.join(directory, META_FILE)
+        self._meta: Dict = {'categories': None, 'max_id': 0, 'months': {}}
+        # Hash do conteúdo gravado de cada mês lido, para detectar alterações
+        self._hashes: Dict[str, str] = {}
+        # Mês de cada transação lida (para mover ou remover registros)
+        self._id_months: Dict[int, str] = {}
+        # Reentrante: save() e load() chamam months() e os auxiliares
+        self._lock = threading.RLock()
+    
+    def _partition_file(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+    
+    def _data_files(self) -> List[str]:
+        return [self.meta_file] + [self._partition_file(k) for k in self.months()]
+    
+    def months(self) -> List[str]:
+        """Todas as partições existentes, em ordem cronológica"""
+        with self._lock:
+            return sorted(self._meta['months'])
+    
+    def month_size(self, key: str) -> int:
+        """Quantidade de transações gravadas no mês"""
+        with self._lock:
+            return self._meta['months'].get(key, 0)
+    
+    def max_id(self) -> int:
+        """Maior id já gravado (inclusive em meses ainda não lidos)"""
+        with self._lock:
+            return self._meta['max_id']
+    
+    def _recent_months(self) -> List[str]:
+        """Meses carregados no início: os últimos preload_months até hoje"""
+        now = datetime.now()
+        index = now.year * 12 + now.month - self.preload_months
+        first = f"{index // 12:04d}-{index % 12 + 1:02d}"
+        return [key for key in self.months() if key >= first]
+    
+    def load(self) -> tuple[List[Transaction], CategoryManager]:
+        """Lê o índice de partições e apenas os meses recentes"""
+        with self._lock:
+            try:
+                if not os.path.exists(self.meta_file) and os.path.exists(self.filename):
+                    self.convert_from_json(self.filename)
+                
+                try:
+                    with open(self.meta_file, 'r', encoding='utf-8') as f:
+                        self._meta = json.load(f)
+                except FileNotFoundError:
+                    return [], CategoryManager()
+                
+                categories = (CategoryManager.from_dict(self._meta['categories'])
+                              if self._meta.get('categories') else CategoryManager())
+                return self.load_months(self._recent_months()), categories
+            
+            except Exception as e:
+                print(f"Erro ao carregar dados: {e}")
+                return [], CategoryManager()
+    
+    def _read_partition(self, key: str) -> List[Dict]:
+        try:
+            with open(self._partition_file(key), 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return []
+        self._hashes[key] = hashlib.blake2b(content, digest_size=16).hexdigest()
+        return json.loads(content)['transactions']
+    
+    def load_months(self, keys: Iterable[str]) -> List[Transaction]:
+        """Lê as partições indicadas"""
+        with self._lock:
+            transactions = []
+            for key in keys:
+                for record in self._read_partition(key):
+                    self._id_months[record['id']] = key
+                    transactions.append(Transaction.from_dict(record))
+            return transactions
+    
+    def _write_partition(self, key: str, records: List[Dict]):
+        """Grava (ou remove, se vazio) um mês com troca atômica"""
+        filename = self._partition_file(key)
+        if not records:
+            if os.path.exists(filename):
+                os.remove(filename)
+            self._meta['months'].pop(key, None)
+            self._hashes.pop(key, None)
+            return
+        
+        content = json.dumps({'transactions': records}, ensure_ascii=False).encode('utf-8')
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        self._meta['months'][key] = len(records)
+        if self._hashes.get(key) == digest:
+            return
+        
+        tmp_file = f"{filename}.tmp"
+        self._ensure_dir(tmp_file)
+        with open(tmp_file, 'wb') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, filename)
+        self._hashes[key] = digest
+    
+    def _write_meta(self, categories: CategoryManager):
+        self._meta['categories'] = categories.to_dict()
+        self._meta['last_updated'] = datetime.now().isoformat()
+        
+        tmp_file = f"{self.meta_file}.tmp"
+        self._ensure_dir(tmp_file)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self._meta, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.meta_file)
+    
+    def save(self, transactions: List[Transaction],
+             categories: CategoryManager) -> bool:
+        """Regrava só os meses cujo conteúdo mudou
+        
+        Meses que nunca foram lidos não estão em transactions e ficam
+        intactos; meses lidos que ficaram vazios são removidos.
+        """
+        with self._lock:
+            try:
+                by_month: Dict[str, List[Dict]] = {}
+                for t in sorted(transactions, key=lambda x: x.id):
+                    record = t.to_dict()
+                    key = month_key(record['data'])
+                    by_month.setdefault(key, []).append(record)
+                    self._id_months[t.id] = key
+                    self._meta['max_id'] = max(self._meta['max_id'], t.id)
+                
+                for key in set(self._hashes) - set(by_month):
+                    self._write_partition(key, [])
+                for key, records in by_month.items():
+                    self._write_partition(key, records)
+                
+                self._write_meta(categories)
+                return True
+            
+            except Exception as e:
+                print(f"Erro ao salvar dados: {e}")
+                return False
+    
+    def save_changes(self, changes: List[Tuple[str, Dict]],
+                     transactions: List[Transaction],
+                     categories: CategoryManager) -> bool:
+        """Aplica as alterações apenas às partições afetadas"""
+        with self._lock:
+            try:
+                partitions: Dict[str, Dict[int, Dict]] = {}
+                saved = self._meta.get('categories')
+                latest = CategoryManager.from_dict(saved) if saved else CategoryManager()
+                
+                def partition(key: str) -> Dict[int, Dict]:
+                    if key not in partitions:
+                        partitions[key] = {r['id']: r for r in self._read_partition(key)}
+                    return partitions[key]
+                
+                for op, payload in changes:
+                    if op in ('put', 'delete'):
+                        old_key = self._id_months.pop(payload['id'], None)
+                        if old_key is not None:
+                            partition(old_key).pop(payload['id'], None)
+                    if op == 'put':
+                        key = month_key(payload['data'])
+                        partition(key)[payload['id']] = payload
+                        self._id_months[payload['id']] = key
+                        self._meta['max_id'] = max(self._meta['max_id'], payload['id'])
+                    elif op == 'categories' and categories is None:
+                        latest = CategoryManager.from_dict(payload)
+                
+                for key, records in partitions.items():
+                    self._write_partition(key, sorted(records.values(), key=lambda r: r['id']))
+                
+                self._write_meta(categories if categories is not None else latest)
+                return True
+            
+            except Exception as e:
+                print(f"Erro ao salvar dados: {e}")
+                return False
+    
+    def convert_from_json(self, json_file: str):
+        """Divide um financas.json em partições mensais"""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        by_month: Dict[str, List[Dict]] = {}
+        for record in data.get('transactions', []):
+            by_month.setdefault(month_key(record['data']), []).append(record)
+            self._meta['max_id'] = max(self._meta['max_id'], record['id'])
+        
+        for key, records in by_month.items():
+            self._write_partition(key, records)
+        self._write_meta(CategoryManager.from_dict(data.get('categories', {})))
+        self._hashes.clear()
\ No newline at end of file
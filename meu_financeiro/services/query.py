@@ -0,0 +1,226 @@
+"""
+Consultas combinadas sobre as transações, com planejamento por índice
+"""
+import heapq
+from datetime import datetime
+from itertools import islice
+from math import ceil, floor, log2
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from models import Transaction
+from .text_index import normalize
+
+# Peso de ordenar uma linha em relação a percorrê-la
+SORT_WEIGHT = 1.0
+
+
+class Query:
+    """Condições, ordenação e limite de uma consulta
+    
+    Os métodos devolvem uma nova Query, permitindo compor a consulta
+    aos poucos sem alterar a original:
+        
+        Query(tipo='despesa').where(categoria='Lazer').order_by('valor', True).limit(10)
+    
+    Condições aceitas: start, end (datetime, inclusivos), tipo,
+    categoria, min_val, max_val (em reais, inclusivos) e term (todos
+    os termos contidos na descrição, sem acentos nem caixa). None
+    significa "sem condição".
+    """
+    
+    FIELDS = ('start', 'end', 'tipo', 'categoria', 'min_val', 'max_val', 'term')
+    
+    def __init__(self, **conditions):
+        unknown = set(conditions) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Condição inválida: {', '.join(sorted(unknown))}")
+        self.conditions: Dict = {k: v for k, v in conditions.items() if v is not None}
+        if not normalize(self.conditions.get('term', '')).split():
+            self.conditions.pop('term', None)
+        self.sort_key: Optional[str] = None
+        self.reverse = False
+        self.max_rows: Optional[int] = None
+    
+    def _copy(self, **conditions) -> 'Query':
+        query = Query(**{**self.conditions, **conditions})
+        query.sort_key, query.reverse, query.max_rows = self.sort_key, self.reverse, self.max_rows
+        return query
+    
+    def where(self, **conditions) -> 'Query':
+        """Nova consulta com as condições acrescentadas (ou substituídas)"""
+        return self._copy(**conditions)
+    
+    def order_by(self, key: Optional[str], reverse: bool = False) -> 'Query':
+        """Nova consulta ordenada por key (ver FinanceService.SORT_KEYS)"""
+        query = self._copy()
+        query.sort_key, query.reverse = key, reverse
+        return query
+    
+    def limit(self, max_rows: Optional[int]) -> 'Query':
+        """Nova consulta que devolve no máximo max_rows transações"""
+        query = self._copy()
+        query.max_rows = max_rows
+        return query
+    
+    def __repr__(self):
+        return (f"Query({self.conditions}, order_by={self.sort_key}, "
+                f"reverse={self.reverse}, limit={self.max_rows})")
+
+
+class Plan:
+    """Plano escolhido: índice de origem e predicados aplicados depois"""
+    
+    def __init__(self, source: str, estimate: int, cost: float,
+                 rows: Callable[[], Iterable[Transaction]], presorted: bool,
+                 residual: List[str], predicate: Optional[Callable[[Transaction], bool]],
+                 sort_key: Optional[Callable], reverse: bool, max_rows: Optional[int]):
+        self.source = source
+        self.estimate = estimate
+        self.cost = cost
+        self.rows = rows
+        self.presorted = presorted
+        self.residual = residual
+        self.predicate = predicate
+        self.sort_key = sort_key
+        self.reverse = reverse
+        self.max_rows = max_rows
+    
+    def execute(self) -> Iterator[Transaction]:
+        """Percorre a origem aplicando os predicados sob demanda
+        
+        Sem ordenação (ou com a origem já na ordem pedida) o limite
+        interrompe a leitura assim que é atingido; caso contrário as
+        linhas filtradas são ordenadas, com heap quando há limite.
+        """
+        rows: Iterable[Transaction] = self.rows()
+        if self.predicate is not None:
+            rows = filter(self.predicate, rows)
+        
+        if self.sort_key is None or self.presorted:
+            return islice(rows, self.max_rows)
+        
+        if self.max_rows is not None:
+            select = heapq.nlargest if self.reverse else heapq.nsmallest
+            return iter(select(self.max_rows, rows, key=self.sort_key))
+        return iter(sorted(rows, key=self.sort_key, reverse=self.reverse))
+    
+    def describe(self) -> str:
+        """Resumo legível do plano (para diagnóstico)"""
+        parts = [f"origem={self.source} (~{self.estimate} linhas)"]
+        if self.residual:
+            parts.append(f"filtros={','.join(self.residual)}")
+        if self.sort_key is not None:
+            parts.append('ordem=índice' if self.presorted else 'ordem=ordenação')
+        if self.max_rows is not None:
+            parts.append(f"limite={self.max_rows}")
+        return ' '.join(parts)
+
+
+def _predicates(conditions: Dict, search) -> Dict[str, Callable[[Transaction], bool]]:
+    """Um predicado por condição, com os parâmetros já convertidos"""
+    predicates = {}
+    
+    if 'start' in conditions or 'end' in conditions:
+        start = conditions.get('start', datetime.min)
+        end = conditions.get('end', datetime.max)
+        predicates['periodo'] = lambda t: start <= t.get_date_obj() <= end
+    
+    if 'tipo' in conditions:
+        tipo = conditions['tipo']
+        predicates['tipo'] = lambda t: t.tipo == tipo
+    
+    if 'categoria' in conditions:
+        categoria = conditions['categoria']
+        predicates['categoria'] = lambda t: t.categoria == categoria
+    
+    if 'min_val' in conditions or 'max_val' in conditions:
+        # Limites em centavos inteiros; round(..., 6) descarta o ruído de 0.57 * 100
+        low = (ceil(round(conditions['min_val'] * 100, 6))
+               if 'min_val' in conditions else None)
+        high = (floor(round(conditions['max_val'] * 100, 6))
+                if 'max_val' in conditions else None)
+        if low is None:
+            predicates['valor'] = lambda t: t.cents <= high
+        elif high is None:
+            predicates['valor'] = lambda t: low <= t.cents
+        else:
+            predicates['valor'] = lambda t: low <= t.cents <= high
+    
+    if 'term' in conditions:
+        terms = normalize(conditions['term']).split()
+        predicates['texto'] = lambda t: search.matches(t, terms)
+    
+    return predicates
+
+
+def plan_query(query: Query, repository, dates, search,
+               sort_keys: Dict[str, Callable]) -> Plan:
+    """Escolhe a origem mais barata dentre os índices disponíveis
+    
+    Cada índice informa quantas linhas entregaria para sua condição.
+    Supondo condições independentes, a fração que sobrevive aos demais
+    predicados estima o custo de cada alternativa: linhas lidas (menos,
+    se o limite encerra a leitura cedo) mais a ordenação do resultado
+    quando a origem não está na ordem pedida.
+    """
+    conditions = query.conditions
+    total = len(repository)
+    predicates = _predicates(conditions, search)
+    
+    start = conditions.get('start', datetime.min)
+    end = conditions.get('end', datetime.max)
+    # O índice de datas percorre na ordem pedida quando a ordenação é por data
+    reverse = query.reverse and query.sort_key == 'data'
+    
+    # (nome da condição atendida, linhas estimadas, gerador, já em ordem de data)
+    candidates = [('periodo' if 'periodo' in predicates else None,
+                   dates.count(start, end),
+                   lambda: dates.iter_range(start, end, reverse), True)]
+    if 'categoria' in conditions:
+        categoria = conditions['categoria']
+        candidates.append(('categoria', repository.count_by_category(categoria),
+                           lambda: repository.by_category(categoria), False))
+    if 'tipo' in conditions:
+        tipo = conditions['tipo']
+        candidates.append(('tipo', repository.count_by_tipo(tipo),
+                           lambda: repository.by_tipo(tipo), False))
+    if 'texto' in predicates:
+        term = conditions['term']
+        candidates.append(('texto', search.estimate(term),
+                           lambda: search.search(term), False))
+    
+    selectivity = {name: estimate / total if total else 0.0
+                   for name, estimate, _, _ in candidates if name is not None}
+    
+    best: Optional[Plan] = None
+    for name, estimate, rows, by_date in candidates:
+        survive = 1.0
+        for other, fraction in selectivity.items():
+            if other != name:
+                survive *= fraction
+        output = estimate * survive
+        presorted = by_date and query.sort_key == 'data'
+        
+        if query.max_rows is not None and (query.sort_key is None or presorted):
+            # Leitura encerrada ao atingir o limite
+            cost = min(estimate, query.max_rows / survive if survive else estimate)
+        elif query.sort_key is not None and not presorted:
+            kept = output if query.max_rows is None else min(output, query.max_rows)
+            cost = estimate + SORT_WEIGHT * output * log2(kept + 2)
+        else:
+            cost = estimate
+        
+        if best is None or cost < best.cost:
+            residual = [p for p in predicates if p != name]
+            checks = [predicates[p] for p in residual]
+            if not checks:
+                predicate = None
+            elif len(checks) == 1:
+                predicate = checks[0]
+            else:
+                predicate = lambda t, checks=checks: all(check(t) for check in checks)
+            
+            best = Plan(name or 'completo', estimate, cost, rows, presorted,
+                        residual, predicate,
+                        sort_keys[query.sort_key] if query.sort_key else None,
+                        query.reverse, query.max_rows)
+    return best
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Relatório financeiro calculado em uma única passada
+"""
+from typing import Dict, Iterable, Optional
+from models import Transaction
+
+TIPOS = ('receita', 'despesa')
+
+
+class Report:
+    """Totais, categorias, médias, maiores valores e contagens
+    
+    Os valores ficam em centavos inteiros por tipo; summary(),
+    by_category() e statistics() devolvem os dicionários (em reais)
+    dos métodos equivalentes do FinanceService.
+    """
+    
+    __slots__ = ('totals', 'counts', 'categories', 'maximum', 'maior_despesa_obj')
+    
+    def __init__(self, categories: Dict[str, Dict[str, int]],
+                 counts: Dict[str, int], maximum: Dict[str, Optional[int]],
+                 maior_despesa_obj: Optional[Transaction] = None):
+        # Centavos por categoria de cada tipo, na ordem da primeira ocorrência
+        self.categories = categories
+        self.counts = counts
+        self.maximum = maximum
+        self.maior_despesa_obj = maior_despesa_obj
+        self.totals = {tipo: sum(categories[tipo].values()) for tipo in TIPOS}
+    
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> 'Report':
+        """Percorre as transações uma única vez"""
+        categories: Dict[str, Dict[str, int]] = {'receita': {}, 'despesa': {}}
+        counts = {'receita': 0, 'despesa': 0}
+        maximum: Dict[str, Optional[int]] = {'receita': None, 'despesa': None}
+        maior_despesa_obj = None
+        
+        for t in transactions:
+            tipo = 'receita' if t.tipo == 'receita' else 'despesa'
+            cents = t.cents
+            by_cat = categories[tipo]
+            by_cat[t.categoria] = by_cat.get(t.categoria, 0) + cents
+            counts[tipo] += 1
+            # Estritamente maior: em empate vale a primeira transação
+            if maximum[tipo] is None or cents > maximum[tipo]:
+                maximum[tipo] = cents
+                if tipo == 'despesa':
+                    maior_despesa_obj = t
+        
+        return cls(categories, counts, maximum, maior_despesa_obj)
+    
+    @property
+    def total_transactions(self) -> int:
+        return self.counts['receita'] + self.counts['despesa']
+    
+    def mean(self, tipo: str) -> Optional[float]:
+        """Valor médio do tipo (None se não houver transações)"""
+        if not self.counts[tipo]:
+            return None
+        return self.totals[tipo] / 100 / self.counts[tipo]
+    
+    def summary(self) -> Dict:
+        """Totais de receitas e despesas (ver calculate_summary)"""
+        receitas, despesas = self.totals['receita'], self.totals['despesa']
+        return {
+            'total_receitas': receitas / 100,
+            'total_despesas': despesas / 100,
+            'saldo': (receitas - despesas) / 100,
+            'num_receitas': self.counts['receita'],
+            'num_despesas': self.counts['despesa'],
+            'total_transactions': self.total_transactions
+        }
+    
+    def by_category(self, tipo: str = 'despesa') -> Dict[str, float]:
+        """Total por categoria, do maior para o menor (ver calculate_by_category)"""
+        ordered = sorted(self.categories.get(tipo, {}).items(),
+                         key=lambda x: x[1], reverse=True)
+        return {cat: cents / 100 for cat, cents in ordered}
+    
+    def statistics(self) -> Dict:
+        """Médias e maiores valores por tipo (ver get_statistics)"""
+        stats = {}
+        
+        if self.counts['receita']:
+            stats['media_receitas'] = self.mean('receita')
+            stats['maior_receita'] = self.maximum['receita'] / 100
+        
+        if self.counts['despesa']:
+            stats['media_despesas'] = self.mean('despesa')
+            stats['maior_despesa'] = self.maximum['despesa'] / 100
+            stats['maior_despesa_obj'] = self.maior_despesa_obj
+        
+        return stats
\ No newline at end of file
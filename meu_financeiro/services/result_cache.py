@@ -0,0 +1,78 @@
+"""
+Cache LRU de resultados de consultas, invalidado por versão do ledger
+"""
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from config import RESULT_CACHE_SIZE
+
+
+class ResultCache:
+    """Memoriza resultados por argumentos + versão do ledger
+    
+    É registrado como índice no TransactionRepository: toda inserção,
+    alteração ou remoção (inclusive a leitura de partições) incrementa
+    version, que faz parte de todas as chaves. Resultados de versões
+    anteriores nunca são devolvidos e saem pela política LRU.
+    """
+    
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    # Notificações do repositório
+    
+    def add(self, t):
+        self.version += 1
+    
+    def add_all(self, transactions):
+        self.version += 1
+    
+    def remove(self, t):
+        self.version += 1
+    
+    def get_or_compute(self, key: Tuple[Hashable, ...], compute: Callable,
+                       ref: Optional[object] = None):
+        """Resultado de compute() para key na versão atual
+        
+        ref é o objeto argumento quando a chave usa seu id(): a entrada
+        guarda a referência e só vale se for o mesmo objeto.
+        """
+        if self.maxsize <= 0:
+            return compute()
+        
+        key = (self.version,) + key
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is ref:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        value = compute()
+        self._entries[key] = (ref, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+    
+    def clear(self):
+        """Descarta todas as entradas (os contadores são mantidos)"""
+        self._entries.clear()
+    
+    def stats(self) -> Dict:
+        """Acertos, falhas e ocupação"""
+        total = self.hits + self.misses
+        return {
+            'acertos': self.hits,
+            'falhas': self.misses,
+            'taxa_acerto': self.hits / total if total else 0.0,
+            'entradas': len(self._entries),
+            'capacidade': self.maxsize,
+            'versao': self.version
+        }
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Cache binário do ledger para inicialização rápida
+
+Guarda as transações já convertidas (centavos e datas inteiras) em
+formato marshal. O cache só é usado se o tamanho, o mtime e o hash dos
+arquivos de dados forem os mesmos de quando foi gravado.
+"""
+import marshal
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+from models import Transaction, CategoryManager
+
+# Incrementar ao mudar o formato de to_state() ou do próprio cache
+CACHE_VERSION = 1
+READ_CHUNK = 1 << 20
+
+
+def cache_key(paths: List[str]) -> List:
+    """Tamanho, mtime e hash BLAKE2 de cada arquivo (None se não existir)"""
+    key: List = [CACHE_VERSION, sys.version_info[:2]]
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            key.append(None)
+            continue
+        
+        # hashlib só é importado quando há arquivos a conferir
+        import hashlib
+        try:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(READ_CHUNK), b''):
+                    digest.update(chunk)
+        except FileNotFoundError:
+            key.append(None)
+            continue
+        key.append((st.st_size, st.st_mtime_ns, digest.hexdigest()))
+    return key
+
+
+def read_cache(filename: str, key: List
+               ) -> Optional[Tuple[List[Transaction], CategoryManager, Dict]]:
+    """Retorna (transações, categorias, extra) ou None se inválido"""
+    try:
+        # loads() sobre o arquivo inteiro: load(f) lê em pedaços pequenos
+        with open(filename, 'rb') as f:
+            data = marshal.loads(f.read())
+        if data['key'] != key:
+            return None
+        
+        from_state = Transaction.from_state
+        transactions = [from_state(state) for state in data['rows']]
+        categories = CategoryManager.from_dict(data['categories'])
+        return transactions, categories, data['extra']
+    
+    # Arquivo ausente, truncado ou de outro formato: volta para o JSON
+    except (OSError, EOFError, ValueError, TypeError, KeyError):
+        return None
+
+
+def write_cache(filename: str, key: List, transactions: List[Transaction],
+                categories: CategoryManager, extra: Optional[Dict] = None) -> bool:
+    """Grava o cache com troca atômica do arquivo"""
+    try:
+        data = {
+            'key': key,
+            'rows': [t.to_state() for t in transactions],
+            'categories': categories.to_dict(),
+            'extra': extra or {}
+        }
+        tmp_file = f"{filename}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(marshal.dumps(data))
+        os.replace(tmp_file, filename)
+        return True
+    
+    except (OSError, ValueError) as e:
+        print(f"Erro ao gravar cache: {e}")
+        return False
\ No newline at end of file
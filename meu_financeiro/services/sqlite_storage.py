@@ -0,0 +1,268 @@
+"""
+Armazenamento em banco SQLite
+"""
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from config import DATA_FILE, SQLITE_FILE
+from models import Transaction, CategoryManager
+from utils.instrumentation import instrument
+from .storage_service import StorageService
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    descricao TEXT NOT NULL,
+    centavos INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    criado_em TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_data ON transactions(data);
+CREATE INDEX IF NOT EXISTS idx_transactions_categoria ON transactions(categoria);
+CREATE INDEX IF NOT EXISTS idx_transactions_tipo ON transactions(tipo);
+CREATE INDEX IF NOT EXISTS idx_transactions_centavos ON transactions(centavos);
+
+CREATE TABLE IF NOT EXISTS categories (
+    tipo TEXT NOT NULL,
+    nome TEXT NOT NULL,
+    posicao INTEGER NOT NULL,
+    PRIMARY KEY (tipo, nome)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+COLUMNS = "id, tipo, categoria, descricao, centavos, data, criado_em"
+
+
+@instrument('SQLiteStorageService')
+class SQLiteStorageService(StorageService):
+    """Persistência em SQLite com consultas executadas no banco"""
+    
+    supports_queries = True
+    
+    def __init__(self, db_file: str = SQLITE_FILE, json_file: str = DATA_FILE):
+        super().__init__(json_file, journal=False)
+        self.db_file = db_file
+        self._ensure_dir(db_file)
+        self.conn = sqlite3.connect(db_file)
+        self._upgrade_schema()
+        self.conn.executescript(SCHEMA)
+    
+    def _upgrade_schema(self):
+        """Converte bancos antigos (valor REAL) para centavos inteiros"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(transactions)")}
+        if 'valor' not in columns:
+            return
+        
+        # Um único script entre BEGIN e COMMIT: a conversão é atômica
+        self.conn.executescript(
+            "BEGIN;"
+            "ALTER TABLE transactions RENAME TO transactions_real;"
+            "DROP INDEX IF EXISTS idx_transactions_data;"
+            "DROP INDEX IF EXISTS idx_transactions_categoria;"
+            "DROP INDEX IF EXISTS idx_transactions_tipo;"
+            "DROP INDEX IF EXISTS idx_transactions_valor;"
+            + SCHEMA +
+            f"INSERT INTO transactions ({COLUMNS}) "
+            "SELECT id, tipo, categoria, descricao, CAST(ROUND(valor * 100) AS INTEGER), "
+            "data, criado_em FROM transactions_real;"
+            "DROP TABLE transactions_real;"
+            "COMMIT;"
+        )
+    
+    def _data_files(self) -> List[str]:
+        return [self.db_file]
+    
+    def _row_to_transaction(self, row: tuple) -> Transaction:
+        """Converte linha do banco em transação"""
+        trans_id, tipo, categoria, descricao, cents, data, criado_em = row
+        t = Transaction(trans_id, tipo, categoria, descricao, 0, data, criado_em)
+        t.cents = cents
+        return t
+    
+    def load(self) -> tuple[List[Transaction], CategoryManager]:
+        """Carrega dados do banco (migrando do JSON na primeira vez)"""
+        try:
+            if not self._is_migrated():
+                if os.path.exists(self.filename):
+                    self.migrate_from_json(self.filename)
+                else:
+                    # Banco novo: um JSON que apareça depois não substitui os dados
+                    with self.conn:
+                        self._mark_migrated('')
+            
+            rows = self.conn.execute(
+                f"SELECT {COLUMNS} FROM transactions ORDER BY id"
+            )
+            transactions = [self._row_to_transaction(r) for r in rows]
+            
+            categories = {}
+            for tipo, nome in self.conn.execute(
+                "SELECT tipo, nome FROM categories ORDER BY tipo, posicao"
+            ):
+                categories.setdefault(tipo, []).append(nome)
+            
+            if not categories:
+                return transactions, CategoryManager()
+            
+            return transactions, CategoryManager.from_dict(categories)
+        
+        except Exception as e:
+            print(f"Erro ao carregar dados: {e}")
+            return [], CategoryManager()
+    
+    def _is_migrated(self) -> bool:
+        """Verifica se a migração do JSON já foi feita"""
+        row = self.conn.execute(
+            "SELECT valor FROM meta WHERE chave = 'migrated_from'"
+        ).fetchone()
+        return row is not None
+    
+    def migrate_from_json(self, json_file: str) -> int:
+        """Importa financas.json para o banco (uma única vez)"""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        transactions = [
+            Transaction.from_dict(t)
+            for t in data.get('transactions', [])
+        ]
+        categories = CategoryManager.from_dict(data.get('categories', {}))
+        
+        with self.conn:
+            self._write_all(transactions, categories)
+            self._mark_migrated(json_file)
+        
+        return len(transactions)
+    
+    def _mark_migrated(self, json_file: str):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)",
+            ('migrated_from', json_file)
+        )
+    
+    def _write_all(self, transactions: List[Transaction],
+                   categories: CategoryManager):
+        """Substitui todo o conteúdo do banco"""
+        self.conn.execute("DELETE FROM transactions")
+        self.conn.executemany(
+            f"INSERT INTO transactions ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self._transaction_params(t.to_dict()) for t in transactions)
+        )
+        self._write_categories(categories.to_dict())
+    
+    def _write_categories(self, categories: Dict[str, List[str]]):
+        """Substitui a tabela de categorias"""
+        self.conn.execute("DELETE FROM categories")
+        self.conn.executemany(
+            "INSERT INTO categories (tipo, nome, posicao) VALUES (?, ?, ?)",
+            ((tipo, nome, pos)
+             for tipo, nomes in categories.items()
+             for pos, nome in enumerate(nomes))
+        )
+    
+    def _transaction_params(self, data: Dict) -> tuple:
+        """Parâmetros de INSERT a partir do dicionário da transação"""
+        return (data['id'], data['tipo'], data['categoria'], data['descricao'],
+                round(data['valor'] * 100), data['data'], data.get('criado_em'))
+    
+    def save(self, transactions: List[Transaction],
+             categories: CategoryManager) -> bool:
+        """Salva todos os dados no banco"""
+        try:
+            with self.conn:
+                self._write_all(transactions, categories)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO meta (chave, valor) VALUES (?, ?)",
+                    ('last_updated', datetime.now().isoformat())
+                )
+            return True
+        
+        except Exception as e:
+            print(f"Erro ao salvar dados: {e}")
+            return False
+    
+    def save_change(self, op: str, payload: Dict,
+                    transactions: List[Transaction],
+                    categories: CategoryManager) -> bool:
+        """Persiste uma única alteração no banco"""
+        return self.save_changes([(op, payload)], transactions, categories)
+    
+    def needs_state(self) -> bool:
+        """Cada alteração vira um comando no banco: o estado completo não é usado"""
+        return False
+    
+    def save_changes(self, changes: List[Tuple[str, Dict]],
+                     transactions: Optional[List[Transaction]],
+                     categories: Optional[CategoryManager]) -> bool:
+        """Persiste várias alterações em uma única transação do banco"""
+        try:
+            with self.conn:
+                for op, payload in changes:
+                    if op == 'put':
+                        self.conn.execute(
+                            f"INSERT OR REPLACE INTO transactions ({COLUMNS}) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            self._transaction_params(payload)
+                        )
+                    elif op == 'delete':
+                        self.conn.execute(
+                            "DELETE FROM transactions WHERE id = ?", (payload['id'],)
+                        )
+                    elif op == 'categories':
+                        self._write_categories(payload)
+            return True
+        
+        except Exception as e:
+            print(f"Erro ao salvar dados: {e}")
+            return False
+    
+    # Consultas usadas pelo FinanceService
+    
+    def filter_by_period(self, start: datetime, end: datetime) -> List[Transaction]:
+        """Filtra transações por período usando o índice de data"""
+        # Datas ISO comparam em ordem cronológica como texto
+        rows = self.conn.execute(
+            f"SELECT {COLUMNS} FROM transactions "
+            "WHERE data BETWEEN ? AND ? ORDER BY id",
+            (start.isoformat(), end.isoformat())
+        )
+        return [self._row_to_transaction(r) for r in rows]
+    
+    def calculate_by_category(self, tipo: str = 'despesa') -> Dict[str, float]:
+        """Total por categoria agregado no banco"""
+        rows = self.conn.execute(
+            "SELECT categoria, SUM(centavos) AS total FROM transactions "
+            "WHERE tipo = ? GROUP BY categoria ORDER BY total DESC",
+            (tipo,)
+        )
+        return {categoria: total / 100 for categoria, total in rows}
+    
+    def get_monthly_data(self, num_months: int = 12) -> List[Dict]:
+        """Receitas e despesas por mês agregadas no banco"""
+        rows = self.conn.execute(
+            "SELECT substr(data, 1, 7) AS mes, "
+            "SUM(CASE WHEN tipo = 'receita' THEN centavos ELSE 0 END), "
+            "SUM(CASE WHEN tipo = 'receita' THEN 0 ELSE centavos END) "
+            "FROM transactions GROUP BY mes ORDER BY mes DESC LIMIT ?",
+            (num_months,)
+        ).fetchall()
+        
+        return [
+            {
+                'key': mes,
+                'name': datetime.strptime(mes, '%Y-%m').strftime('%b/%Y'),
+                'receitas': receitas / 100,
+                'despesas': despesas / 100
+            }
+            for mes, receitas, despesas in reversed(rows)
+        ]
\ No newline at end of file
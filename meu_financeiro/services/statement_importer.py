@@ -0,0 +1,262 @@
+"""
+Importação em lote de extratos bancários (CSV e OFX)
+"""
+import codecs
+import csv
+import os
+import re
+import time
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from utils.validators import validate_date, validate_value, validate_non_empty
+from .text_index import normalize
+
+# Nomes de coluna aceitos nos CSV de bancos (já normalizados)
+CSV_COLUMNS = {
+    'data': ('data', 'date', 'data lancamento', 'dt'),
+    'descricao': ('descricao', 'historico', 'lancamento', 'description', 'memo'),
+    'valor': ('valor', 'value', 'amount', 'quantia')
+}
+
+# Menor fração aceita nos valores importados
+CENT = Decimal('0.01')
+
+# Abertura ou fechamento de tag e o texto até a próxima tag
+OFX_TAG = re.compile(r'<(/?)(\w+)>([^<\r\n]*)')
+
+# Cabeçalho SGML do OFX 1.x (CHAVE:VALOR por linha) e declaração XML do 2.x
+OFX_HEADER = re.compile(r'^\s*(ENCODING|CHARSET)\s*:\s*(\S+)', re.MULTILINE | re.IGNORECASE)
+OFX_XML_ENCODING = re.compile(r'<\?xml[^>]*encoding=["\']([\w.-]+)["\']', re.IGNORECASE)
+OFX_CHARSETS = {'1252': 'cp1252', 'ISO-8859-1': 'latin-1', '8859-1': 'latin-1',
+                'UTF-8': 'utf-8', 'UTF8': 'utf-8'}
+
+
+def _parse_amount(text: str) -> Optional[Decimal]:
+    """Converte '-1.234,56', '-1,234.56', '-1234.56' ou '1.234' em Decimal
+    
+    Com vírgula e ponto, o último é o decimal e o outro é de milhar. Um
+    único tipo de separador é de milhar quando se repete ('1.234.567') ou
+    quando aparece uma vez seguido de exatamente três dígitos ('1.234',
+    '1,234'); caso contrário é o decimal. Valores com frações de centavo
+    são rejeitados (None), nunca arredondados.
+    """
+    text = text.strip().replace('R$', '').replace(' ', '')
+    if ',' in text and '.' in text:
+        decimal, thousands = (',', '.') if text.rfind(',') > text.rfind('.') else ('.', ',')
+        text = text.replace(thousands, '').replace(decimal, '.')
+    else:
+        separator = ',' if ',' in text else '.'
+        head, _, tail = text.rpartition(separator)
+        # '0.001' não é agrupamento de milhar: a parte inteira não começa com zero
+        grouped = head.lstrip('+-')[:1] not in ('', '0') and len(tail) == 3 and tail.isdigit()
+        if text.count(separator) > 1 or grouped:
+            text = text.replace(separator, '')
+        else:
+            text = text.replace(separator, '.')
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        return None
+    if not amount.is_finite() or amount != amount.quantize(CENT):
+        return None
+    return amount.quantize(CENT)
+
+
+def parse_csv_statement(filename: str) -> Iterator[Dict]:
+    """Lê um extrato CSV linha a linha (data, descrição, valor)"""
+    with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+        sample = f.read(4096)
+        f.seek(0)
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=';,\t').delimiter
+        except csv.Error:
+            delimiter = ';'
+        
+        reader = csv.reader(f, delimiter=delimiter)
+        header = [normalize(h.strip()) for h in next(reader, [])]
+        
+        positions = {}
+        for field, names in CSV_COLUMNS.items():
+            for i, name in enumerate(header):
+                if name in names:
+                    positions[field] = i
+                    break
+        if len(positions) != len(CSV_COLUMNS):
+            raise ValueError("Cabeçalho do CSV sem colunas de data, descrição e valor")
+        
+        for row in reader:
+            if not row:
+                continue
+            try:
+                yield {field: row[i] for field, i in positions.items()}
+            except IndexError:
+                yield {'data': '', 'descricao': '', 'valor': ''}
+
+
+def _ofx_record(current: Dict[str, str]) -> Dict:
+    posted = current.get('DTPOSTED', '')
+    return {
+        # DTPOSTED: AAAAMMDD[HHMMSS...]
+        'data': f"{posted[6:8]}/{posted[4:6]}/{posted[0:4]}",
+        'descricao': current.get('MEMO') or current.get('NAME', ''),
+        'valor': current.get('TRNAMT', '')
+    }
+
+
+def _ofx_encoding(filename: str) -> str:
+    """Codificação do OFX pelo cabeçalho (ENCODING/CHARSET ou <?xml encoding>)
+    
+    Sem declaração reconhecida, o arquivo é conferido como UTF-8 em blocos
+    e, se não for válido, lido como latin-1.
+    """
+    with open(filename, 'rb') as f:
+        header = f.read(4096).split(b'<OFX>', 1)[0].decode('ascii', 'replace')
+    
+    fields = {key.upper(): value.upper() for key, value in OFX_HEADER.findall(header)}
+    encoding = fields.get('ENCODING', '').replace('-', '')
+    charset = fields.get('CHARSET', '')
+    declared = OFX_XML_ENCODING.search(header)
+    if declared:
+        try:
+            return codecs.lookup(declared.group(1)).name
+        except LookupError:
+            pass
+    elif encoding == 'UTF8':
+        return 'utf-8'
+    if charset in OFX_CHARSETS:
+        return OFX_CHARSETS[charset]
+    
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return 'latin-1'
+    return 'utf-8'
+
+
+def parse_ofx_statement(filename: str) -> Iterator[Dict]:
+    """Lê os lançamentos <STMTTRN> de um arquivo OFX linha a linha
+    
+    Cada lançamento termina em </STMTTRN>, na abertura do próximo ou no
+    fim da lista (SGML sem fechamento), mesmo que vários estejam na
+    mesma linha.
+    """
+    with open(filename, 'r', encoding=_ofx_encoding(filename), errors='replace') as f:
+        current = None
+        for line in f:
+            for closing, tag, value in OFX_TAG.findall(line):
+                tag = tag.upper()
+                if tag == 'STMTTRN' or (closing and tag == 'BANKTRANLIST'):
+                    if current is not None:
+                        yield _ofx_record(current)
+                    current = {} if tag == 'STMTTRN' and not closing else None
+                elif (current is not None and not closing
+                      and tag in ('DTPOSTED', 'TRNAMT', 'MEMO', 'NAME')):
+                    current[tag] = value.strip()
+        if current is not None:
+            yield _ofx_record(current)
+
+
+class StatementImporter:
+    """Importa extratos em lotes com uma única gravação no final"""
+    
+    def __init__(self, finance_service, storage_service,
+                 batch_size: int = 5000):
+        self.finance = finance_service
+        self.storage = storage_service
+        self.batch_size = batch_size
+    
+    def _default_category(self, tipo: str) -> str:
+        """Categoria usada para lançamentos importados"""
+        categories = self.finance.categories.get_categories(tipo)
+        preferred = 'Outros Ganhos' if tipo == 'receita' else 'Outros Gastos'
+        if preferred in categories or not categories:
+            return preferred
+        return categories[-1]
+    
+    def _validate_batch(self, batch: List[Dict], categories: Dict[str, str],
+                        dates: Dict[str, Optional[str]]) -> List[Dict]:
+        """Aplica as regras de utils.validators a um lote de linhas
+        
+        dates guarda a data ISO já validada de cada texto de data, já que
+        um extrato repete poucas datas distintas em muitas linhas.
+        """
+        valid = []
+        for raw in batch:
+            date_str = raw['data'].strip()
+            if date_str not in dates:
+                dates[date_str] = (
+                    datetime.strptime(date_str, '%d/%m/%Y').isoformat()
+                    if validate_date(date_str) else None
+                )
+            data = dates[date_str]
+            amount = _parse_amount(raw['valor'])
+            descricao = raw['descricao'].strip()
+            
+            if data is None or amount is None or not validate_non_empty(descricao):
+                continue
+            ok, valor = validate_value(str(abs(amount)))
+            if not ok:
+                continue
+            
+            tipo = 'receita' if amount > 0 else 'despesa'
+            valid.append({
+                'tipo': tipo,
+                'categoria': categories[tipo],
+                'descricao': descricao,
+                'valor': valor,
+                'data': data
+            })
+        return valid
+    
+    def import_file(self, filename: str,
+                    progress: Optional[Callable[[int], None]] = None) -> Dict:
+        """Importa um extrato .csv ou .ofx e retorna as estatísticas"""
+        ext = os.path.splitext(filename)[1].lower()
+        parser = parse_ofx_statement if ext in ('.ofx', '.qfx') else parse_csv_statement
+        categories = {tipo: self._default_category(tipo) for tipo in ('receita', 'despesa')}
+        
+        started = time.perf_counter()
+        lidas = importadas = 0
+        batch: List[Dict] = []
+        dates: Dict[str, Optional[str]] = {}
+        changes: List[Tuple[str, Dict]] = []
+        
+        def flush():
+            nonlocal importadas
+            rows = self._validate_batch(batch, categories, dates)
+            added = self.finance.add_transactions(rows)
+            changes.extend(('put', t.to_dict()) for t in added)
+            importadas += len(rows)
+            batch.clear()
+            if progress is not None:
+                progress(lidas)
+        
+        for raw in parser(filename):
+            batch.append(raw)
+            lidas += 1
+            if len(batch) >= self.batch_size:
+                flush()
+        flush()
+        
+        # Só os lançamentos novos: backends com journal ou partições não
+        # precisam carregar nem regravar o ledger inteiro
+        salvo = not changes or self.storage.save_changes(
+            changes,
+            self.finance.transactions if self.storage.needs_state() else None,
+            self.finance.categories
+        )
+        elapsed = time.perf_counter() - started
+        
+        return {
+            'lidas': lidas,
+            'importadas': importadas,
+            'rejeitadas': lidas - importadas,
+            'salvo': salvo,
+            'segundos': elapsed,
+            'linhas_por_segundo': lidas / elapsed if elapsed > 0 else 0.0
+        }
\ No newline at end of file
@@ -2,40 +2,136 @@
 Serviço de armazenamento de dados
 """
 import json
-from typing import Dict, List, Optional
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
-from config import DATA_FILE
+from config import DATA_FILE, JOURNAL_MODE, JOURNAL_COMPACT_EVERY, SNAPSHOT_CACHE
 from models import Transaction, CategoryManager
+from utils.instrumentation import instrument
+from .snapshot_cache import cache_key, read_cache, write_cache
 
+# Tamanho máximo do cabeçalho (primeira linha) dos arquivos auxiliares
+SIDECAR_HEADER_MAX = 4096
 
+
+@instrument('StorageService')
 class StorageService:
     """Gerencia persistência de dados"""
     
-    def __init__(self, filename: str = DATA_FILE):
+    # Backends que executam filtros/agregações por conta própria
+    supports_queries = False
+    # Backends que leem o histórico por mês sob demanda (load_months)
+    supports_partitions = False
+    
+    def __init__(self, filename: str = DATA_FILE, journal: bool = JOURNAL_MODE,
+                 compact_every: int = JOURNAL_COMPACT_EVERY,
+                 cache: bool = SNAPSHOT_CACHE):
         self.filename = filename
+        self.journal = journal
+        self.journal_file = f"{filename}.journal"
+        self.compact_every = compact_every
+        self.cache = cache
+        self.cache_file = f"{os.path.splitext(filename)[0]}.cache"
+        self._pending = 0
     
     def load(self) -> tuple[List[Transaction], CategoryManager]:
-        """Carrega dados do arquivo"""
+        """Carrega dados do arquivo
+        
+        Com cache habilitado, usa o cache binário se os arquivos de dados
+        não mudaram desde que ele foi gravado; caso contrário lê o JSON
+        (e o journal) e regrava o cache.
+        """
+        if not self.cache:
+            return self._load_json()
+        
+        cached = read_cache(self.cache_file, cache_key(self._data_files()))
+        if cached is not None:
+            transactions, categories, extra = cached
+            self._pending = extra.get('pending', 0)
+            return transactions, categories
+        
+        transactions, categories = self._load_json()
+        if transactions:
+            # Chave calculada depois do load: o replay pode truncar o journal
+            write_cache(self.cache_file, cache_key(self._data_files()),
+                        transactions, categories, {'pending': self._pending})
+        return transactions, categories
+    
+    def _load_json(self) -> tuple[List[Transaction], CategoryManager]:
+        """Lê o snapshot JSON e reaplica o journal"""
+        try:
+            return self._read_json()
+        
+        except Exception as e:
+            print(f"Erro ao carregar dados: {e}")
+            return [], CategoryManager()
+    
+    def _read_json(self) -> tuple[List[Transaction], CategoryManager]:
+        """Como _load_json(), mas propaga erros de leitura"""
         try:
             with open(self.filename, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                
+            
             transactions = [
-                Transaction.from_dict(t) 
+                Transaction.from_dict(t)
                 for t in data.get('transactions', [])
             ]
             
             categories = CategoryManager.from_dict(
                 data.get('categories', {})
             )
-            
-            return transactions, categories
-            
         except FileNotFoundError:
-            return [], CategoryManager()
-        except Exception as e:
-            print(f"Erro ao carregar dados: {e}")
-            return [], CategoryManager()
+            transactions, categories = [], CategoryManager()
+        
+        return self._replay_journal(transactions, categories)
+    
+    def _replay_journal(self, transactions: List[Transaction],
+                        categories: CategoryManager
+                        ) -> tuple[List[Transaction], CategoryManager]:
+        """Reaplica o journal sobre o snapshot carregado"""
+        if not os.path.exists(self.journal_file):
+            return transactions, categories
+        
+        by_id = {t.id: t for t in transactions}
+        valid_offset = 0
+        replayed = 0
+        
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                # Linha sem '\n' ou ilegível = escrita interrompida no meio
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('registro incompleto')
+                    record = json.loads(line)
+                    op, payload = record['op'], record['data']
+                except (ValueError, KeyError, TypeError):
+                    break
+                
+                # Registros são idempotentes: reaplicar sobre um snapshot
+                # que já os contém produz o mesmo estado
+                if op == 'put':
+                    by_id[payload['id']] = Transaction.from_dict(payload)
+                elif op == 'delete':
+                    by_id.pop(payload['id'], None)
+                elif op == 'categories':
+                    categories = CategoryManager.from_dict(payload)
+                
+                valid_offset += len(line)
+                replayed += 1
+        
+        # Descarta a cauda corrompida para que novos registros não
+        # sejam concatenados a uma linha parcial
+        if valid_offset < os.path.getsize(self.journal_file):
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(valid_offset)
+        
+        self._pending = replayed
+        return list(by_id.values()), categories
+    
+    @staticmethod
+    def _ensure_dir(filename: str):
+        """Cria o diretório do arquivo antes da primeira gravação"""
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
     
     def save(self, transactions: List[Transaction], 
              categories: CategoryManager) -> bool:
@@ -47,32 +143,165 @@ class StorageService:
                 'last_updated': datetime.now().isoformat()
             }
             
-            with open(self.filename, 'w', encoding='utf-8') as f:
+            # Grava em arquivo temporário e troca atomicamente, para que
+            # uma falha no meio da escrita não corrompa o arquivo atual
+            tmp_file = f"{self.filename}.tmp"
+            self._ensure_dir(tmp_file)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.filename)
+            
+            # O snapshot já contém tudo que estava no journal
+            if os.path.exists(self.journal_file):
+                open(self.journal_file, 'w').close()
+            self._pending = 0
             
             return True
+        
+        except Exception as e:
+            print(f"Erro ao salvar dados: {e}")
+            return False
+    
+    def save_change(self, op: str, payload: Dict,
+                    transactions: List[Transaction],
+                    categories: CategoryManager) -> bool:
+        """Persiste uma alteração ('put', 'delete' ou 'categories')
+        
+        No modo journal apenas o registro da alteração é anexado ao log;
+        caso contrário o arquivo inteiro é regravado.
+        """
+        return self.save_changes([(op, payload)], transactions, categories)
+    
+    def needs_state(self) -> bool:
+        """Indica se save_changes() precisa do estado completo
+        
+        Sem journal cada alteração regrava o arquivo inteiro; no modo
+        journal bastam os registros (transactions e categories podem ser
+        None, e a compactação relê o snapshot e o journal do disco).
+        """
+        return not self.journal
+    
+    def save_changes(self, changes: List[Tuple[str, Dict]],
+                     transactions: Optional[List[Transaction]],
+                     categories: Optional[CategoryManager]) -> bool:
+        """Persiste várias alterações com uma única escrita (e um fsync)"""
+        if not self.journal:
+            return self.save(transactions, categories)
+        
+        try:
+            lines = ''.join(
+                json.dumps({'op': op, 'data': payload}, ensure_ascii=False) + '\n'
+                for op, payload in changes
+            )
+            
+            self._ensure_dir(self.journal_file)
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            
+            self._pending += len(changes)
+            if self._pending >= self.compact_every:
+                return self._compact(transactions, categories)
             
+            return True
+        
         except Exception as e:
             print(f"Erro ao salvar dados: {e}")
             return False
     
-    def export_to_csv(self, transactions: List[Transaction], 
-                      filename: str) -> bool:
-        """Exporta transações para CSV"""
+    def _compact(self, transactions: Optional[List[Transaction]],
+                 categories: Optional[CategoryManager]) -> bool:
+        """Regrava o snapshot com tudo que está no journal"""
+        if transactions is None:
+            try:
+                transactions, categories = self._read_json()
+            except Exception as e:
+                # Os registros já estão no journal: a compactação fica para depois
+                print(f"Erro ao compactar journal: {e}")
+                return True
+        return self.save(transactions, categories)
+    
+    def flush(self) -> bool:
+        """Aguarda gravações pendentes (gravação aqui é sempre síncrona)"""
+        return True
+    
+    def _data_files(self) -> List[str]:
+        """Arquivos cujo conteúdo define a versão dos dados"""
+        return [self.filename, self.journal_file]
+    
+    def fingerprint(self) -> List:
+        """Identifica a versão gravada dos dados (tamanho e mtime)"""
+        result = []
+        for path in self._data_files():
+            try:
+                st = os.stat(path)
+                result.append([st.st_size, st.st_mtime_ns])
+            except FileNotFoundError:
+                result.append(None)
+        return result
+    
+    def _sidecar_file(self, name: str) -> str:
+        return f"{os.path.splitext(self.filename)[0]}.{name}.json"
+    
+    def load_sidecar(self, name: str) -> Optional[Dict]:
+        """Carrega dados auxiliares (ex.: índices) se ainda forem válidos
+        
+        A primeira linha do arquivo é um cabeçalho pequeno com a impressão
+        digital do ledger: dados obsoletos são descartados sem ler o resto.
+        """
         try:
-            with open(filename, 'w', encoding='utf-8-sig') as f:
-                f.write("ID;Data;Tipo;Categoria;Descrição;Valor\n")
+            with open(self._sidecar_file(name), 'r', encoding='utf-8') as f:
+                header = f.readline(SIDECAR_HEADER_MAX)
+                # Sem '\n' no limite: formato antigo (um único objeto) ou corrompido
+                if not header.endswith('\n'):
+                    return None
+                header = json.loads(header)
                 
-                for t in sorted(transactions, key=lambda x: x.data):
-                    from utils import format_date, format_currency
-                    data_fmt = format_date(t.data)
-                    valor_fmt = format_currency(t.valor, show_symbol=False)
-                    
-                    f.write(f"{t.id};{data_fmt};{t.tipo};{t.categoria};"
-                           f"{t.descricao};{valor_fmt}\n")
-            
+                # Dados gravados antes da última alteração do ledger estão obsoletos
+                if (not isinstance(header, dict)
+                        or header.get('fingerprint') != self.fingerprint()):
+                    return None
+                
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def save_sidecar(self, name: str, payload: Dict) -> bool:
+        """Salva dados auxiliares associados à versão atual do ledger"""
+        try:
+            filename = self._sidecar_file(name)
+            tmp_file = f"{filename}.tmp"
+            self._ensure_dir(tmp_file)
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'fingerprint': self.fingerprint()}) + '\n')
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_file, filename)
             return True
+        
+        except Exception as e:
+            print(f"Erro ao salvar índice: {e}")
+            return False
+    
+    def export_to_csv(self, transactions: Iterable[Transaction], 
+                      filename: str, presorted: bool = False,
+                      progress: Optional[Callable[[int], None]] = None) -> bool:
+        """Exporta transações para CSV
+        
+        Com presorted=True as transações (ex.: vindas do índice de datas)
+        são gravadas em streaming, sem ordenar nem materializar a lista.
+        """
+        from .csv_exporter import export_transactions
+        
+        try:
+            if not presorted:
+                transactions = sorted(transactions, key=lambda x: x.get_date_obj())
             
+            export_transactions(transactions, filename, progress=progress)
+            return True
+        
         except Exception as e:
             print(f"Erro ao exportar: {e}")
             return False
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""
+Estatísticas incrementais e combináveis (média, desvio, extremos e quantis)
+"""
+from datetime import datetime, timedelta
+from math import ceil, log, sqrt
+from typing import Dict, Iterable, Optional, Tuple
+from models import Transaction
+
+
+class QuantileSketch:
+    """Sketch de quantis com erro relativo limitado (no estilo DDSketch)
+    
+    Cada valor positivo conta no balde ceil(log_gamma(valor)); o quantil
+    devolvido difere do exato em no máximo relative_accuracy (relativo).
+    Sketches com a mesma precisão são combinados somando os baldes. Se
+    passar de max_buckets baldes, os menores são fundidos: só os quantis
+    mais baixos perdem precisão e a memória continua limitada.
+    """
+    
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+    
+    def add(self, value: float, count: int = 1):
+        """Conta value (valores <= 0 vão para um balde próprio)"""
+        self.count += count
+        if value <= 0:
+            self.zero_count += count
+            return
+        
+        key = ceil(log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+    
+    def _collapse(self):
+        """Funde os menores baldes até voltar a max_buckets"""
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        moved = sum(self.buckets.pop(key) for key in keys[:excess])
+        self.buckets[keys[excess]] += moved
+    
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Soma os baldes de other a este sketch"""
+        if other.gamma != self.gamma:
+            raise ValueError("Sketches com precisões diferentes não podem ser combinados")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        return self
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Valor aproximado do quantil q (0 a 1); None se vazio"""
+        if not self.count:
+            return None
+        
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # Ponto do balde (gamma^(k-1), gamma^k] com o menor erro relativo
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class RunningStats:
+    """Contagem, média e variância (Welford), extremos e quantis
+    
+    Memória constante por grupo: nenhum valor é guardado. merge()
+    combina resultados parciais (ex.: de meses diferentes) com a
+    fórmula de Chan para média e variância.
+    """
+    
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max', 'sketch')
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sketch = QuantileSketch()
+    
+    def add(self, value: float):
+        """Acrescenta um valor"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.add(value)
+    
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """Incorpora os valores resumidos em other"""
+        if not other.count:
+            return self
+        
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        if self.min is None or other.min < self.min:
+            self.min = other.min
+        if self.max is None or other.max > self.max:
+            self.max = other.max
+        self.sketch.merge(other.sketch)
+        return self
+    
+    @property
+    def variance(self) -> Optional[float]:
+        """Variância amostral (None com menos de dois valores)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else None
+    
+    @property
+    def stdev(self) -> Optional[float]:
+        variance = self.variance
+        return None if variance is None else sqrt(max(variance, 0.0))
+    
+    def quantile(self, q: float) -> Optional[float]:
+        return self.sketch.quantile(q)
+    
+    def describe(self, scale: float = 1.0) -> Dict:
+        """Resumo com os valores divididos por scale (ex.: 100 para centavos)"""
+        if not self.count:
+            return {'quantidade': 0}
+        
+        def scaled(value):
+            return None if value is None else value / scale
+        
+        return {
+            'quantidade': self.count,
+            'media': self.mean / scale,
+            'desvio': scaled(self.stdev),
+            'menor': self.min / scale,
+            'maior': self.max / scale,
+            'mediana': scaled(self.quantile(0.5)),
+            'p90': scaled(self.quantile(0.9)),
+            'p99': scaled(self.quantile(0.99))
+        }
+
+
+class GroupStats:
+    """RunningStats (em centavos) por tipo e por categoria de cada tipo"""
+    
+    def __init__(self):
+        self.by_tipo: Dict[str, RunningStats] = {}
+        self.by_category: Dict[Tuple[str, str], RunningStats] = {}
+    
+    def __len__(self) -> int:
+        return sum(stats.count for stats in self.by_tipo.values())
+    
+    @staticmethod
+    def _group(groups: Dict, key) -> RunningStats:
+        stats = groups.get(key)
+        if stats is None:
+            stats = groups[key] = RunningStats()
+        return stats
+    
+    def add(self, t: Transaction):
+        """Acrescenta a transação ao seu tipo e à sua categoria"""
+        tipo = 'receita' if t.tipo == 'receita' else 'despesa'
+        self._group(self.by_tipo, tipo).add(t.cents)
+        self._group(self.by_category, (tipo, t.categoria)).add(t.cents)
+    
+    def add_all(self, transactions: Iterable[Transaction]):
+        for t in transactions:
+            self.add(t)
+    
+    def merge(self, other: 'GroupStats') -> 'GroupStats':
+        """Incorpora outro resultado parcial (other não é alterado)"""
+        for mine, theirs in ((self.by_tipo, other.by_tipo),
+                             (self.by_category, other.by_category)):
+            for key, stats in theirs.items():
+                self._group(mine, key).merge(stats)
+        return self
+    
+    def tipo(self, tipo: str) -> RunningStats:
+        """Estatísticas do tipo (vazias se não houver transações)"""
+        return self.by_tipo.get(tipo) or RunningStats()
+    
+    def describe(self) -> Dict:
+        """Resumo em reais: {'por_tipo': {...}, 'por_categoria': {tipo: {...}}}"""
+        por_categoria: Dict[str, Dict] = {}
+        for (tipo, categoria), stats in sorted(self.by_category.items()):
+            por_categoria.setdefault(tipo, {})[categoria] = stats.describe(100)
+        return {
+            'por_tipo': {tipo: stats.describe(100)
+                         for tipo, stats in sorted(self.by_tipo.items())},
+            'por_categoria': por_categoria
+        }
+
+
+def _month_bounds(key: str) -> Tuple[datetime, datetime]:
+    """Primeiro e último instante do mês 'AAAA-MM'"""
+    start = datetime.strptime(key, '%Y-%m')
+    following = (start + timedelta(days=32)).replace(day=1)
+    return start, following - timedelta(microseconds=1)
+
+
+class MonthlyStats:
+    """GroupStats por mês, calculados sob demanda a partir do DateIndex
+    
+    Alterações só descartam o parcial do mês afetado; o histórico
+    completo é a combinação dos parciais, e só os meses descartados são
+    percorridos de novo.
+    """
+    
+    def __init__(self, dates):
+        self._dates = dates
+        self._counts: Dict[str, int] = {}
+        self._partials: Dict[str, GroupStats] = {}
+    
+    def __len__(self) -> int:
+        return sum(self._counts.values())
+    
+    @staticmethod
+    def _key(t: Transaction) -> str:
+        date = t.get_date_obj()
+        return f"{date.year:04d}-{date.month:02d}"
+    
+    def _apply(self, t: Transaction, sign: int):
+        key = self._key(t)
+        self._partials.pop(key, None)
+        count = self._counts.get(key, 0) + sign
+        if count > 0:
+            self._counts[key] = count
+        else:
+            self._counts.pop(key, None)
+    
+    def add(self, t: Transaction):
+        self._apply(t, 1)
+    
+    def remove(self, t: Transaction):
+        self._apply(t, -1)
+    
+    def month(self, key: str) -> GroupStats:
+        """Parcial de um mês ('AAAA-MM')"""
+        partial = self._partials.get(key)
+        if partial is None:
+            partial = GroupStats()
+            if key in self._counts:
+                partial.add_all(self._dates.range(*_month_bounds(key)))
+            self._partials[key] = partial
+        return partial
+    
+    def merged(self, keys: Optional[Iterable[str]] = None) -> GroupStats:
+        """Combinação dos meses indicados (padrão: todos)"""
+        result = GroupStats()
+        for key in sorted(self._counts if keys is None else keys):
+            result.merge(self.month(key))
+        return result
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Índice invertido de descrições para busca textual
+"""
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+from models import Transaction
+
+
+def normalize(text: str) -> str:
+    """Remove acentos e diferenças de caixa ('Alimentação' -> 'alimentacao')"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigramas de um texto já normalizado"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TextIndex:
+    """Índice de trigramas sobre as descrições
+    
+    Cada termo da busca casa como substring (portanto também como
+    prefixo) da descrição normalizada; vários termos são combinados
+    com E. Os trigramas reduzem os candidatos e a substring é
+    confirmada no texto normalizado guardado.
+    """
+    
+    def __init__(self):
+        self._normalized: Dict[int, str] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._items: Dict[int, Transaction] = {}
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def add(self, t: Transaction):
+        """Indexa a descrição da transação"""
+        text = normalize(t.descricao)
+        self._normalized[t.id] = text
+        self._items[t.id] = t
+        for gram in trigrams(text):
+            self._postings.setdefault(gram, set()).add(t.id)
+    
+    def remove(self, t: Transaction):
+        """Remove a transação do índice"""
+        text = self._normalized.pop(t.id, None)
+        if text is None:
+            return
+        
+        del self._items[t.id]
+        for gram in trigrams(text):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(t.id)
+                if not posting:
+                    del self._postings[gram]
+    
+    def _candidates(self, term: str) -> Optional[Set[int]]:
+        """Ids que contêm todos os trigramas do termo (None = sem filtro)"""
+        grams = trigrams(term)
+        if not grams:
+            return None
+        
+        postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+    
+    def search(self, query: str) -> List[Transaction]:
+        """Transações cuja descrição contém todos os termos da busca"""
+        terms = normalize(query).split()
+        if not terms:
+            return list(self._items.values())
+        
+        candidates: Optional[Set[int]] = None
+        for term in sorted(terms, key=len, reverse=True):
+            ids = self._candidates(term)
+            if ids is not None:
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+        
+        ids: Iterable[int] = sorted(candidates) if candidates is not None else self._items
+        return [
+            self._items[i] for i in ids
+            if all(term in self._normalized[i] for term in terms)
+        ]
+    
+    def estimate(self, query: str) -> int:
+        """Limite superior de resultados, só pelos tamanhos das listas"""
+        best = len(self._items)
+        for term in normalize(query).split():
+            for gram in trigrams(term):
+                best = min(best, len(self._postings.get(gram, ())))
+        return best
+    
+    def matches(self, t: Transaction, terms: List[str]) -> bool:
+        """Indica se a descrição contém todos os termos (já normalizados)"""
+        text = self._normalized.get(t.id)
+        if text is None:
+            text = normalize(t.descricao)
+        return all(term in text for term in terms)
+    
+    def to_dict(self) -> Dict:
+        """Converte para dicionário (persistência)"""
+        return {
+            'normalized': {str(i): text for i, text in self._normalized.items()},
+            'postings': {g: sorted(ids) for g, ids in self._postings.items()}
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict, transactions) -> Optional['TextIndex']:
+        """Restaura o índice ligando-o às transações carregadas
+        
+        Retorna None se o índice salvo não corresponder às transações.
+        """
+        index = cls()
+        try:
+            for key, text in data['normalized'].items():
+                t = transactions.get(int(key))
+                if t is None:
+                    return None
+                index._normalized[t.id] = text
+                index._items[t.id] = t
+            index._postings = {g: set(ids) for g, ids in data['postings'].items()}
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        
+        if len(index) != len(transactions):
+            return None
+        
+        return index
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Repositório indexado de transações
+"""
+from typing import Dict, Iterable, Iterator, Optional, List
+from models import Transaction
+
+
+class TransactionRepository:
+    """Guarda as transações com índices por id, categoria e tipo
+    
+    Índices externos (ex.: ColumnStore) podem ser registrados com
+    register(); eles recebem add(t) após inserções e remove(t) antes de
+    remoções. Em atualizações o repositório chama remove(t) antes de
+    alterar o objeto e add(t) depois.
+    """
+    
+    def __init__(self, transactions: Optional[Iterable[Transaction]] = None):
+        self._by_id: Dict[int, Transaction] = {}
+        self._by_category: Dict[str, Dict[int, Transaction]] = {}
+        self._by_tipo: Dict[str, Dict[int, Transaction]] = {}
+        self._indexes: List = []
+        self._next_id = 1
+        
+        for t in transactions or []:
+            self._insert(t)
+    
+    def __iter__(self) -> Iterator[Transaction]:
+        return iter(self._by_id.values())
+    
+    def __len__(self) -> int:
+        return len(self._by_id)
+    
+    def register(self, index, populate: bool = True):
+        """Registra índice externo e o popula com as transações atuais
+
+        Use populate=False para índices já construídos (ex.: lidos do disco).
+        """
+        if populate:
+            self._add_all_to(index, self._by_id.values())
+        self._indexes.append(index)
+    
+    def _add_all_to(self, index, transactions):
+        # Índices podem oferecer add_all() para construção em lote
+        add_all = getattr(index, 'add_all', None)
+        if add_all is not None:
+            add_all(transactions)
+        else:
+            for t in transactions:
+                index.add(t)
+    
+    def reserve_ids(self, max_id: int):
+        """Garante que next_id() não devolva ids até max_id (ex.: já gravados)"""
+        if max_id >= self._next_id:
+            self._next_id = max_id + 1
+    
+    def next_id(self) -> int:
+        """Reserva o próximo id (contador monotônico)"""
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
+    
+    def _insert(self, t: Transaction, notify: bool = True):
+        self._by_id[t.id] = t
+        self._by_category.setdefault(t.categoria, {})[t.id] = t
+        self._by_tipo.setdefault(t.tipo, {})[t.id] = t
+        if t.id >= self._next_id:
+            self._next_id = t.id + 1
+        
+        if notify:
+            for index in self._indexes:
+                index.add(t)
+    
+    def _unlink(self, t: Transaction):
+        for index in self._indexes:
+            index.remove(t)
+        
+        for secondary, key in ((self._by_category, t.categoria),
+                               (self._by_tipo, t.tipo)):
+            bucket = secondary.get(key)
+            if bucket is not None:
+                bucket.pop(t.id, None)
+                if not bucket:
+                    del secondary[key]
+    
+    def add(self, t: Transaction):
+        """Insere transação"""
+        self._insert(t)
+    
+    def add_many(self, transactions: List[Transaction]):
+        """Insere um lote e atualiza os índices uma única vez"""
+        for t in transactions:
+            self._insert(t, notify=False)
+        for index in self._indexes:
+            self._add_all_to(index, transactions)
+    
+    def get(self, trans_id: int) -> Optional[Transaction]:
+        """Busca transação por id (O(1))"""
+        return self._by_id.get(trans_id)
+    
+    def update(self, trans_id: int, changes: Dict) -> Optional[Transaction]:
+        """Altera atributos da transação mantendo os índices coerentes"""
+        t = self._by_id.get(trans_id)
+        if t is None:
+            return None
+        
+        self._unlink(t)
+        for key, value in changes.items():
+            # O id é a chave dos índices e não pode ser alterado
+            if key != 'id' and hasattr(t, key) and value is not None:
+                setattr(t, key, value)
+        self._insert(t)
+        
+        return t
+    
+    def delete(self, trans_id: int) -> bool:
+        """Remove transação por id"""
+        t = self._by_id.get(trans_id)
+        if t is None:
+            return False
+        
+        self._unlink(t)
+        del self._by_id[trans_id]
+        return True
+    
+    def by_category(self, categoria: str) -> List[Transaction]:
+        """Transações de uma categoria"""
+        return list(self._by_category.get(categoria, {}).values())
+    
+    def by_tipo(self, tipo: str) -> List[Transaction]:
+        """Transações de um tipo"""
+        return list(self._by_tipo.get(tipo, {}).values())
+    
+    def count_by_category(self, categoria: str) -> int:
+        """Quantidade de transações da categoria (sem criar lista)"""
+        return len(self._by_category.get(categoria, ()))
+    
+    def count_by_tipo(self, tipo: str) -> int:
+        """Quantidade de transações do tipo (sem criar lista)"""
+        return len(self._by_tipo.get(tipo, ()))
+    
+    def categories_in_use(self) -> List[str]:
+        """Categorias que possuem ao menos uma transação"""
+        return list(self._by_category)
\ No newline at end of file
@@ -0,0 +1,6 @@
+"""
+Testes unitários
+
+Uso (dentro de meu_financeiro/):
+    python -m pytest -q
+"""
\ No newline at end of file
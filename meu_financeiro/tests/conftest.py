@@ -0,0 +1,27 @@
+"""
+Configuração comum dos testes
+"""
+import os
+import sys
+from typing import Callable, Optional
+
+import pytest
+
+# Os módulos importam config, models e services como pacotes de topo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import Transaction
+
+
+@pytest.fixture
+def make_transaction() -> Callable[..., Transaction]:
+    """Fábrica de transações com valores padrão (id sequencial)"""
+    ids = iter(range(1, 1_000_000))
+    
+    def make(data: str = '2024-01-15', valor: float = 10.0, tipo: str = 'despesa',
+             categoria: str = 'Alimentação', descricao: str = 'Mercado',
+             id: Optional[int] = None) -> Transaction:
+        return Transaction(id if id is not None else next(ids), tipo, categoria,
+                           descricao, valor, f"{data}T00:00:00")
+    
+    return make
\ No newline at end of file
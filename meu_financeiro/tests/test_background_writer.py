@@ -0,0 +1,127 @@
+"""
+BackgroundWriter: agrupamento, cópias e reenvio de lotes que falharam
+"""
+import pytest
+
+from models import CategoryManager
+from services.background_writer import BackgroundWriter
+from services.storage_service import StorageService
+
+
+class _FakeStorage:
+    """Registra as chamadas; fail = quantas gravações seguintes falham"""
+    
+    def __init__(self, journal: bool):
+        self.journal = journal
+        self.calls = []
+        self.fail = 0
+    
+    def needs_state(self) -> bool:
+        return not self.journal
+    
+    def _record(self, call) -> bool:
+        if self.fail:
+            self.fail -= 1
+            return False
+        self.calls.append(call)
+        return True
+    
+    def save(self, transactions, categories) -> bool:
+        return self._record(('save', sorted(t.id for t in transactions)))
+    
+    def save_changes(self, changes, transactions, categories) -> bool:
+        state = None if transactions is None else sorted(t.id for t in transactions)
+        return self._record(('changes', [(op, p['id']) for op, p in changes], state))
+
+
+@pytest.fixture
+def writer_for():
+    writers = []
+    
+    def make(storage) -> BackgroundWriter:
+        # Atraso longo: só flush() e close() disparam gravações nos testes
+        writer = BackgroundWriter(storage, delay=60)
+        writers.append(writer)
+        return writer
+    
+    yield make
+    for writer in writers:
+        writer.close()
+
+
+def test_journal_backend_gets_only_records(writer_for, make_transaction):
+    storage = _FakeStorage(journal=True)
+    writer = writer_for(storage)
+    rows = [make_transaction() for _ in range(3)]
+    
+    for t in rows:
+        writer.save_change('put', t.to_dict(), rows, CategoryManager())
+    assert writer.flush()
+    
+    assert storage.calls == [('changes', [('put', t.id) for t in rows], None)]
+
+
+def test_full_backend_gets_latest_state(writer_for, make_transaction):
+    storage = _FakeStorage(journal=False)
+    writer = writer_for(storage)
+    rows = []
+    for _ in range(3):
+        rows.append(make_transaction())
+        writer.save_change('put', rows[-1].to_dict(), rows, CategoryManager())
+    assert writer.flush()
+    
+    assert storage.calls == [('changes', [('put', t.id) for t in rows], [t.id for t in rows])]
+
+
+def test_payloads_are_copied_on_enqueue(writer_for, make_transaction):
+    storage = _FakeStorage(journal=True)
+    writer = writer_for(storage)
+    payload = make_transaction().to_dict()
+    
+    writer.save_change('put', payload, [], CategoryManager())
+    payload['id'] = 999
+    writer.flush()
+    
+    assert storage.calls[0][1][0][1] != 999
+
+
+def test_changes_after_full_save_follow_it(writer_for, make_transaction):
+    storage = _FakeStorage(journal=True)
+    writer = writer_for(storage)
+    first, second = make_transaction(), make_transaction()
+    
+    writer.save_change('put', first.to_dict(), [first], CategoryManager())
+    writer.save([first], CategoryManager())
+    writer.save_change('put', second.to_dict(), [first, second], CategoryManager())
+    writer.flush()
+    
+    assert storage.calls == [('save', [first.id]), ('changes', [('put', second.id)], None)]
+
+
+def test_failed_batch_is_retried_with_next_changes(writer_for, make_transaction):
+    storage = _FakeStorage(journal=True)
+    writer = writer_for(storage)
+    first, second = make_transaction(), make_transaction()
+    storage.fail = 1
+    
+    writer.save_change('put', first.to_dict(), [], CategoryManager())
+    assert not writer.flush()
+    assert not writer.ok
+    
+    writer.save_change('put', second.to_dict(), [], CategoryManager())
+    assert writer.flush()
+    assert storage.calls == [('changes', [('put', first.id), ('put', second.id)], None)]
+
+
+def test_end_to_end_with_journal(tmp_path, writer_for, make_transaction):
+    filename = str(tmp_path / 'financas.json')
+    writer = writer_for(StorageService(filename, journal=True, compact_every=3, cache=False))
+    rows = []
+    for _ in range(5):
+        rows.append(make_transaction())
+        writer.save_change('put', rows[-1].to_dict(), rows, CategoryManager())
+    writer.save_change('delete', {'id': rows[0].id}, rows[1:], CategoryManager())
+    assert writer.close()
+    
+    transactions, _ = StorageService(filename, journal=True, cache=False).load()
+    assert sorted(t.id for t in transactions) == [t.id for t in rows[1:]]
\ No newline at end of file
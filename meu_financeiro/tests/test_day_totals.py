@@ -0,0 +1,135 @@
+"""
+FenwickTree esparsa e DayTotals (somas de períodos e saldo acumulado)
+"""
+import random
+from datetime import date
+
+import pytest
+
+from services.day_totals import DayTotals, FenwickTree, MAX_DAY
+
+
+def _ordinal(text: str) -> int:
+    return date.fromisoformat(text).toordinal()
+
+
+def test_fenwick_range_sums_match_brute_force():
+    rng = random.Random(7)
+    size = 500
+    values = [0] * size
+    tree = FenwickTree(size)
+    for _ in range(300):
+        pos, delta = rng.randrange(size), rng.randint(-50, 50)
+        values[pos] += delta
+        tree.add(pos, delta)
+    
+    for _ in range(200):
+        start = rng.randrange(size)
+        end = rng.randint(start, size)
+        assert tree.range_sum(start, end) == sum(values[start:end])
+    assert tree.prefix(size) == sum(values)
+
+
+def test_fenwick_prefix_clamps_to_bounds():
+    tree = FenwickTree(10)
+    tree.add(0, 3)
+    tree.add(9, 4)
+    assert tree.prefix(-5) == 0
+    assert tree.prefix(100) == 7
+    assert tree.range_sum(1, 9) == 0
+
+
+def test_fenwick_from_items_and_merge_match_point_updates():
+    rng = random.Random(11)
+    size = 1000
+    first = {rng.randrange(size): rng.randint(1, 99) for _ in range(60)}
+    second = {rng.randrange(size): rng.randint(1, 99) for _ in range(60)}
+    
+    expected = FenwickTree(size)
+    for values in (first, second):
+        for pos, value in values.items():
+            expected.add(pos, value)
+    merged = FenwickTree.from_items(size, first)
+    merged.merge(FenwickTree.from_items(size, second))
+    
+    for end in range(0, size + 1, 37):
+        assert merged.prefix(end) == expected.prefix(end)
+
+
+def test_fenwick_is_sparse():
+    tree = FenwickTree(MAX_DAY + 1)
+    tree.add(_ordinal('0024-03-01'), 100)
+    # Algumas dezenas de nós, não um vetor com milhões de posições
+    assert len(tree._tree) <= MAX_DAY.bit_length()
+    assert tree.prefix(MAX_DAY + 1) == 100
+
+
+def test_totals_and_categories_over_inclusive_range(make_transaction):
+    totals = DayTotals()
+    totals.add_all([
+        make_transaction('2024-01-01', 10.0, 'receita', 'Salário'),
+        make_transaction('2024-01-15', 2.5, 'despesa', 'Alimentação'),
+        make_transaction('2024-01-31', 4.0, 'despesa', 'Transporte'),
+        make_transaction('2024-02-01', 1.0, 'despesa', 'Alimentação'),
+    ])
+    
+    january = (_ordinal('2024-01-01'), _ordinal('2024-01-31'))
+    assert totals.totals(*january) == {
+        'receita': 1000, 'num_receitas': 1,
+        'despesa': 650, 'num_despesas': 2
+    }
+    assert totals.by_category(*january) == {'Alimentação': 250, 'Transporte': 400}
+    assert len(totals) == 4
+
+
+def test_insert_before_last_day_is_a_point_update(make_transaction):
+    totals = DayTotals()
+    totals.add(make_transaction('2024-06-01', 5.0))
+    trees = dict(totals._cents)
+    
+    totals.add(make_transaction('2020-01-01', 3.0))
+    
+    # As séries existentes são atualizadas, não reconstruídas
+    assert all(totals._cents[key] is tree for key, tree in trees.items())
+    assert totals.totals(_ordinal('2020-01-01'), _ordinal('2020-01-01'))['despesa'] == 300
+    assert totals.totals(1, MAX_DAY)['despesa'] == 800
+
+
+def test_remove_reverts_add(make_transaction):
+    totals = DayTotals()
+    kept = make_transaction('2024-03-10', 7.0, 'receita', 'Salário')
+    removed = make_transaction('2024-03-11', 2.0)
+    totals.add_all([kept, removed])
+    
+    totals.remove(removed)
+    
+    assert totals.totals(1, MAX_DAY) == {
+        'receita': 700, 'num_receitas': 1,
+        'despesa': 0, 'num_despesas': 0
+    }
+    assert totals.by_category(1, MAX_DAY) == {}
+
+
+def test_balance_series(make_transaction):
+    totals = DayTotals()
+    totals.add_all([
+        make_transaction('2024-01-05', 100.0, 'receita', 'Salário'),
+        make_transaction('2024-02-10', 30.0),
+        make_transaction('0024-01-01', 1.0),
+    ])
+    days = [_ordinal(d) for d in ('0023-12-31', '2024-01-31', '2024-02-29', '9999-12-31')]
+    assert totals.balance_series(days) == [0, 9900, 6900, 6900]
+
+
+@pytest.mark.parametrize('num_months', [3, 30000])
+def test_balance_over_time_is_clamped_to_year_one(num_months, make_transaction):
+    from services.finance_service import FinanceService
+    from models import CategoryManager
+    
+    finance = FinanceService([make_transaction('0002-03-01', 10.0, 'receita', 'Salário')],
+                             CategoryManager())
+    months = finance.balance_over_time(num_months)
+    
+    assert months[-1] == {'key': '0002-03', 'name': 'Mar/0002', 'saldo': 10.0}
+    assert len(months) == min(num_months, 15)
+    assert months[0]['key'] == ('0002-01' if num_months == 3 else '0001-01')
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Pager: navegação, busca por data e troca do tamanho da página
+"""
+from datetime import datetime
+
+import pytest
+
+from services.pager import Pager
+
+
+@pytest.fixture
+def rows(make_transaction):
+    # Dois lançamentos por dia, de 01/01 a 10/01 (ordem crescente de data)
+    return [make_transaction(f"2024-01-{day:02d}") for day in range(1, 11) for _ in range(2)]
+
+
+def test_next_prev_and_bounds(rows):
+    pager = Pager(rows, page_size=8)
+    assert pager.page_count == 3
+    assert pager.page() == rows[:8]
+    
+    assert pager.next() and pager.next()
+    assert pager.page() == rows[16:]
+    assert not pager.next()
+    assert pager.page_number == 3
+    
+    assert pager.prev()
+    assert pager.page_number == 2
+    pager.seek(0)
+    assert not pager.prev()
+
+
+def test_reverse_pages_without_copying(rows):
+    pager = Pager(rows, page_size=8, reverse=True)
+    assert pager.page() == rows[::-1][:8]
+    pager.next()
+    pager.next()
+    assert pager.page() == rows[::-1][16:]
+
+
+def test_seek_is_clamped(rows):
+    pager = Pager(rows, page_size=5)
+    pager.seek(-3)
+    assert pager.offset == 0
+    pager.seek(1000)
+    assert pager.offset == len(rows) - 1
+
+
+def test_seek_date(rows):
+    pager = Pager(rows, page_size=5)
+    pager.seek_date(datetime(2024, 1, 4, 15, 30))
+    assert pager.page()[0] is rows[6]
+    
+    # Dia sem lançamentos: o primeiro posterior
+    pager.seek_date(datetime(2023, 12, 25))
+    assert pager.offset == 0
+
+
+def test_seek_date_reverse(rows):
+    pager = Pager(rows, page_size=5, reverse=True)
+    pager.seek_date(datetime(2024, 1, 4))
+    # Último lançamento do dia 04 primeiro
+    assert pager.page()[0] is rows[7]
+    
+    pager.seek_date(datetime(2024, 2, 1))
+    assert pager.page()[0] is rows[-1]
+
+
+def test_set_page_size_realigns_to_page_with_first_visible_row(rows):
+    pager = Pager(rows, page_size=8)
+    pager.next()
+    first_visible = pager.page()[0]
+    
+    pager.set_page_size(5)
+    
+    assert pager.offset % 5 == 0
+    assert pager.page_number == pager.offset // 5 + 1
+    assert first_visible in pager.page()
+    assert pager.page_count == 4
+
+
+def test_page_size_is_at_least_one(rows):
+    pager = Pager(rows, page_size=0)
+    assert pager.page_size == 1
+    pager.set_page_size(-4)
+    assert pager.page_size == 1
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""
+PartitionedStorageService: partições mensais lidas sob demanda
+"""
+import os
+from datetime import datetime
+
+import pytest
+
+from models import CategoryManager
+from services import create_finance_service
+from services.partitioned_storage import PartitionedStorageService
+
+OLD_MONTHS = ('2001-01', '2001-02')
+
+
+@pytest.fixture
+def ledger(tmp_path, make_transaction):
+    """Partições de dois meses antigos e do mês atual"""
+    directory = str(tmp_path / 'financas')
+    json_file = str(tmp_path / 'financas.json')
+    today = datetime.now().strftime('%Y-%m-%d')
+    rows = [make_transaction(f"{month}-10", 10.0) for month in OLD_MONTHS]
+    rows.append(make_transaction(today, 5.0, 'receita', 'Salário'))
+    
+    storage = PartitionedStorageService(directory, json_file, preload_months=1)
+    storage.load()
+    assert storage.save_changes([('put', t.to_dict()) for t in rows], None, CategoryManager())
+    
+    def reopen() -> PartitionedStorageService:
+        return PartitionedStorageService(directory, json_file, preload_months=1)
+    
+    return reopen, rows
+
+
+def test_load_reads_only_recent_months(ledger):
+    reopen, rows = ledger
+    storage = reopen()
+    
+    transactions, _ = storage.load()
+    
+    assert [t.id for t in transactions] == [rows[-1].id]
+    assert storage.months()[:2] == list(OLD_MONTHS)
+    assert storage.month_size('2001-01') == 1
+    assert storage.max_id() == rows[-1].id
+
+
+def test_period_query_loads_only_overlapping_months(ledger):
+    reopen, rows = ledger
+    finance = create_finance_service(reopen())
+    
+    january = finance.filter_by_period(datetime(2001, 1, 1), datetime(2001, 1, 31, 23, 59))
+    
+    assert [t.id for t in january] == [rows[0].id]
+    assert finance._unloaded_months == {'2001-02'}
+
+
+def test_full_ledger_query_loads_every_month(ledger):
+    reopen, rows = ledger
+    finance = create_finance_service(reopen())
+    
+    assert finance.calculate_summary()['total_despesas'] == 20.0
+    assert not finance._unloaded_months
+    assert len(finance.transactions) == len(rows)
+
+
+def test_new_ids_skip_unloaded_months(ledger):
+    reopen, rows = ledger
+    finance = create_finance_service(reopen())
+    
+    t = finance.add_transaction('despesa', 'Lazer', 'Cinema', 30.0, '2001-03-01T00:00:00')
+    
+    assert t.id > max(r.id for r in rows)
+
+
+def test_save_changes_rewrites_only_touched_partitions(ledger):
+    reopen, rows = ledger
+    storage = reopen()
+    storage.load()
+    # Como no FinanceService: o mês do registro alterado já foi lido
+    storage.load_months(['2001-01'])
+    untouched = storage._partition_file('2001-02')
+    mtime = os.stat(untouched).st_mtime_ns
+    
+    moved = rows[0].to_dict()
+    moved['data'] = '2001-03-05T00:00:00'
+    assert storage.save_changes([('put', moved)], None, None)
+    
+    assert os.stat(untouched).st_mtime_ns == mtime
+    assert not os.path.exists(storage._partition_file('2001-01'))
+    assert reopen().load_months(['2001-03'])[0].id == rows[0].id
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Renderer: quadros com redesenho parcial e descarte após rolagem
+"""
+import builtins
+import io
+
+import pytest
+
+from views.renderer import CLEAR, Renderer
+
+MENU = ['Menu', '1. Adicionar', '2. Listar']
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    # Terminal de 10 linhas por 40 colunas
+    monkeypatch.setenv('LINES', '10')
+    monkeypatch.setenv('COLUMNS', '40')
+    return Renderer(io.StringIO())
+
+
+def _answer(monkeypatch, text: str):
+    monkeypatch.setattr(builtins, 'input', lambda prompt='': text)
+
+
+def test_redraw_rewrites_only_changed_lines(screen, monkeypatch):
+    _answer(monkeypatch, '1')
+    screen.draw(MENU)
+    screen.input('\nOpção: ')
+    
+    screen.draw(['Menu', '1. Adicionar', '2. Listar (3)'])
+    
+    assert screen._parts == ['\x1b[3;1H\x1b[2K2. Listar (3)', '\x1b[4;1H\x1b[J']
+
+
+def test_scrolling_input_invalidates_frame(screen, monkeypatch):
+    _answer(monkeypatch, 'x' * 200)
+    screen.draw(MENU)
+    screen.input('\nOpção: ')
+    
+    screen.draw(MENU)
+    
+    assert screen._parts[0] == CLEAR
+
+
+def test_scrolling_print_invalidates_frame(screen):
+    screen.draw(MENU)
+    screen.print('\n' * 6)
+    
+    screen.draw(MENU)
+    
+    assert screen._parts[0] == CLEAR
+
+
+def test_frames_that_do_not_fit_are_not_reused(screen):
+    screen.draw(['y' * 50])
+    screen.draw(['y' * 50])
+    assert screen._parts[0] == CLEAR
+    
+    screen.draw(MENU)
+    screen.invalidate()
+    screen.draw(MENU)
+    assert screen._parts[0] == CLEAR
\ No newline at end of file
@@ -0,0 +1,79 @@
+"""
+ResultCache: invalidação por versão do ledger e política LRU
+"""
+from models import CategoryManager
+from services.finance_service import FinanceService
+from services.result_cache import ResultCache
+from services.transaction_repository import TransactionRepository
+
+
+class _Counter:
+    """compute() que conta as chamadas"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+def test_hit_until_version_changes(make_transaction):
+    repository = TransactionRepository([])
+    cache = ResultCache(maxsize=8)
+    repository.register(cache, populate=False)
+    compute = _Counter()
+    
+    assert cache.get_or_compute(('total',), compute) == 1
+    assert cache.get_or_compute(('total',), compute) == 1
+    
+    # Qualquer alteração do repositório invalida os resultados anteriores
+    t = make_transaction()
+    repository.add(t)
+    assert cache.get_or_compute(('total',), compute) == 2
+    repository.update(t.id, {'descricao': 'Feira'})
+    assert cache.get_or_compute(('total',), compute) == 3
+    repository.delete(t.id)
+    assert cache.get_or_compute(('total',), compute) == 4
+    repository.add_many([make_transaction(), make_transaction()])
+    assert cache.get_or_compute(('total',), compute) == 5
+    
+    assert cache.stats()['acertos'] == 1
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2)
+    cache.get_or_compute(('a',), lambda: 'a')
+    cache.get_or_compute(('b',), lambda: 'b')
+    cache.get_or_compute(('a',), lambda: 'novo a')
+    cache.get_or_compute(('c',), lambda: 'c')
+    
+    assert len(cache) == 2
+    assert cache.get_or_compute(('a',), lambda: 'novo a') == 'a'
+    assert cache.get_or_compute(('b',), lambda: 'novo b') == 'novo b'
+
+
+def test_ref_must_be_the_same_object():
+    cache = ResultCache(maxsize=4)
+    first, second = [1], [1]
+    
+    assert cache.get_or_compute(('len', id(first)), lambda: 'primeira', ref=first) == 'primeira'
+    # Mesma chave (id reaproveitado), outro objeto: recalcula
+    assert cache.get_or_compute(('len', id(first)), lambda: 'segunda', ref=second) == 'segunda'
+
+
+def test_disabled_cache_always_computes():
+    cache = ResultCache(maxsize=0)
+    compute = _Counter()
+    cache.get_or_compute(('x',), compute)
+    cache.get_or_compute(('x',), compute)
+    assert compute.calls == 2
+    assert len(cache) == 0
+
+
+def test_finance_service_results_follow_changes(make_transaction):
+    finance = FinanceService([make_transaction(valor=10.0)], CategoryManager())
+    
+    assert finance.calculate_summary()['total_despesas'] == 10.0
+    finance.add_transaction('despesa', 'Transporte', 'Ônibus', 5.0, '2024-01-20T00:00:00')
+    assert finance.calculate_summary()['total_despesas'] == 15.0
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+SQLiteStorageService: atualização do esquema antigo e gravação incremental
+"""
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from models import CategoryManager
+from services.sqlite_storage import SQLiteStorageService
+
+# Esquema das primeiras versões: valor em REAL
+OLD_SCHEMA = """
+CREATE TABLE transactions (
+    id INTEGER PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    categoria TEXT NOT NULL,
+    descricao TEXT NOT NULL,
+    valor REAL NOT NULL,
+    data TEXT NOT NULL,
+    criado_em TEXT
+);
+CREATE INDEX idx_transactions_data ON transactions(data);
+CREATE INDEX idx_transactions_valor ON transactions(valor);
+CREATE TABLE meta (chave TEXT PRIMARY KEY, valor TEXT);
+INSERT INTO meta VALUES ('migrated_from', '');
+"""
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return str(tmp_path / 'financas.db'), str(tmp_path / 'financas.json')
+
+
+def _columns(storage: SQLiteStorageService):
+    return {row[1] for row in storage.conn.execute("PRAGMA table_info(transactions)")}
+
+
+def test_upgrade_converts_real_values_to_cents(paths):
+    db_file, json_file = paths
+    conn = sqlite3.connect(db_file)
+    conn.executescript(OLD_SCHEMA)
+    conn.executemany(
+        "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [(1, 'despesa', 'Alimentação', 'Mercado', 0.29, '2024-01-05T00:00:00', None),
+         (2, 'receita', 'Salário', 'Empresa', 1234.57, '2024-01-06T00:00:00', None)]
+    )
+    conn.commit()
+    conn.close()
+    
+    storage = SQLiteStorageService(db_file, json_file)
+    
+    assert 'centavos' in _columns(storage) and 'valor' not in _columns(storage)
+    assert storage.conn.execute(
+        "SELECT id, centavos FROM transactions ORDER BY id").fetchall() == [(1, 29), (2, 123457)]
+    indexes = {row[1] for row in storage.conn.execute("PRAGMA index_list(transactions)")}
+    assert 'idx_transactions_centavos' in indexes and 'idx_transactions_valor' not in indexes
+    
+    transactions, _ = storage.load()
+    assert [(t.id, t.valor) for t in transactions] == [(1, 0.29), (2, 1234.57)]
+    
+    # Reabrir um banco já convertido não altera nada
+    reopened = SQLiteStorageService(db_file, json_file)
+    assert [t.cents for t in reopened.load()[0]] == [29, 123457]
+
+
+def test_new_database_ignores_json_created_later(paths):
+    db_file, json_file = paths
+    assert SQLiteStorageService(db_file, json_file).load()[0] == []
+    
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump({'transactions': [{'id': 1, 'tipo': 'despesa', 'categoria': 'Lazer',
+                                     'descricao': 'Cinema', 'valor': 30.0,
+                                     'data': '2024-01-01T00:00:00'}]}, f)
+    
+    assert SQLiteStorageService(db_file, json_file).load()[0] == []
+
+
+def test_migrates_existing_json_once(paths, make_transaction):
+    db_file, json_file = paths
+    t = make_transaction(valor=12.34)
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump({'transactions': [t.to_dict()], 'categories': CategoryManager().to_dict()}, f)
+    
+    transactions, _ = SQLiteStorageService(db_file, json_file).load()
+    
+    assert [(x.id, x.valor) for x in transactions] == [(t.id, 12.34)]
+
+
+def test_save_changes_and_queries(paths, make_transaction):
+    db_file, json_file = paths
+    storage = SQLiteStorageService(db_file, json_file)
+    storage.load()
+    rows = [make_transaction('2024-01-10', 10.0), make_transaction('2024-02-10', 2.5),
+            make_transaction('2024-02-11', 100.0, 'receita', 'Salário')]
+    
+    assert not storage.needs_state()
+    assert storage.save_changes([('put', t.to_dict()) for t in rows], None, None)
+    assert storage.save_changes([('delete', {'id': rows[0].id})], None, None)
+    
+    february = storage.filter_by_period(datetime(2024, 2, 1), datetime(2024, 2, 29, 23, 59))
+    assert [t.id for t in february] == [rows[1].id, rows[2].id]
+    assert storage.calculate_by_category('despesa') == {'Alimentação': 2.5}
+    assert [(m['key'], m['receitas'], m['despesas']) for m in storage.get_monthly_data()] == [
+        ('2024-02', 100.0, 2.5)
+    ]
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""
+Importação de extratos: valores, leitura de CSV/OFX e gravação
+"""
+from decimal import Decimal
+
+import pytest
+
+from models import CategoryManager
+from services.finance_service import FinanceService
+from services.statement_importer import (StatementImporter, _parse_amount,
+                                         parse_csv_statement, parse_ofx_statement)
+from services.storage_service import StorageService
+
+OFX_BODY = (
+    "<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>"
+    "<STMTTRN><DTPOSTED>20240105120000<TRNAMT>-10.50<MEMO>Padaria São João"
+    "<STMTTRN><DTPOSTED>20240106<TRNAMT>1500.00<NAME>Salário"
+    "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"
+)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('-1.234,56', '-1234.56'),
+    ('-1,234.56', '-1234.56'),
+    ('-1234.56', '-1234.56'),
+    ('R$ 1.000,00', '1000.00'),
+    ('1.234.567', '1234567.00'),
+    ('12.345,6', '12345.60'),
+    # Um único separador seguido de exatamente três dígitos é de milhar
+    ('1.234', '1234.00'),
+    ('1,234', '1234.00'),
+    ('-1.234', '-1234.00'),
+    ('1,5', '1.50'),
+    ('1.23', '1.23'),
+    ('-0,10', '-0.10'),
+    ('1.2340', None),
+    ('1.2345', None),
+    ('0.001', None),
+    ('abc', None),
+    ('', None),
+    ('nan', None),
+])
+def test_parse_amount(text, expected):
+    amount = _parse_amount(text)
+    assert amount == (None if expected is None else Decimal(expected))
+
+
+def test_parse_csv_statement_detects_delimiter_and_columns(tmp_path):
+    path = tmp_path / 'extrato.csv'
+    path.write_text("Data;Histórico;Valor\n05/01/2024;Padaria;-10,50\n\n06/01/2024;Pix\n",
+                    encoding='utf-8-sig')
+    
+    assert list(parse_csv_statement(str(path))) == [
+        {'data': '05/01/2024', 'descricao': 'Padaria', 'valor': '-10,50'},
+        {'data': '', 'descricao': '', 'valor': ''},
+    ]
+
+
+def test_parse_csv_statement_requires_columns(tmp_path):
+    path = tmp_path / 'extrato.csv'
+    path.write_text("a,b\n1,2\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(parse_csv_statement(str(path)))
+
+
+@pytest.mark.parametrize('header, encoding', [
+    (b"OFXHEADER:100\r\nENCODING:USASCII\r\nCHARSET:1252\r\n\r\n", 'cp1252'),
+    (b"OFXHEADER:100\r\nENCODING:UTF-8\r\nCHARSET:NONE\r\n\r\n", 'utf-8'),
+    (b'<?xml version="1.0" encoding="UTF-8"?>\n', 'utf-8'),
+    (b"", 'utf-8'),
+    (b"", 'latin-1'),
+])
+def test_parse_ofx_statement_encodings(tmp_path, header, encoding):
+    path = tmp_path / 'extrato.ofx'
+    path.write_bytes(header + OFX_BODY.encode(encoding))
+    
+    assert list(parse_ofx_statement(str(path))) == [
+        {'data': '05/01/2024', 'descricao': 'Padaria São João', 'valor': '-10.50'},
+        {'data': '06/01/2024', 'descricao': 'Salário', 'valor': '1500.00'},
+    ]
+
+
+@pytest.mark.parametrize('journal', [True, False])
+def test_import_file_saves_only_new_rows(tmp_path, journal):
+    statement = tmp_path / 'extrato.csv'
+    statement.write_text(
+        "data;descricao;valor\n"
+        "05/01/2024;Padaria;-1.234\n"
+        "06/01/2024;Salário;5.000,00\n"
+        "07/01/2024;Arredondado;0,001\n"
+        "32/01/2024;Data inválida;10,00\n",
+        encoding='utf-8'
+    )
+    storage = StorageService(str(tmp_path / 'financas.json'), journal=journal, cache=False)
+    finance = FinanceService([], CategoryManager())
+    
+    result = StatementImporter(finance, storage, batch_size=2).import_file(str(statement))
+    
+    assert (result['lidas'], result['importadas'], result['rejeitadas']) == (4, 2, 2)
+    assert result['salvo']
+    transactions, _ = StorageService(storage.filename, journal=journal, cache=False).load()
+    assert sorted((t.tipo, t.descricao, t.valor) for t in transactions) == [
+        ('despesa', 'Padaria', 1234.0),
+        ('receita', 'Salário', 5000.0),
+    ]
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""
+Journal do StorageService: reaplicação, cauda corrompida e compactação
+"""
+import json
+import os
+
+from models import CategoryManager
+from services.storage_service import StorageService
+
+
+def _storage(tmp_path, **options) -> StorageService:
+    options.setdefault('cache', False)
+    return StorageService(str(tmp_path / 'financas.json'), journal=True, **options)
+
+
+def _ids(storage: StorageService):
+    transactions, _ = storage.load()
+    return sorted(t.id for t in transactions)
+
+
+def test_replay_applies_puts_and_deletes(tmp_path, make_transaction):
+    storage = _storage(tmp_path)
+    categories = CategoryManager()
+    first, second = make_transaction(), make_transaction(valor=20.0)
+    
+    assert storage.save_change('put', first.to_dict(), [], categories)
+    assert storage.save_change('put', second.to_dict(), [], categories)
+    assert storage.save_change('delete', {'id': first.id}, [], categories)
+    
+    assert not os.path.exists(storage.filename)
+    transactions, _ = _storage(tmp_path).load()
+    assert [(t.id, t.valor) for t in transactions] == [(second.id, 20.0)]
+
+
+def test_replay_is_idempotent_over_snapshot(tmp_path, make_transaction):
+    storage = _storage(tmp_path)
+    categories = CategoryManager()
+    t = make_transaction()
+    storage.save([t], categories)
+    # Registro já contido no snapshot (ex.: compactação interrompida)
+    with open(storage.journal_file, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'op': 'put', 'data': t.to_dict()}) + '\n')
+    
+    assert _ids(_storage(tmp_path)) == [t.id]
+
+
+def test_replay_applies_categories(tmp_path):
+    storage = _storage(tmp_path)
+    categories = CategoryManager()
+    categories.add_category('despesa', 'Pets')
+    
+    assert storage.save_change('categories', categories.to_dict(), [], categories)
+    
+    _, loaded = _storage(tmp_path).load()
+    assert 'Pets' in loaded.get_categories('despesa')
+
+
+def test_torn_tail_is_truncated(tmp_path, make_transaction):
+    storage = _storage(tmp_path)
+    categories = CategoryManager()
+    t = make_transaction()
+    storage.save_change('put', t.to_dict(), [], categories)
+    valid_size = os.path.getsize(storage.journal_file)
+    # Escrita interrompida: registro sem '\n' no fim
+    with open(storage.journal_file, 'ab') as f:
+        f.write(b'{"op": "put", "data": {"id": 9')
+    
+    assert _ids(_storage(tmp_path)) == [t.id]
+    assert os.path.getsize(storage.journal_file) == valid_size
+    
+    # Novos registros não são concatenados à linha parcial
+    other = make_transaction()
+    reopened = _storage(tmp_path)
+    reopened.load()
+    reopened.save_change('put', other.to_dict(), [], categories)
+    assert _ids(_storage(tmp_path)) == [t.id, other.id]
+
+
+def test_unreadable_record_stops_replay(tmp_path, make_transaction):
+    storage = _storage(tmp_path)
+    categories = CategoryManager()
+    first, second = make_transaction(), make_transaction()
+    storage.save_change('put', first.to_dict(), [], categories)
+    with open(storage.journal_file, 'ab') as f:
+        f.write(b'lixo\n')
+    with open(storage.journal_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'op': 'put', 'data': second.to_dict()}) + '\n')
+    
+    # Nada depois do primeiro registro ilegível é confiável
+    assert _ids(_storage(tmp_path)) == [first.id]
+
+
+def test_compaction_without_state_rereads_disk(tmp_path, make_transaction):
+    storage = _storage(tmp_path, compact_every=3)
+    categories = CategoryManager()
+    rows = [make_transaction() for _ in range(3)]
+    
+    for t in rows:
+        assert storage.save_changes([('put', t.to_dict())], None, None)
+    
+    # O terceiro registro compactou o journal no snapshot
+    assert os.path.getsize(storage.journal_file) == 0
+    with open(storage.filename, encoding='utf-8') as f:
+        assert len(json.load(f)['transactions']) == 3
+    assert _ids(_storage(tmp_path)) == [t.id for t in rows]
+    assert categories.to_dict() == _storage(tmp_path).load()[1].to_dict()
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+QuantileSketch e RunningStats: precisão e combinação de parciais
+"""
+import random
+import statistics
+
+import pytest
+
+from services.streaming_stats import QuantileSketch, RunningStats
+
+QUANTILES = (0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0)
+
+
+def _exact(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def _values(seed: int, count: int):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(8, 1.5) for _ in range(count)]
+
+
+@pytest.mark.parametrize('accuracy', [0.01, 0.05])
+def test_quantiles_within_relative_accuracy(accuracy):
+    values = _values(1, 5000)
+    sketch = QuantileSketch(relative_accuracy=accuracy)
+    for value in values:
+        sketch.add(value)
+    
+    for q in QUANTILES:
+        exact = _exact(values, q)
+        assert abs(sketch.quantile(q) - exact) <= accuracy * exact * (1 + 1e-9)
+
+
+def test_merge_equals_single_sketch():
+    values = _values(2, 4000)
+    whole = QuantileSketch()
+    parts = [QuantileSketch() for _ in range(4)]
+    for i, value in enumerate(values):
+        whole.add(value)
+        parts[i % 4].add(value)
+    
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    
+    assert merged.count == whole.count
+    assert merged.buckets == whole.buckets
+    for q in QUANTILES:
+        assert merged.quantile(q) == whole.quantile(q)
+
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+
+def test_zero_and_empty():
+    sketch = QuantileSketch()
+    assert sketch.quantile(0.5) is None
+    for value in (0, 0, 0, 100):
+        sketch.add(value)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(100, rel=0.01)
+
+
+def test_collapse_keeps_memory_bounded_and_high_quantiles_accurate():
+    values = _values(3, 3000)
+    sketch = QuantileSketch(relative_accuracy=0.001, max_buckets=64)
+    for value in values:
+        sketch.add(value)
+    
+    assert len(sketch.buckets) <= 64
+    exact = _exact(values, 0.99)
+    assert abs(sketch.quantile(0.99) - exact) <= 0.001 * exact * (1 + 1e-9)
+
+
+def test_running_stats_merge_matches_single_pass():
+    values = _values(4, 1000)
+    whole, left, right = RunningStats(), RunningStats(), RunningStats()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i < 300 else right).add(value)
+    
+    merged = left.merge(right)
+    
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(statistics.fmean(values))
+    assert merged.variance == pytest.approx(statistics.variance(values))
+    assert (merged.min, merged.max) == (min(values), max(values))
+    assert merged.quantile(0.5) == whole.quantile(0.5)
\ No newline at end of file
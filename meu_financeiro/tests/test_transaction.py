@@ -0,0 +1,60 @@
+"""
+Transaction compacta e validação de valores
+"""
+from datetime import date, datetime
+
+import pytest
+
+from models import Transaction
+from utils.validators import validate_value
+
+
+@pytest.mark.parametrize('valor, cents', [
+    (0.29, 29),
+    (1234.57, 123457),
+    (1.005, 101),
+    (2.675, 268),
+    (10, 1000),
+])
+def test_valor_is_stored_in_cents(valor, cents):
+    t = Transaction(1, 'despesa', 'Lazer', 'Cinema', valor, '2024-01-01T00:00:00')
+    assert t.cents == cents
+    assert t.valor == cents / 100
+
+
+@pytest.mark.parametrize('data', [
+    '2024-02-29T13:45:10',
+    '2024-02-29T13:45:10.123456',
+    '0024-03-01T00:00:00',
+    '2024-02-29',
+])
+def test_dates_round_trip(data):
+    t = Transaction(1, 'receita', 'Salário', 'Empresa', 1.0, data, data)
+    assert t.data == data
+    assert t.criado_em == data
+    assert t.get_date_obj() == datetime.fromisoformat(data)
+    assert t.get_ordinal() == datetime.fromisoformat(data).toordinal()
+
+
+def test_dict_and_state_round_trip():
+    t = Transaction(7, 'despesa', 'Transporte', 'Ônibus', 4.4, '2024-05-01T08:00:00')
+    
+    for copy in (Transaction.from_dict(t.to_dict()), Transaction.from_state(t.to_state())):
+        assert copy.to_dict() == t.to_dict()
+    assert t.get_ordinal() == date(2024, 5, 1).toordinal()
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('10', (True, 10.0)),
+    ('10,5', (True, 10.5)),
+    (' 0.01 ', (True, 0.01)),
+    ('0.001', (False, 0)),
+    ('1.234', (False, 0)),
+    ('0', (False, 0)),
+    ('-5', (False, 0)),
+    ('abc', (False, 0)),
+    ('inf', (False, 0)),
+    ('nan', (False, 0)),
+])
+def test_validate_value(text, expected):
+    assert validate_value(text) == expected
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Instrumentação opcional dos pontos quentes
+
+Ativada por INSTRUMENTATION_ENABLED em config.py ou pela variável de
+ambiente FINANCAS_INSTRUMENTACAO=1. Desativada, as classes não são
+alteradas e não há nenhum custo adicional.
+"""
+import functools
+import json
+import os
+import time
+from collections.abc import Mapping, Sized
+from typing import Callable, Dict, Iterable, List, Optional
+from config import INSTRUMENTATION_ENABLED, INSTRUMENTATION_FILE
+
+ENABLED = INSTRUMENTATION_ENABLED or os.environ.get(
+    'FINANCAS_INSTRUMENTACAO', '') not in ('', '0')
+
+# nome -> [chamadas, tempo acumulado (s), linhas processadas]
+_stats: Dict[str, List] = {}
+# Tempo gasto em untimed() (ex.: espera do teclado), descontado dos métodos
+_untimed = [0.0]
+
+
+def _count_rows(args: tuple, kwargs: Dict, result) -> Optional[int]:
+    """Linhas de entrada da chamada
+
+    É o tamanho do primeiro argumento que seja uma coleção (exceto
+    textos e dicionários); sem nenhum, o de um resultado em lista (ou no
+    primeiro item de uma tupla), como nas leituras do disco. None se
+    nenhum dos dois indicar as linhas.
+    """
+    for value in (*args, *kwargs.values()):
+        if isinstance(value, Sized) and not isinstance(value, (str, bytes, Mapping)):
+            return len(value)
+    if isinstance(result, tuple) and result:
+        result = result[0]
+    return len(result) if isinstance(result, list) else None
+
+
+def _wrap(name: str, func, skip: int, rows: Optional[Callable[[object], int]]):
+    stats = _stats.setdefault(name, [0, 0.0, 0])
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        untimed = _untimed[0]
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            stats[0] += 1
+            stats[1] += time.perf_counter() - started - (_untimed[0] - untimed)
+        count = _count_rows(args[skip:], kwargs, result)
+        if count is None:
+            count = rows(args[0]) if rows is not None and skip else 0
+        stats[2] += count
+        return result
+
+    return wrapper
+
+
+def untimed(func, *args, **kwargs):
+    """Chama func sem que seu tempo conte nos métodos medidos em andamento
+
+    Usado na leitura do teclado: o tempo de uma tela é só o de montá-la.
+    """
+    if not ENABLED:
+        return func(*args, **kwargs)
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _untimed[0] += time.perf_counter() - started
+
+
+def instrument(prefix: str, include: Optional[Iterable[str]] = None,
+               exclude: Iterable[str] = (),
+               rows: Optional[Callable[[object], int]] = None):
+    """Decorador de classe que mede os métodos públicos (ou os de include)
+
+    rows(instância) informa as linhas processadas pelos métodos que não
+    recebem uma coleção (ex.: consultas sobre todo o histórico).
+    """
+    def decorate(cls):
+        if not ENABLED:
+            return cls
+
+        names = include or [n for n in vars(cls) if not n.startswith('_')]
+        for attr_name in names:
+            if attr_name in exclude:
+                continue
+            attr = vars(cls).get(attr_name)
+            name = f"{prefix}.{attr_name}"
+            if isinstance(attr, classmethod):
+                setattr(cls, attr_name, classmethod(_wrap(name, attr.__func__, 1, None)))
+            elif isinstance(attr, staticmethod):
+                setattr(cls, attr_name, staticmethod(_wrap(name, attr.__func__, 0, None)))
+            elif callable(attr):
+                setattr(cls, attr_name, _wrap(name, attr, 1, rows))
+        return cls
+
+    return decorate
+
+
+def report() -> List[Dict]:
+    """Estatísticas coletadas, do maior tempo acumulado para o menor"""
+    rows = [
+        {'nome': name, 'chamadas': calls, 'segundos': total, 'linhas': lines}
+        for name, (calls, total, lines) in _stats.items()
+        if calls
+    ]
+    return sorted(rows, key=lambda r: r['segundos'], reverse=True)
+
+
+def format_report() -> str:
+    """Tabela de estatísticas para exibição no terminal"""
+    lines = [f"{'Método':<42} {'Chamadas':>9} {'Total (s)':>10} {'Linhas':>10}"]
+    for row in report():
+        lines.append(f"{row['nome']:<42} {row['chamadas']:>9} "
+                     f"{row['segundos']:>10.4f} {row['linhas']:>10}")
+    return '\n'.join(lines)
+
+
+def dump(filename: str = INSTRUMENTATION_FILE) -> bool:
+    """Grava as estatísticas em JSON"""
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(report(), f, ensure_ascii=False, indent=2)
+        return True
+    except OSError as e:
+        print(f"Erro ao gravar instrumentação: {e}")
+        return False
\ No newline at end of file
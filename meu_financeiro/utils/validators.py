@@ -15,14 +15,16 @@ def validate_date(date_str: str) -> bool:
 
 
 def validate_value(value_str: str) -> tuple[bool, float]:
-    """Valida e converte valor monetário"""
+    """Valida e converte valor monetário (positivo, no máximo duas casas decimais)"""
+    from decimal import Decimal, InvalidOperation
+    
     try:
-        value = float(value_str.replace(',', '.'))
-        if value <= 0:
-            return False, 0
-        return True, value
-    except ValueError:
+        value = Decimal(value_str.strip().replace(',', '.'))
+    except InvalidOperation:
+        return False, 0
+    if not value.is_finite() or value <= 0 or value.as_tuple().exponent < -2:
         return False, 0
+    return True, float(value)
 
 
 def validate_tipo(tipo: str) -> bool:
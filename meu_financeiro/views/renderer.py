@@ -0,0 +1,110 @@
+"""
+Renderização do terminal em quadros com buffer
+"""
+import builtins
+import os
+import shutil
+import sys
+from typing import List, Optional, TextIO
+from utils import instrumentation
+
+CLEAR = '\x1b[2J\x1b[H'
+CLEAR_LINE = '\x1b[2K'
+CLEAR_BELOW = '\x1b[J'
+
+
+@instrumentation.instrument('Renderer', include=('flush', 'draw'))
+class Renderer:
+    """Acumula a saída de uma tela e escreve tudo com uma única chamada
+    
+    A tela é limpa com sequências ANSI (sem criar um processo de shell)
+    e o buffer é descarregado antes de cada leitura do teclado.
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream or sys.stdout
+        self._parts: List[str] = []
+        # Linhas do último quadro desenhado com draw(); None após clear()
+        self._frame: Optional[List[str]] = None
+        # Linha da tela (base 1) em que está o cursor depois desse quadro
+        self._row = 0
+        if os.name == 'nt':
+            # Habilita o processamento de sequências ANSI no console do Windows
+            os.system('')
+    
+    def clear(self):
+        """Inicia um novo quadro com a tela limpa"""
+        self._parts = [CLEAR]
+        self._frame = None
+    
+    def invalidate(self):
+        """Descarta o último quadro: o próximo draw() redesenha a tela inteira
+        
+        Chamado quando algo fora do Renderer escreveu no terminal, já que
+        as linhas do quadro podem ter mudado de posição.
+        """
+        self._frame = None
+    
+    def _advance(self, text: str):
+        """Acompanha o cursor abaixo do quadro; se a tela rolar, o descarta"""
+        if self._frame is None:
+            return
+        columns, rows = shutil.get_terminal_size()
+        lines = text.split('\n')
+        # Linhas longas quebram e ocupam mais de uma linha da tela
+        self._row += len(lines) - 1 + sum(len(line) // columns for line in lines)
+        if self._row > rows:
+            self._frame = None
+    
+    def print(self, *values, sep: str = ' ', end: str = '\n', flush: bool = False):
+        """Mesma assinatura de print(), mas escreve no buffer"""
+        text = sep.join(map(str, values)) + end
+        self._parts.append(text)
+        self._advance(text)
+        if flush:
+            self.flush()
+    
+    def flush(self):
+        """Escreve o conteúdo acumulado com uma única chamada"""
+        if self._parts:
+            self.stream.write(''.join(self._parts))
+            self._parts = []
+        self.stream.flush()
+    
+    def input(self, prompt: str = '') -> str:
+        """Descarrega o quadro e lê uma linha do teclado"""
+        self.flush()
+        # A espera pela digitação não conta no tempo das telas
+        answer = instrumentation.untimed(builtins.input, prompt)
+        # O prompt, o texto digitado e o ENTER ficam abaixo do quadro
+        self._advance(prompt + answer + '\n')
+        return answer
+    
+    def draw(self, lines: List[str]):
+        """Desenha um quadro fixo reescrevendo só as linhas alteradas
+        
+        Usado em telas que se repetem (menus): se o último quadro
+        desenhado cabe na tela, apenas as linhas diferentes são
+        reescritas e o que ficou abaixo dele (prompt anterior) é apagado.
+        As linhas são endereçadas a partir do topo da tela, então o quadro
+        é descartado quando print() ou input() a fazem rolar, e com
+        invalidate() após saída escrita por fora do Renderer.
+        """
+        previous = self._frame
+        columns, rows = shutil.get_terminal_size()
+        
+        # Quadros que rolam a tela ou têm linhas que quebram (deslocando as
+        # seguintes) não servem de base para o próximo: tudo é redesenhado
+        fits = len(lines) < rows and all(len(line) < columns for line in lines)
+        if previous is None or not fits:
+            self._parts = [CLEAR, '\n'.join(lines), '\n']
+        else:
+            self._parts = [
+                f"\x1b[{row};1H{CLEAR_LINE}{line}"
+                for row, line in enumerate(lines, 1)
+                if row > len(previous) or previous[row - 1] != line
+            ]
+            self._parts.append(f"\x1b[{len(lines) + 1};1H{CLEAR_BELOW}")
+        
+        self._frame = list(lines) if fits else None
+        self._row = len(lines) + 1
\ No newline at end of file
@@ -5,11 +5,15 @@ import os
 from datetime import datetime, timedelta
 from typing import List, Optional
 from models import Transaction
-from services import FinanceService, StorageService
+from services import FinanceService, StorageService, StatementImporter, Pager, Query
 from utils import format_currency, format_date, validate_date, validate_value
-from config import CHART_BAR_LENGTH
+from utils import instrumentation
+from .renderer import Renderer
+from config import CHART_BAR_LENGTH, MAX_TRANSACTIONS_DISPLAY
 
 
+# O tempo de cada tela exclui a espera pela digitação (ver Renderer.input)
+@instrumentation.instrument('TerminalView', exclude=('run', 'show_instrumentation'))
 class TerminalView:
     """Interface do usuário via terminal"""
     
@@ -17,82 +21,88 @@ class TerminalView:
                  storage_service: StorageService):
         self.finance = finance_service
         self.storage = storage_service
+        self.screen = Renderer()
     
     def clear_screen(self):
-        """Limpa tela"""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        """Limpa tela (início de um novo quadro)"""
+        self.screen.clear()
     
     def show_menu(self):
-        """Menu principal"""
-        self.clear_screen()
-        print("=" * 60)
-        print("💰 SISTEMA DE CONTROLE FINANCEIRO PESSOAL 💰".center(60))
-        print("=" * 60)
-        print("\n1.  📝 Adicionar Transação")
-        print("2.  📋 Listar Transações")
-        print("3.  ✏️  Editar Transação")
-        print("4.  🗑️  Deletar Transação")
-        print("5.  📊 Resumo Financeiro")
-        print("6.  📈 Gráfico Mensal")
-        print("7.  🔍 Buscar Transações")
-        print("8.  📁 Gerenciar Categorias")
-        print("9.  💾 Exportar para CSV")
-        print("10. 🚪 Sair")
-        print("\n" + "=" * 60)
+        """Menu principal (redesenha só as linhas alteradas)"""
+        self.screen.draw([
+            "=" * 60,
+            "💰 SISTEMA DE CONTROLE FINANCEIRO PESSOAL 💰".center(60),
+            "=" * 60,
+            "",
+            "1.  📝 Adicionar Transação",
+            "2.  📋 Listar Transações",
+            "3.  ✏️  Editar Transação",
+            "4.  🗑️  Deletar Transação",
+            "5.  📊 Resumo Financeiro",
+            "6.  📈 Gráfico Mensal",
+            "7.  🔍 Buscar Transações",
+            "8.  📁 Gerenciar Categorias",
+            "9.  💾 Exportar para CSV",
+            "10. 📥 Importar Extrato (CSV/OFX)",
+            "11. 📉 Saldo ao Longo do Tempo",
+            "12. 🚪 Sair",
+            "",
+            "=" * 60
+        ])
     
     def add_transaction(self):
         """Adiciona nova transação"""
         self.clear_screen()
-        print("=" * 60)
-        print("ADICIONAR NOVA TRANSAÇÃO".center(60))
-        print("=" * 60)
+        self.screen.print("=" * 60)
+        self.screen.print("ADICIONAR NOVA TRANSAÇÃO".center(60))
+        self.screen.print("=" * 60)
         
         # Tipo
-        print("\n1. Receita")
-        print("2. Despesa")
-        tipo_choice = input("\nEscolha o tipo (1-2): ").strip()
+        self.screen.print("\n1. Receita")
+        self.screen.print("2. Despesa")
+        tipo_choice = self.screen.input("\nEscolha o tipo (1-2): ").strip()
         
         tipo = 'receita' if tipo_choice == '1' else 'despesa' if tipo_choice == '2' else None
         if not tipo:
-            print("✗ Opção inválida!")
-            input("\nPressione ENTER...")
+            self.screen.print("✗ Opção inválida!")
+            self.screen.input("\nPressione ENTER...")
             return
         
         # Categoria
         categories = self.finance.categories.get_categories(tipo)
-        print(f"\n--- Categorias de {tipo.upper()} ---")
+        self.screen.print(f"\n--- Categorias de {tipo.upper()} ---")
         for i, cat in enumerate(categories, 1):
-            print(f"{i}. {cat}")
+            self.screen.print(f"{i}. {cat}")
         
         try:
-            cat_idx = int(input(f"\nEscolha (1-{len(categories)}): ")) - 1
+            cat_idx = int(self.screen.input(f"\nEscolha (1-{len(categories)}): ")) - 1
             categoria = categories[cat_idx]
         except (ValueError, IndexError):
-            print("✗ Categoria inválida!")
-            input("\nPressione ENTER...")
+            self.screen.print("✗ Categoria inválida!")
+            self.screen.input("\nPressione ENTER...")
             return
         
         # Descrição
-        descricao = input("\nDescrição: ").strip()
+        descricao = self.screen.input("\nDescrição: ").strip()
         if not descricao:
-            print("✗ Descrição obrigatória!")
-            input("\nPressione ENTER...")
+            self.screen.print("✗ Descrição obrigatória!")
+            self.screen.input("\nPressione ENTER...")
             return
         
         # Valor
-        valor_str = input("Valor (R$): ").strip()
+        valor_str = self.screen.input("Valor (R$): ").strip()
         valid, valor = validate_value(valor_str)
         if not valid:
-            print("✗ Valor inválido!")
-            input("\nPressione ENTER...")
+            self.screen.print("✗ Valor inválido!")
+            self.screen.input("\nPressione ENTER...")
             return
         
         # Data
-        data_input = input("Data (DD/MM/AAAA) ou ENTER para hoje: ").strip()
+        data_input = self.screen.input("Data (DD/MM/AAAA) ou ENTER para hoje: ").strip()
         if data_input:
             if not validate_date(data_input):
-                print("✗ Data inválida!")
-                input("\nPressione ENTER...")
+                self.screen.print("✗ Data inválida!")
+                self.screen.input("\nPressione ENTER...")
                 return
             data = datetime.strptime(data_input, '%d/%m/%Y').isoformat()
         else:
@@ -100,251 +110,300 @@ class TerminalView:
         
         # Adicionar
         transaction = self.finance.add_transaction(tipo, categoria, descricao, valor, data)
-        self.storage.save(self.finance.transactions, self.finance.categories)
+        self.storage.save_change('put', transaction.to_dict(),
+                                 self.finance.repository, self.finance.categories)
         
-        print(f"\n✓ {tipo.capitalize()} de {format_currency(valor)} adicionada!")
-        input("\nPressione ENTER...")
+        self.screen.print(f"\n✓ {tipo.capitalize()} de {format_currency(valor)} adicionada!")
+        self.screen.input("\nPressione ENTER...")
     
-    def list_transactions(self, transactions: Optional[List[Transaction]] = None):
-        """Lista transações"""
-        # CORREÇÃO: Tratamento correto do None
-        self.clear_screen()
-        
-        if transactions is not None:
-            trans = transactions
-        else:
-            trans = self.finance.get_all_transactions_sorted()
-        
-        if not trans:
-            print("=" * 60)
-            print("NENHUMA TRANSAÇÃO ENCONTRADA".center(60))
-            print("=" * 60)
-            input("\nPressione ENTER...")
+    def list_transactions(self, transactions: Optional[List[Transaction]] = None,
+                          sort_key: str = 'data', reverse: bool = True):
+        """Lista transações paginadas (só a página visível é formatada)"""
+        pager = Pager(self.finance.sorted_view(sort_key, transactions),
+                      MAX_TRANSACTIONS_DISPLAY, reverse)
+        
+        if not len(pager):
+            self.clear_screen()
+            self.screen.print("=" * 60)
+            self.screen.print("NENHUMA TRANSAÇÃO ENCONTRADA".center(60))
+            self.screen.print("=" * 60)
+            self.screen.input("\nPressione ENTER...")
             return
         
-        print("=" * 100)
-        print("LISTA DE TRANSAÇÕES".center(100))
-        print("=" * 100)
-        
-        print(f"\n{'ID':<5} {'Data':<12} {'Tipo':<10} {'Categoria':<15} {'Descrição':<25} {'Valor':>15}")
-        print("-" * 100)
-        
-        for t in trans:
-            data_fmt = format_date(t.data)
-            tipo_sym = '+' if t.tipo == 'receita' else '-'
-            valor_fmt = f"{tipo_sym}{format_currency(t.valor)}"
+        while True:
+            self.clear_screen()
+            self.screen.print("=" * 100)
+            self.screen.print("LISTA DE TRANSAÇÕES".center(100))
+            self.screen.print("=" * 100)
             
-            print(f"{t.id:<5} {data_fmt:<12} {t.tipo:<10} {t.categoria:<15} "
-                  f"{t.descricao[:25]:<25} {valor_fmt:>15}")
-        
-        print("-" * 100)
-        print(f"Total: {len(trans)} transações")
-        input("\nPressione ENTER...")
+            self.screen.print(f"\n{'ID':<5} {'Data':<12} {'Tipo':<10} {'Categoria':<15} {'Descrição':<25} {'Valor':>15}")
+            self.screen.print("-" * 100)
+            
+            for t in pager.page():
+                data_fmt = format_date(t.data)
+                tipo_sym = '+' if t.tipo == 'receita' else '-'
+                valor_fmt = f"{tipo_sym}{format_currency(t.valor)}"
+                
+                self.screen.print(f"{t.id:<5} {data_fmt:<12} {t.tipo:<10} {t.categoria:<15} "
+                      f"{t.descricao[:25]:<25} {valor_fmt:>15}")
+            
+            ordem = 'decrescente' if reverse else 'crescente'
+            self.screen.print("-" * 100)
+            self.screen.print(f"Página {pager.page_number} de {pager.page_count} | "
+                  f"Total: {len(pager)} transações | Ordem: {sort_key} ({ordem})")
+            self.screen.print("\n[N] Próxima  [P] Anterior  [D] Ir para data  "
+                  "[O] Ordenar  [T] Tamanho da página  [V] Voltar")
+            
+            cmd = self.screen.input("\nComando: ").strip().lower()
+            
+            if cmd in ('', 'n'):
+                if not pager.next() and cmd == 'n':
+                    self.screen.input("\nÚltima página. Pressione ENTER...")
+            elif cmd == 'p':
+                pager.prev()
+            elif cmd == 'd':
+                if sort_key != 'data':
+                    self.screen.input("\n✗ Disponível apenas com ordenação por data. Pressione ENTER...")
+                    continue
+                data_str = self.screen.input("Data (DD/MM/AAAA): ").strip()
+                if validate_date(data_str):
+                    pager.seek_date(datetime.strptime(data_str, '%d/%m/%Y'))
+                else:
+                    self.screen.input("\n✗ Data inválida! Pressione ENTER...")
+            elif cmd == 'o':
+                keys = list(FinanceService.SORT_KEYS)
+                for i, key in enumerate(keys, 1):
+                    self.screen.print(f"{i}. {key}")
+                try:
+                    idx = int(self.screen.input("Ordenar por: ").strip()) - 1
+                    if not 0 <= idx < len(keys):
+                        raise ValueError
+                except ValueError:
+                    self.screen.input("\n✗ Opção inválida! Pressione ENTER...")
+                    continue
+                sort_key = keys[idx]
+                reverse = self.screen.input("Decrescente? (s/n): ").strip().lower() == 's'
+                pager = Pager(self.finance.sorted_view(sort_key, transactions),
+                              pager.page_size, reverse)
+            elif cmd == 't':
+                try:
+                    pager.set_page_size(int(self.screen.input("Linhas por página: ").strip()))
+                except ValueError:
+                    self.screen.input("\n✗ Valor inválido! Pressione ENTER...")
+            elif cmd == 'v':
+                break
     
     def edit_transaction(self):
         """Edita transação"""
         self.clear_screen()
-        print("=" * 60)
-        print("EDITAR TRANSAÇÃO".center(60))
-        print("=" * 60)
+        self.screen.print("=" * 60)
+        self.screen.print("EDITAR TRANSAÇÃO".center(60))
+        self.screen.print("=" * 60)
         
-        recent = self.finance.get_all_transactions_sorted()[:10]
-        print("\nÚltimas transações:")
+        recent = self.finance.get_all_transactions_sorted(limit=10)
+        self.screen.print("\nÚltimas transações:")
         for t in recent:
-            print(f"ID {t.id}: {format_date(t.data)} - {t.descricao} - {format_currency(t.valor)}")
+            self.screen.print(f"ID {t.id}: {format_date(t.data)} - {t.descricao} - {format_currency(t.valor)}")
         
         try:
-            trans_id = int(input("\nID para editar: "))
+            trans_id = int(self.screen.input("\nID para editar: "))
             transaction = self.finance.get_transaction_by_id(trans_id)
             
             if not transaction:
-                print("✗ Não encontrada!")
-                input("\nPressione ENTER...")
+                self.screen.print("✗ Não encontrada!")
+                self.screen.input("\nPressione ENTER...")
                 return
             
-            print(f"\n--- Editando: {transaction.descricao} ---")
-            print("(ENTER para manter atual)")
+            self.screen.print(f"\n--- Editando: {transaction.descricao} ---")
+            self.screen.print("(ENTER para manter atual)")
             
             updates = {}
             
-            new_desc = input(f"Descrição [{transaction.descricao}]: ").strip()
+            new_desc = self.screen.input(f"Descrição [{transaction.descricao}]: ").strip()
             if new_desc:
                 updates['descricao'] = new_desc
             
-            new_val = input(f"Valor [{transaction.valor:.2f}]: ").strip()
+            new_val = self.screen.input(f"Valor [{transaction.valor:.2f}]: ").strip()
             if new_val:
                 valid, valor = validate_value(new_val)
                 if valid:
                     updates['valor'] = valor
             
-            new_date = input(f"Data [{format_date(transaction.data)}]: ").strip()
+            new_date = self.screen.input(f"Data [{format_date(transaction.data)}]: ").strip()
             if new_date and validate_date(new_date):
                 updates['data'] = datetime.strptime(new_date, '%d/%m/%Y').isoformat()
             
             if self.finance.update_transaction(trans_id, **updates):
-                self.storage.save(self.finance.transactions, self.finance.categories)
-                print("\n✓ Atualizada!")
+                self.storage.save_change('put', transaction.to_dict(),
+                                         self.finance.repository, self.finance.categories)
+                self.screen.print("\n✓ Atualizada!")
             else:
-                print("\n✗ Erro ao atualizar!")
+                self.screen.print("\n✗ Erro ao atualizar!")
                 
         except ValueError:
-            print("✗ ID inválido!")
+            self.screen.print("✗ ID inválido!")
         
-        input("\nPressione ENTER...")
+        self.screen.input("\nPressione ENTER...")
     
     def delete_transaction(self):
         """Deleta transação"""
         self.clear_screen()
-        print("=" * 60)
-        print("DELETAR TRANSAÇÃO".center(60))
-        print("=" * 60)
+        self.screen.print("=" * 60)
+        self.screen.print("DELETAR TRANSAÇÃO".center(60))
+        self.screen.print("=" * 60)
         
-        recent = self.finance.get_all_transactions_sorted()[:10]
-        print("\nÚltimas transações:")
+        recent = self.finance.get_all_transactions_sorted(limit=10)
+        self.screen.print("\nÚltimas transações:")
         for t in recent:
-            print(f"ID {t.id}: {format_date(t.data)} - {t.descricao} - {format_currency(t.valor)}")
+            self.screen.print(f"ID {t.id}: {format_date(t.data)} - {t.descricao} - {format_currency(t.valor)}")
         
         try:
-            trans_id = int(input("\nID para deletar: "))
+            trans_id = int(self.screen.input("\nID para deletar: "))
             transaction = self.finance.get_transaction_by_id(trans_id)
             
             if not transaction:
-                print("✗ Não encontrada!")
-                input("\nPressione ENTER...")
+                self.screen.print("✗ Não encontrada!")
+                self.screen.input("\nPressione ENTER...")
                 return
             
-            print(f"\n⚠ Deletar: {transaction.descricao} - {format_currency(transaction.valor)}?")
-            confirm = input("Confirmar (S/N)? ").strip().upper()
+            self.screen.print(f"\n⚠ Deletar: {transaction.descricao} - {format_currency(transaction.valor)}?")
+            confirm = self.screen.input("Confirmar (S/N)? ").strip().upper()
             
             if confirm == 'S':
                 if self.finance.delete_transaction(trans_id):
-                    self.storage.save(self.finance.transactions, self.finance.categories)
-                    print("\n✓ Deletada!")
+                    self.storage.save_change('delete', {'id': trans_id},
+                                             self.finance.repository, self.finance.categories)
+                    self.screen.print("\n✓ Deletada!")
                 else:
-                    print("\n✗ Erro!")
+                    self.screen.print("\n✗ Erro!")
             else:
-                print("\n✗ Cancelado!")
+                self.screen.print("\n✗ Cancelado!")
                 
         except ValueError:
-            print("✗ ID inválido!")
+            self.screen.print("✗ ID inválido!")
         
-        input("\nPressione ENTER...")
+        self.screen.input("\nPressione ENTER...")
     
     def view_summary(self):
         """Exibe resumo financeiro"""
         self.clear_screen()
-        print("=" * 60)
-        print("RESUMO FINANCEIRO".center(60))
-        print("=" * 60)
+        self.screen.print("=" * 60)
+        self.screen.print("RESUMO FINANCEIRO".center(60))
+        self.screen.print("=" * 60)
         
-        if not self.finance.transactions:
-            print("\nNenhuma transação!")
-            input("\nPressione ENTER...")
+        if self.finance.is_empty():
+            self.screen.print("\nNenhuma transação!")
+            self.screen.input("\nPressione ENTER...")
             return
         
         # Escolher período
-        print("\n1. Este mês")
-        print("2. Últimos 30 dias")
-        print("3. Últimos 3 meses")
-        print("4. Este ano")
-        print("5. Todo período")
+        self.screen.print("\n1. Este mês")
+        self.screen.print("2. Últimos 30 dias")
+        self.screen.print("3. Últimos 3 meses")
+        self.screen.print("4. Este ano")
+        self.screen.print("5. Todo período")
         
-        choice = input("\nPeríodo (1-5): ").strip()
+        choice = self.screen.input("\nPeríodo (1-5): ").strip()
         
         now = datetime.now()
+        end = now
         
         if choice == '1':
             start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-            filtered = self.finance.filter_by_period(start, now)
             period_name = "Este Mês"
         elif choice == '2':
             start = now - timedelta(days=30)
-            filtered = self.finance.filter_by_period(start, now)
             period_name = "Últimos 30 Dias"
         elif choice == '3':
             start = now - timedelta(days=90)
-            filtered = self.finance.filter_by_period(start, now)
             period_name = "Últimos 3 Meses"
         elif choice == '4':
             start = now.replace(month=1, day=1, hour=0, minute=0, second=0, microsecond=0)
-            filtered = self.finance.filter_by_period(start, now)
             period_name = "Este Ano"
         else:
-            filtered = self.finance.transactions
+            start, end = datetime.min, datetime.max
             period_name = "Todo Período"
         
-        if not filtered:
-            print(f"\n✗ Sem transações em: {period_name}")
-            input("\nPressione ENTER...")
-            return
+        # Totais e categorias vêm do índice por dia, sem percorrer o período
+        summary = self.finance.period_summary(start, end)
         
-        # Calcular resumo
-        summary = self.finance.calculate_summary(filtered)
+        if not summary['total_transactions']:
+            self.screen.print(f"\n✗ Sem transações em: {period_name}")
+            self.screen.input("\nPressione ENTER...")
+            return
         
         self.clear_screen()
-        print("=" * 60)
-        print(f"RESUMO: {period_name}".center(60))
-        print("=" * 60)
+        self.screen.print("=" * 60)
+        self.screen.print(f"RESUMO: {period_name}".center(60))
+        self.screen.print("=" * 60)
         
-        print(f"\n{'RECEITAS:':<30} {format_currency(summary['total_receitas']):>25}")
-        print(f"{'DESPESAS:':<30} {format_currency(summary['total_despesas']):>25}")
-        print("-" * 60)
-        print(f"{'SALDO:':<30} {format_currency(summary['saldo']):>25}")
+        self.screen.print(f"\n{'RECEITAS:':<30} {format_currency(summary['total_receitas']):>25}")
+        self.screen.print(f"{'DESPESAS:':<30} {format_currency(summary['total_despesas']):>25}")
+        self.screen.print("-" * 60)
+        self.screen.print(f"{'SALDO:':<30} {format_currency(summary['saldo']):>25}")
         
         # Por categoria
-        cat_totals = self.finance.calculate_by_category(filtered, 'despesa')
+        cat_totals = self.finance.period_by_category(start, end, 'despesa')
         
         if cat_totals:
-            print("\n" + "=" * 60)
-            print("DESPESAS POR CATEGORIA".center(60))
-            print("=" * 60)
+            self.screen.print("\n" + "=" * 60)
+            self.screen.print("DESPESAS POR CATEGORIA".center(60))
+            self.screen.print("=" * 60)
             
             for cat, total in cat_totals.items():
                 percent = (total / summary['total_despesas'] * 100) if summary['total_despesas'] > 0 else 0
                 from utils.formatters import create_progress_bar
                 bar = create_progress_bar(total, summary['total_despesas'], 40)
                 
-                print(f"\n{cat:<20} {format_currency(total):>15} ({percent:>5.1f}%)")
-                print(f"{bar}")
+                self.screen.print(f"\n{cat:<20} {format_currency(total):>15} ({percent:>5.1f}%)")
+                self.screen.print(f"{bar}")
         
-        # Estatísticas
+        # Estatísticas (médias e maiores valores percorrem o período)
+        filtered = (self.finance.transactions if start == datetime.min
+                    else self.finance.filter_by_period(start, end))
         stats = self.finance.get_statistics(filtered)
         
         if stats:
-            print("\n" + "=" * 60)
-            print("ESTATÍSTICAS".center(60))
-            print("=" * 60)
+            self.screen.print("\n" + "=" * 60)
+            self.screen.print("ESTATÍSTICAS".center(60))
+            self.screen.print("=" * 60)
             
             if 'media_receitas' in stats:
-                print(f"\nMédia de receitas: {format_currency(stats['media_receitas'])}")
+                self.screen.print(f"\nMédia de receitas: {format_currency(stats['media_receitas'])}")
             
             if 'media_despesas' in stats:
-                print(f"Média de despesas: {format_currency(stats['media_despesas'])}")
+                self.screen.print(f"Média de despesas: {format_currency(stats['media_despesas'])}")
             
             if 'maior_despesa_obj' in stats:
                 obj = stats['maior_despesa_obj']
-                print(f"\nMaior despesa: {obj.descricao} - {format_currency(obj.valor)}")
-        
-        print("\n" + "=" * 60)
-        input("\nPressione ENTER...")
+                self.screen.print(f"\nMaior despesa: {obj.descricao} - {format_currency(obj.valor)}")
+            
+            despesas = self.finance.distribution(filtered).tipo('despesa').describe(100)
+            if despesas['quantidade']:
+                self.screen.print(f"Mediana das despesas: {format_currency(despesas['mediana'])} "
+                                  f"| 90% até {format_currency(despesas['p90'])} "
+                                  f"| 99% até {format_currency(despesas['p99'])}")
+        
+        self.screen.print("\n" + "=" * 60)
+        self.screen.input("\nPressione ENTER...")
     
     def view_chart(self):
         """Exibe gráfico mensal"""
         self.clear_screen()
-        print("=" * 60)
-        print("GRÁFICO MENSAL".center(60))
-        print("=" * 60)
+        self.screen.print("=" * 60)
+        self.screen.print("GRÁFICO MENSAL".center(60))
+        self.screen.print("=" * 60)
         
-        if not self.finance.transactions:
-            print("\nNenhuma transação!")
-            input("\nPressione ENTER...")
+        if self.finance.is_empty():
+            self.screen.print("\nNenhuma transação!")
+            self.screen.input("\nPressione ENTER...")
             return
         
         monthly_data = self.finance.get_monthly_data(12)
         
         if not monthly_data:
-            print("\nDados insuficientes!")
-            input("\nPressione ENTER...")
+            self.screen.print("\nDados insuficientes!")
+            self.screen.input("\nPressione ENTER...")
             return
         
         max_value = max(
@@ -352,7 +411,7 @@ class TerminalView:
             for m in monthly_data
         )
         
-        print("\nLegenda: [██] Receitas  [▓▓] Despesas\n")
+        self.screen.print("\nLegenda: [██] Receitas  [▓▓] Despesas\n")
         
         from utils.formatters import create_progress_bar
         
@@ -361,56 +420,90 @@ class TerminalView:
             despesas_bar = create_progress_bar(month['despesas'], max_value, CHART_BAR_LENGTH, '▓')
             saldo = month['receitas'] - month['despesas']
             
-            print(f"{month['name']:<10} {receitas_bar:<50} {format_currency(month['receitas']):>15}")
-            print(f"{'':<10} {despesas_bar:<50} {format_currency(month['despesas']):>15}")
-            print(f"{'':<10} Saldo: {format_currency(saldo)}")
-            print()
+            self.screen.print(f"{month['name']:<10} {receitas_bar:<50} {format_currency(month['receitas']):>15}")
+            self.screen.print(f"{'':<10} {despesas_bar:<50} {format_currency(month['despesas']):>15}")
+            self.screen.print(f"{'':<10} Saldo: {format_currency(saldo)}")
+            self.screen.print()
+        
+        self.screen.input("\nPressione ENTER...")
+    
+    def view_balance(self):
+        """Exibe o saldo acumulado ao fim de cada mês"""
+        self.clear_screen()
+        self.screen.print("=" * 60)
+        self.screen.print("SALDO AO LONGO DO TEMPO".center(60))
+        self.screen.print("=" * 60)
+        
+        if self.finance.is_empty():
+            self.screen.print("\nNenhuma transação!")
+            self.screen.input("\nPressione ENTER...")
+            return
+        
+        series = self.finance.balance_over_time(12)
+        max_value = max(abs(point['saldo']) for point in series)
         
-        input("\nPressione ENTER...")
+        self.screen.print("\nLegenda: [██] Saldo positivo  [▓▓] Saldo negativo\n")
+        
+        from utils.formatters import create_progress_bar
+        
+        previous = None
+        for point in series:
+            saldo = point['saldo']
+            bar = create_progress_bar(abs(saldo), max_value, CHART_BAR_LENGTH,
+                                      '█' if saldo >= 0 else '▓')
+            change = ''
+            if previous is not None:
+                sign = '+' if saldo >= previous else '-'
+                change = f" ({sign}{format_currency(abs(saldo - previous))})"
+            self.screen.print(f"{point['name']:<10} {bar:<50} {format_currency(saldo):>15}{change}")
+            previous = saldo
+        
+        self.screen.input("\nPressione ENTER...")
     
     def search_transactions(self):
         """Busca transações"""
         self.clear_screen()
-        print("=" * 60)
-        print("BUSCAR TRANSAÇÕES".center(60))
-        print("=" * 60)
+        self.screen.print("=" * 60)
+        self.screen.print("BUSCAR TRANSAÇÕES".center(60))
+        self.screen.print("=" * 60)
         
-        print("\n1. Por descrição")
-        print("2. Por categoria")
-        print("3. Por valor (faixa)")
-        print("4. Voltar")
+        self.screen.print("\n1. Por descrição")
+        self.screen.print("2. Por categoria")
+        self.screen.print("3. Por valor (faixa)")
+        self.screen.print("4. Combinada (vários critérios)")
+        self.screen.print("5. Voltar")
         
-        choice = input("\nOpção (1-4): ").strip()
+        choice = self.screen.input("\nOpção (1-5): ").strip()
         
         if choice == '1':
-            termo = input("\nTermo de busca: ").strip()
+            termo = self.screen.input("\nTermo de busca: ").strip()
             filtered = self.finance.filter_by_description(termo)
             
             if filtered:
                 self.list_transactions(filtered)
             else:
-                print("\n✗ Nenhuma transação encontrada!")
-                input("\nPressione ENTER...")
+                self.screen.print("\n✗ Nenhuma transação encontrada!")
+                self.screen.input("\nPressione ENTER...")
         
         elif choice == '2':
-            all_cats = set(t.categoria for t in self.finance.transactions)
-            print("\nCategorias:")
+            all_cats = self.finance.transactions.categories_in_use()
+            self.screen.print("\nCategorias:")
             for i, cat in enumerate(sorted(all_cats), 1):
-                print(f"{i}. {cat}")
+                self.screen.print(f"{i}. {cat}")
             
-            cat_nome = input("\nNome da categoria: ").strip()
+            cat_nome = self.screen.input("\nNome da categoria: ").strip()
             filtered = self.finance.filter_by_category(cat_nome)
             
             if filtered:
                 self.list_transactions(filtered)
             else:
-                print("\n✗ Nenhuma transação encontrada!")
-                input("\nPressione ENTER...")
+                self.screen.print("\n✗ Nenhuma transação encontrada!")
+                self.screen.input("\nPressione ENTER...")
         
         elif choice == '3':
             try:
-                min_str = input("\nValor mínimo: ").strip()
-                max_str = input("Valor máximo: ").strip()
+                min_str = self.screen.input("\nValor mínimo: ").strip()
+                max_str = self.screen.input("Valor máximo: ").strip()
                 
                 valid_min, min_val = validate_value(min_str)
                 valid_max, max_val = validate_value(max_str)
@@ -421,113 +514,255 @@ class TerminalView:
                     if filtered:
                         self.list_transactions(filtered)
                     else:
-                        print("\n✗ Nenhuma transação encontrada!")
-                        input("\nPressione ENTER...")
+                        self.screen.print("\n✗ Nenhuma transação encontrada!")
+                        self.screen.input("\nPressione ENTER...")
                 else:
-                    print("\n✗ Valores inválidos!")
-                    input("\nPressione ENTER...")
+                    self.screen.print("\n✗ Valores inválidos!")
+                    self.screen.input("\nPressione ENTER...")
             except Exception:
-                print("\n✗ Erro na busca!")
-                input("\nPressione ENTER...")
+                self.screen.print("\n✗ Erro na busca!")
+                self.screen.input("\nPressione ENTER...")
+        
+        elif choice == '4':
+            self.combined_search()
+    
+    def combined_search(self):
+        """Busca com vários critérios combinados (ENTER ignora o critério)"""
+        self.screen.print("\nDeixe em branco os critérios que não quiser usar.")
+        conditions = {}
+        
+        for key, label in (('start', "Data inicial (DD/MM/AAAA): "),
+                           ('end', "Data final (DD/MM/AAAA): ")):
+            text = self.screen.input(label).strip()
+            if not text:
+                continue
+            if not validate_date(text):
+                self.screen.print("\n✗ Data inválida!")
+                self.screen.input("\nPressione ENTER...")
+                return
+            conditions[key] = datetime.strptime(text, '%d/%m/%Y')
+        if 'end' in conditions:
+            conditions['end'] += timedelta(days=1, microseconds=-1)
+        
+        tipo = self.screen.input("Tipo (1-Receita / 2-Despesa): ").strip()
+        conditions['tipo'] = {'1': 'receita', '2': 'despesa'}.get(tipo)
+        conditions['categoria'] = self.screen.input("Categoria: ").strip() or None
+        
+        for key, label in (('min_val', "Valor mínimo: "), ('max_val', "Valor máximo: ")):
+            text = self.screen.input(label).strip()
+            if not text:
+                continue
+            valid, value = validate_value(text)
+            if not valid:
+                self.screen.print("\n✗ Valor inválido!")
+                self.screen.input("\nPressione ENTER...")
+                return
+            conditions[key] = value
+        
+        conditions['term'] = self.screen.input("Texto na descrição: ").strip() or None
+        
+        keys = list(FinanceService.SORT_KEYS)
+        sort_key = self.screen.input(f"Ordenar por ({'/'.join(keys)}) [data]: ").strip() or 'data'
+        if sort_key not in keys:
+            self.screen.print("\n✗ Ordenação inválida!")
+            self.screen.input("\nPressione ENTER...")
+            return
+        reverse = self.screen.input("Decrescente? (s/n) [s]: ").strip().lower() != 'n'
+        
+        limit_text = self.screen.input("Limite de resultados (ENTER = todos): ").strip()
+        try:
+            limit = int(limit_text) if limit_text else None
+            if limit is not None and limit < 1:
+                raise ValueError
+        except ValueError:
+            self.screen.print("\n✗ Limite inválido!")
+            self.screen.input("\nPressione ENTER...")
+            return
+        
+        query = Query(**conditions).order_by(sort_key, reverse).limit(limit)
+        filtered = list(self.finance.query(query))
+        
+        if filtered:
+            self.list_transactions(filtered, sort_key, reverse)
+        else:
+            self.screen.print("\n✗ Nenhuma transação encontrada!")
+            self.screen.input("\nPressione ENTER...")
     
     def manage_categories(self):
         """Gerenciar categorias"""
         self.clear_screen()
-        print("=" * 60)
-        print("GERENCIAR CATEGORIAS".center(60))
-        print("=" * 60)
+        self.screen.print("=" * 60)
+        self.screen.print("GERENCIAR CATEGORIAS".center(60))
+        self.screen.print("=" * 60)
         
-        print("\n1. Ver categorias")
-        print("2. Adicionar categoria")
-        print("3. Remover categoria")
-        print("4. Voltar")
+        self.screen.print("\n1. Ver categorias")
+        self.screen.print("2. Adicionar categoria")
+        self.screen.print("3. Remover categoria")
+        self.screen.print("4. Voltar")
         
-        choice = input("\nOpção (1-4): ").strip()
+        choice = self.screen.input("\nOpção (1-4): ").strip()
         
         if choice == '1':
-            print("\n--- RECEITAS ---")
+            self.screen.print("\n--- RECEITAS ---")
             for cat in self.finance.categories.get_categories('receita'):
-                print(f"  • {cat}")
+                self.screen.print(f"  • {cat}")
             
-            print("\n--- DESPESAS ---")
+            self.screen.print("\n--- DESPESAS ---")
             for cat in self.finance.categories.get_categories('despesa'):
-                print(f"  • {cat}")
+                self.screen.print(f"  • {cat}")
             
-            input("\nPressione ENTER...")
+            self.screen.input("\nPressione ENTER...")
         
         elif choice == '2':
-            tipo = input("\nAdicionar em (1-Receita / 2-Despesa): ").strip()
+            tipo = self.screen.input("\nAdicionar em (1-Receita / 2-Despesa): ").strip()
             tipo_key = 'receita' if tipo == '1' else 'despesa' if tipo == '2' else None
             
             if tipo_key:
-                nova_cat = input("Nome da nova categoria: ").strip()
+                nova_cat = self.screen.input("Nome da nova categoria: ").strip()
                 
                 if self.finance.categories.add_category(tipo_key, nova_cat):
-                    self.storage.save(self.finance.transactions, self.finance.categories)
-                    print(f"\n✓ Categoria '{nova_cat}' adicionada!")
+                    self.storage.save_change('categories', self.finance.categories.to_dict(),
+                                             self.finance.repository, self.finance.categories)
+                    self.screen.print(f"\n✓ Categoria '{nova_cat}' adicionada!")
                 else:
-                    print("\n✗ Categoria inválida ou já existe!")
+                    self.screen.print("\n✗ Categoria inválida ou já existe!")
             
-            input("\nPressione ENTER...")
+            self.screen.input("\nPressione ENTER...")
         
         elif choice == '3':
-            tipo = input("\nRemover de (1-Receita / 2-Despesa): ").strip()
+            tipo = self.screen.input("\nRemover de (1-Receita / 2-Despesa): ").strip()
             tipo_key = 'receita' if tipo == '1' else 'despesa' if tipo == '2' else None
             
             if tipo_key:
                 cats = self.finance.categories.get_categories(tipo_key)
-                print(f"\nCategorias de {tipo_key}:")
+                self.screen.print(f"\nCategorias de {tipo_key}:")
                 for i, cat in enumerate(cats, 1):
-                    print(f"{i}. {cat}")
+                    self.screen.print(f"{i}. {cat}")
                 
                 try:
-                    idx = int(input("\nNúmero para remover: ")) - 1
+                    idx = int(self.screen.input("\nNúmero para remover: ")) - 1
                     cat_name = cats[idx]
                     
                     if self.finance.categories.remove_category(tipo_key, cat_name):
-                        self.storage.save(self.finance.transactions, self.finance.categories)
-                        print(f"\n✓ Categoria '{cat_name}' removida!")
+                        self.storage.save_change('categories', self.finance.categories.to_dict(),
+                                                 self.finance.repository, self.finance.categories)
+                        self.screen.print(f"\n✓ Categoria '{cat_name}' removida!")
                     else:
-                        print("\n✗ Erro ao remover!")
+                        self.screen.print("\n✗ Erro ao remover!")
                 except (ValueError, IndexError):
-                    print("\n✗ Opção inválida!")
+                    self.screen.print("\n✗ Opção inválida!")
             
-            input("\nPressione ENTER...")
+            self.screen.input("\nPressione ENTER...")
     
     def export_csv(self):
         """Exporta para CSV"""
         self.clear_screen()
-        print("=" * 60)
-        print("EXPORTAR PARA CSV".center(60))
-        print("=" * 60)
+        self.screen.print("=" * 60)
+        self.screen.print("EXPORTAR PARA CSV".center(60))
+        self.screen.print("=" * 60)
         
-        if not self.finance.transactions:
-            print("\nNenhuma transação para exportar!")
-            input("\nPressione ENTER...")
+        if self.finance.is_empty():
+            self.screen.print("\nNenhuma transação para exportar!")
+            self.screen.input("\nPressione ENTER...")
             return
         
-        filename = input("\nNome do arquivo (sem extensão): ").strip()
+        filename = self.screen.input("\nNome do arquivo (sem extensão): ").strip()
         if not filename:
             filename = f"financas_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         filename = f"{filename}.csv"
         
-        if self.storage.export_to_csv(self.finance.transactions, filename):
-            print(f"\n✓ Exportado: {filename}")
-            print(f"Total: {len(self.finance.transactions)} transações")
+        # Filtros opcionais
+        self.screen.print("\nFiltros (ENTER para ignorar)")
+        inicio = self.screen.input("Data inicial (DD/MM/AAAA): ").strip()
+        fim = self.screen.input("Data final (DD/MM/AAAA): ").strip()
+        tipo_choice = self.screen.input("Tipo (1-Receita / 2-Despesa): ").strip()
+        categoria = self.screen.input("Categoria: ").strip() or None
+        
+        if (inicio and not validate_date(inicio)) or (fim and not validate_date(fim)):
+            self.screen.print("✗ Data inválida!")
+            self.screen.input("\nPressione ENTER...")
+            return
+        
+        start = datetime.strptime(inicio, '%d/%m/%Y') if inicio else None
+        end = None
+        if fim:
+            end = datetime.strptime(fim, '%d/%m/%Y').replace(
+                hour=23, minute=59, second=59, microsecond=999999)
+        tipo = 'receita' if tipo_choice == '1' else 'despesa' if tipo_choice == '2' else None
+        
+        exported = 0
+        
+        def show_progress(count: int):
+            nonlocal exported
+            exported = count
+            self.screen.print(f"\rExportando... {count} transações", end='', flush=True)
+        
+        rows = self.finance.iter_filtered(start, end, categoria, tipo)
+        if self.storage.export_to_csv(rows, filename, presorted=True,
+                                      progress=show_progress):
+            self.screen.print(f"\n\n✓ Exportado: {filename}")
+            self.screen.print(f"Total: {exported} transações")
         else:
-            print("\n✗ Erro ao exportar!")
+            self.screen.print("\n✗ Erro ao exportar!")
+        
+        self.screen.input("\nPressione ENTER...")
+    
+    def import_statement(self):
+        """Importa extrato bancário em lote"""
+        self.clear_screen()
+        self.screen.print("=" * 60)
+        self.screen.print("IMPORTAR EXTRATO".center(60))
+        self.screen.print("=" * 60)
+        
+        filename = self.screen.input("\nArquivo do extrato (.csv ou .ofx): ").strip()
+        if not os.path.isfile(filename):
+            self.screen.print("✗ Arquivo não encontrado!")
+            self.screen.input("\nPressione ENTER...")
+            return
+        
+        importer = StatementImporter(self.finance, self.storage)
+        try:
+            result = importer.import_file(
+                filename,
+                progress=lambda n: self.screen.print(f"\rLendo... {n} linhas", end='', flush=True)
+            )
+        except (OSError, ValueError) as e:
+            self.screen.print(f"\n✗ Erro ao importar: {e}")
+            self.screen.input("\nPressione ENTER...")
+            return
         
-        input("\nPressione ENTER...")
+        self.screen.print(f"\n\n✓ Importadas: {result['importadas']} transações")
+        self.screen.print(f"Rejeitadas: {result['rejeitadas']}")
+        self.screen.print(f"Tempo: {result['segundos']:.2f}s ({result['linhas_por_segundo']:,.0f} linhas/s)")
+        if not result['salvo']:
+            self.screen.print("✗ Erro ao salvar!")
+        self.screen.input("\nPressione ENTER...")
+    
+    def show_instrumentation(self):
+        """Estatísticas de tempo dos serviços e telas"""
+        self.clear_screen()
+        self.screen.print("\n⏱️  INSTRUMENTAÇÃO\n")
+        self.screen.print(instrumentation.format_report())
+        
+        cache = self.finance.cache.stats()
+        self.screen.print(f"\nCache de resultados: {cache['acertos']} acertos, "
+                          f"{cache['falhas']} falhas ({cache['taxa_acerto']:.0%}), "
+                          f"{cache['entradas']}/{cache['capacidade']} entradas")
+        self.screen.input("\nPressione ENTER...")
     
     def run(self):
         """Loop principal"""
-        print(f"\n✓ Sistema iniciado! {len(self.finance.transactions)} transações carregadas.\n")
-        input("Pressione ENTER para continuar...")
+        if self.finance.is_loaded:
+            self.screen.print(f"\n✓ Sistema iniciado! {len(self.finance.repository)} transações carregadas.\n")
+        else:
+            # Histórico lido sob demanda na primeira tela que precisar dele
+            self.screen.print("\n✓ Sistema iniciado!\n")
+        self.screen.input("Pressione ENTER para continuar...")
         
         while True:
             self.show_menu()
-            choice = input("\nOpção (1-10): ").strip()
+            choice = self.screen.input("\nOpção (1-12): ").strip()
             
             if choice == '1':
                 self.add_transaction()
@@ -548,12 +783,30 @@ class TerminalView:
             elif choice == '9':
                 self.export_csv()
             elif choice == '10':
+                self.import_statement()
+            elif choice == '11':
+                self.view_balance()
+            elif choice == '0' and instrumentation.ENABLED:
+                # Entrada oculta: estatísticas de instrumentação
+                self.show_instrumentation()
+            elif choice == '12':
+                # Conclui gravações em segundo plano antes de sair
+                if not self.storage.flush():
+                    self.screen.print("\n✗ Erro ao salvar dados!")
+                    self.screen.input("\nPressione ENTER...")
+                
+                # Persiste os índices para não reconstruí-los no próximo início
+                for name, data in self.finance.export_indexes().items():
+                    self.storage.save_sidecar(name, data)
+                if instrumentation.ENABLED:
+                    instrumentation.dump()
                 self.clear_screen()
-                print("\n" + "=" * 60)
-                print("Obrigado por usar o Sistema!".center(60))
-                print("Dados salvos automaticamente.".center(60))
-                print("=" * 60 + "\n")
+                self.screen.print("\n" + "=" * 60)
+                self.screen.print("Obrigado por usar o Sistema!".center(60))
+                self.screen.print("Dados salvos automaticamente.".center(60))
+                self.screen.print("=" * 60 + "\n")
+                self.screen.flush()
                 break
             else:
-                print("\n✗ Opção inválida!")
-                input("\nPressione ENTER...")
\ No newline at end of file
+                self.screen.print("\n✗ Opção inválida!")
+                self.screen.input("\nPressione ENTER...")
\ No newline at end of file